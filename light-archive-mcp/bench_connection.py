@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Light Archive MCP - 연결 재사용 벤치마크
+
+같은 PostgREST 요청을 세 가지 방식으로 보내고 지연 시간을 비교합니다.
+
+1. cold: 요청마다 새 클라이언트 (매번 TCP/TLS 핸드셰이크)
+2. warm: 서버가 쓰는 공유 클라이언트로 순차 요청 (연결 재사용)
+3. warm-concurrent: 공유 클라이언트로 여러 스레드에서 동시 요청 (HTTP/2면 한 연결로 다중화)
+
+사용법:
+    python bench_connection.py
+    python bench_connection.py --requests 50 --concurrency 8 --http1
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import light_archive_mcp_fixed as server
+
+
+def _summary(label: str, samples: list, wall: float) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{label:<16} n={len(samples):<4} "
+        f"first={samples[0] * 1000:>7.1f}ms "
+        f"p50={statistics.median(samples) * 1000:>7.1f}ms "
+        f"p95={p95 * 1000:>7.1f}ms "
+        f"total={wall:>6.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="cold/warm 연결 지연 시간 비교")
+    parser.add_argument("--requests", type=int, default=20, help="방식별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="warm-concurrent 동시 요청 수")
+    parser.add_argument("--http1", action="store_true", help="HTTP/2 대신 HTTP/1.1 사용")
+    args = parser.parse_args()
+
+    if not server.SUPABASE_URL or not server.SUPABASE_ANON_KEY:
+        print("❌ NEXT_PUBLIC_SUPABASE_URL / NEXT_PUBLIC_SUPABASE_ANON_KEY가 설정되지 않았습니다!")
+        sys.exit(1)
+
+    url = f"{server.SUPABASE_URL}/rest/v1/archive_items"
+    params = {"select": "id", "limit": "1"}
+    headers = {
+        "apikey": server.SUPABASE_ANON_KEY,
+        "Authorization": f"Bearer {server.SUPABASE_ANON_KEY}",
+    }
+    http2 = not args.http1
+
+    def timed(client) -> float:
+        started = time.perf_counter()
+        client.get(url, params=params, headers=headers).raise_for_status()
+        return time.perf_counter() - started
+
+    # 1. cold: 요청마다 새 클라이언트
+    cold = []
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        with server._create_http_client(http2) as client:
+            cold.append(timed(client))
+    cold_wall = time.perf_counter() - started
+
+    # 2. warm: 공유 클라이언트 (첫 요청이 연결을 만든 뒤 재사용)
+    with server._create_http_client(http2) as client:
+        warm = []
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            warm.append(timed(client))
+        warm_wall = time.perf_counter() - started
+
+        # 3. warm-concurrent: 같은 클라이언트로 동시 요청
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            concurrent = list(pool.map(lambda _: timed(client), range(args.requests)))
+        concurrent_wall = time.perf_counter() - started
+
+        version = client.get(url, params=params, headers=headers).http_version
+
+    print(f"🔗 {url} ({version}, 연결 한도 {server.HTTP_LIMITS.max_connections})")
+    print(_summary("cold", cold, cold_wall))
+    print(_summary("warm", warm, warm_wall))
+    print(_summary("warm-concurrent", concurrent, concurrent_wall))
+    print(f"\n⚡ warm p50 / cold p50 = {statistics.median(warm) / statistics.median(cold):.2f}")
+
+
+if __name__ == "__main__":
+    main()
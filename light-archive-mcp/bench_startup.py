@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Light Archive MCP - 서버 시작 시간 벤치마크
+
+Claude Desktop은 세션마다 서버를 새로 시작하므로, 시작 후 첫 tools/list 응답까지의
+시간을 측정하고 기준보다 느려지면 실패(종료 코드 1)합니다.
+
+1. import 시간: `python -X importtime`으로 모듈 import 시간과 상위 의존성 출력
+2. 지연 import 확인: supabase/openai/PIL/numpy가 시작 시 import되면 실패
+3. 첫 tools/list: stdio로 서버를 띄워 initialize → tools/list 응답까지의 시간 (중앙값)
+
+사용법:
+    python bench_startup.py
+    python bench_startup.py --runs 10 --budget-ms 1500
+    python bench_startup.py --update-baseline      # 현재 결과를 기준으로 저장
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SERVER = HERE / "light_archive_mcp_fixed.py"
+MODULE = "light_archive_mcp_fixed"
+
+# 시작 시 import되면 안 되는 패키지 (처음 쓰는 경로에서 import)
+LAZY_PACKAGES = ("supabase", "openai", "PIL", "numpy")
+
+
+def _import_profile() -> tuple:
+    """(모듈 import 시간 ms, [(의존성, ms)], 시작 시 import된 지연 패키지)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=HERE, capture_output=True, text=True, check=True
+    )
+    total = 0.0
+    children = []
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == MODULE:
+            total = int(cumulative) / 1000
+        elif depth == 1:
+            children.append((name, int(cumulative) / 1000))
+    children.sort(key=lambda item: item[1], reverse=True)
+    return total, children, sorted(loaded & set(LAZY_PACKAGES))
+
+
+def _rpc(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def _read_response(proc: subprocess.Popen, request_id: int) -> dict:
+    """id가 같은 JSON-RPC 응답까지 읽기 (JSON이 아닌 줄은 무시)"""
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("서버가 응답 전에 종료되었습니다")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if message.get("id") == request_id:
+            return message
+
+
+def _time_to_tools_list() -> tuple:
+    """(서버 시작 → 첫 tools/list 응답 ms, 도구 수)"""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(SERVER)],
+        cwd=HERE, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        _rpc(proc, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "1.0"}
+            }
+        })
+        _read_response(proc, 1)
+        _rpc(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _rpc(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = _read_response(proc, 2)["result"]["tools"]
+        return (time.perf_counter() - started) * 1000, len(tools)
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="서버 시작 → 첫 tools/list 시간 측정")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument("--budget-ms", type=float, default=2000, help="허용 최대 시간 (ms)")
+    parser.add_argument("--baseline", default=str(HERE / "bench_startup_baseline.json"), help="기준 파일")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="기준 대비 허용 증가율")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준으로 저장")
+    args = parser.parse_args()
+
+    total, children, eager = _import_profile()
+    print(f"📦 import {MODULE}: {total:.0f}ms")
+    for name, ms in children[:8]:
+        print(f"   {name:<32} {ms:>7.1f}ms")
+
+    samples = []
+    tool_count = 0
+    for _ in range(args.runs):
+        elapsed, tool_count = _time_to_tools_list()
+        samples.append(elapsed)
+    median = statistics.median(samples)
+    print(f"\n🚀 첫 tools/list ({tool_count}개 도구): 중앙값 {median:.0f}ms (최소 {min(samples):.0f}ms, {args.runs}회)")
+
+    failures = []
+    if eager:
+        failures.append(f"시작 시 import된 패키지: {', '.join(eager)}")
+    if median > args.budget_ms:
+        failures.append(f"{median:.0f}ms > 허용 {args.budget_ms:.0f}ms")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps({"tools_list_ms": round(median, 1)}, indent=2) + "\n", encoding="utf-8")
+        print(f"💾 기준 저장: {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["tools_list_ms"]
+        limit = baseline * (1 + args.tolerance)
+        print(f"📏 기준 {baseline:.0f}ms (허용 {limit:.0f}ms)")
+        if median > limit:
+            failures.append(f"기준 대비 {median / baseline - 1:+.0%} 느려짐")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Light Archive MCP - 도구 벤치마크
+
+실제 Supabase 대신 프로세스 안의 PostgREST 대역(stand-in)에 합성 아카이브(generate_corpus.py)를 채우고,
+MCP 도구(검색/목록/조회/유사 항목/생성/수정)를 호출해서 측정합니다.
+서버의 공유 HTTP 클라이언트를 httpx MockTransport로 바꾸므로 supabase-py 요청 생성과
+응답 파싱까지 실제와 같은 경로를 지나고, 요청 수/받은 바이트/행 수는 HTTP 계층에서 셉니다.
+
+측정 항목 (도구 호출 1회 기준):
+- 지연 시간 p50/p95/p99, 서버 p50 (대역 처리 시간을 뺀 시간), db 평균 (PostgREST 대역이 쓴 시간)
+- DB 왕복 수, 받은 바이트, 받은 행 수, 응답 문자 수
+- 첫 호출(색인 생성/캐시 채우기)은 정상 상태 값과 따로: 지연 시간, 왕복, 행, 바이트
+서버의 요청 지표(archive_server_stats)가 대역과 같은 왕복/바이트를 셌는지도 확인합니다.
+
+사용법:
+    python bench_tools.py                          # 1k/10k/100k
+    python bench_tools.py --sizes 1000 --iterations 50
+    python bench_tools.py --update-baseline        # 현재 결과를 기준으로 저장
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import bisect
+import logging
+import random
+import asyncio
+import argparse
+import threading
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# 서버 import 전에 대역 주소 지정 (로컬 복제본은 사용하지 않음)
+os.environ["NEXT_PUBLIC_SUPABASE_URL"] = "https://bench.supabase.local"
+os.environ["NEXT_PUBLIC_SUPABASE_ANON_KEY"] = "bench-anon-key"
+os.environ["ARCHIVE_LOCAL_REPLICA"] = ""
+sys.path.insert(0, str(HERE))
+
+import httpx
+import light_archive_mcp_fixed as server
+from generate_corpus import ENGLISH_WORDS, KOREAN_WORDS, CorpusGenerator
+
+# 요청마다 찍히는 httpx 로그가 결과 표를 가리지 않도록
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+BASELINE_PATH = HERE / "bench_tools_baseline.json"
+DEFAULT_ORDER = (("created_at", True), ("id", True))
+
+
+# ============================================================================
+# POSTGREST STAND-IN
+# ============================================================================
+
+def _split_top_level(text: str) -> list:
+    """쉼표로 나누되 괄호/따옴표 안의 쉼표는 유지"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+_LIKE_CACHE: dict = {}
+
+
+def _like(pattern: str) -> "re.Pattern":
+    compiled = _LIKE_CACHE.get(pattern)
+    if compiled is None:
+        regex = ".*".join(re.escape(part) for part in pattern.split("%"))
+        compiled = _LIKE_CACHE[pattern] = re.compile(regex, re.IGNORECASE | re.DOTALL)
+    return compiled
+
+
+def _condition(column: str, operator: str, value: str):
+    """PostgREST 필터 하나를 행 → bool 함수로 변환"""
+    if operator == "in":
+        values = {_unquote(v) for v in _split_top_level(value[1:-1])}
+        return lambda row: row.get(column) in values
+    if operator in ("ilike", "like"):
+        pattern = _like(value.replace("*", "%"))
+        return lambda row: row.get(column) is not None and pattern.fullmatch(str(row[column])) is not None
+    if operator == "is":
+        expected = None if value == "null" else value == "true"
+        return lambda row: row.get(column) is expected
+    value = _unquote(value)
+    compare = {
+        "eq": lambda a: a == value,
+        "neq": lambda a: a != value,
+        "gt": lambda a: a > value,
+        "gte": lambda a: a >= value,
+        "lt": lambda a: a < value,
+        "lte": lambda a: a <= value,
+    }[operator]
+    return lambda row: row.get(column) is not None and compare(str(row[column]))
+
+
+def _logic(expression: str, combine) -> "callable":
+    """or=(a.eq.1,and(b.lt.2,c.eq.3)) 형식"""
+    conditions = []
+    for part in _split_top_level(expression[1:-1]):
+        if part.startswith("and("):
+            conditions.append(_logic(part[3:], all))
+        elif part.startswith("or("):
+            conditions.append(_logic(part[2:], any))
+        else:
+            column, operator, value = part.split(".", 2)
+            conditions.append(_condition(column, operator, value))
+    return lambda row: combine(condition(row) for condition in conditions)
+
+
+class _ResponseBody(httpx.SyncByteStream):
+    """미리 읽히지 않는 응답 본문 (MockTransport의 content=는 생성 시 바로 읽힘)"""
+
+    def __init__(self, content: bytes):
+        self._content = content
+
+    def __iter__(self):
+        yield self._content
+
+
+def _seek(rows: list, created_at: str, archive_id: str) -> int:
+    """(created_at, id) 내림차순 목록에서 (created_at, id) < 커서인 첫 위치"""
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        row = rows[middle]
+        if ((row.get("created_at") or ""), row["id"]) < (created_at, archive_id):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+class PostgrestStandIn:
+    """
+    archive_items 테이블과 서버가 쓰는 RPC 함수를 메모리에서 흉내 내는 PostgREST 대역
+
+    httpx.MockTransport 핸들러로 사용합니다. 기본 정렬(created_at, id 내림차순)과
+    id 오름차순은 미리 정렬해 두어 목록/커서/동기화 요청이 전체 정렬 없이 끝납니다.
+    """
+
+    RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+    def __init__(self, rows: list):
+        self.rows = {row["id"]: row for row in rows}
+        self._documents: dict = {}
+        self._sorted: dict = {}
+        self._lock = threading.Lock()
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.bytes = 0
+        self.rows_returned = 0
+        self.seconds = 0.0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        with self._lock:
+            status, body, headers = self._handle(request)
+            content = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+            self.requests += 1
+            self.bytes += len(content)
+            self.rows_returned += len(body) if isinstance(body, list) else 0
+            self.seconds += time.perf_counter() - started
+        # 실제 전송처럼 스트림으로 돌려줘야 서버의 요청 지표 훅이 본문을 셈
+        return httpx.Response(
+            status,
+            headers={"content-type": "application/json", "content-length": str(len(content)), **headers},
+            stream=_ResponseBody(content)
+        )
+
+    # ---------------------------------------------------------------- 요청 처리
+
+    def _handle(self, request: httpx.Request) -> tuple:
+        path = request.url.path
+        params = request.url.params
+        if path.startswith("/rest/v1/rpc/"):
+            rows = self._rpc(path.rsplit("/", 1)[1], json.loads(request.content or b"{}"))
+            return self._respond(rows, params, request)
+        if path != "/rest/v1/archive_items":
+            return 404, {"message": f"unknown path {path}"}, {}
+
+        if request.method == "GET":
+            return self._respond(None, params, request)
+        if request.method == "POST":
+            payload = json.loads(request.content)
+            rows = [self._store(row) for row in (payload if isinstance(payload, list) else [payload])]
+            return 201, [self._project(row, params) for row in rows], {}
+        if request.method == "PATCH":
+            changes = json.loads(request.content)
+            match = self._filter(params)
+            rows = [row for row in self._candidates(params) if match(row)]
+            for row in rows:
+                self._store({**row, **changes})
+            return 200, [self._project(self.rows[row["id"]], params) for row in rows], {}
+        return 405, {"message": request.method}, {}
+
+    def _respond(self, rows, params, request) -> tuple:
+        """필터 → 정렬 → offset/limit → select (rows가 None이면 테이블 전체)"""
+        order = self._order(params.get("order"))
+        match = self._filter(params)
+        offset = int(params.get("offset", 0))
+        limit = int(params["limit"]) if "limit" in params else None
+        counting = "count=exact" in request.headers.get("prefer", "")
+
+        if rows is None and self._id_values(params) is not None:
+            rows = self._candidates(params)
+        if rows is None and order in (DEFAULT_ORDER, (("id", False),)):
+            # 미리 정렬된 목록을 앞에서부터 훑고 limit을 채우면 중단
+            source = self._sorted_rows(order)
+            start = 0
+            after = [v for k, v in params.multi_items() if k == "id" and v.startswith("gt.")]
+            upper = [v for k, v in params.multi_items() if k == "created_at" and v.startswith("lte.")]
+            if order == (("id", False),) and after:
+                start = bisect.bisect_right(source, after[-1][3:], key=lambda row: row["id"])
+            elif order == DEFAULT_ORDER and upper:
+                # created_at <= 커서 범위 조건 → 인덱스처럼 해당 위치부터 읽기
+                start = _seek(source, _unquote(upper[-1][4:]), "\uffff")
+            selected = []
+            total = 0
+            for row in source[start:] if start else source:
+                if match(row):
+                    total += 1
+                    if total > offset and (limit is None or len(selected) < limit):
+                        selected.append(row)
+                    elif not counting and limit is not None and len(selected) >= limit:
+                        break
+        else:
+            candidates = [row for row in (self.rows.values() if rows is None else rows) if match(row)]
+            if order:
+                for column, descending in reversed(order):
+                    candidates.sort(key=lambda row: (row.get(column) is None, row.get(column) or ""), reverse=descending)
+            total = len(candidates)
+            selected = candidates[offset:offset + limit if limit is not None else None]
+
+        headers = {}
+        if counting:
+            headers["content-range"] = f"{offset}-{offset + max(len(selected) - 1, 0)}/{total}"
+        return 200, [self._project(row, params) for row in selected], headers
+
+    @staticmethod
+    def _id_values(params):
+        """id=eq./id=in. 필터 값 (기본 키 조회, 없으면 None)"""
+        for key, value in params.multi_items():
+            if key == "id" and value.startswith("eq."):
+                return [_unquote(value[3:])]
+            if key == "id" and value.startswith("in."):
+                return [_unquote(v) for v in _split_top_level(value[4:-1])]
+        return None
+
+    def _candidates(self, params) -> list:
+        ids = self._id_values(params)
+        if ids is None:
+            return list(self.rows.values())
+        return [self.rows[archive_id] for archive_id in ids if archive_id in self.rows]
+
+    @staticmethod
+    def _order(value) -> tuple:
+        if not value:
+            return ()
+        keys = []
+        for part in value.split(","):
+            column, _, direction = part.partition(".")
+            keys.append((column, direction.startswith("desc")))
+        return tuple(keys)
+
+    def _filter(self, params):
+        conditions = []
+        for key, value in params.multi_items():
+            if key in self.RESERVED_PARAMS:
+                continue
+            if key in ("or", "and"):
+                conditions.append(_logic(value, any if key == "or" else all))
+            else:
+                operator, _, operand = value.partition(".")
+                conditions.append(_condition(key, operator, operand))
+        return lambda row: all(condition(row) for condition in conditions)
+
+    @staticmethod
+    def _project(row: dict, params) -> dict:
+        select = params.get("select", "*")
+        if select == "*":
+            return dict(row)
+        return {column: row.get(column) for column in select.split(",")}
+
+    def _store(self, row: dict) -> dict:
+        now = datetime.now(timezone.utc).isoformat()
+        stored = {
+            "status": "published", "tags": [], "technologies": [], "view_count": 0, "comment_count": 0,
+            "created_at": now, **row, "updated_at": now
+        }
+        self.rows[stored["id"]] = stored
+        self._documents.pop(stored["id"], None)
+        self._sorted.clear()
+        return stored
+
+    def _sorted_rows(self, order: tuple) -> list:
+        rows = self._sorted.get(order)
+        if rows is None:
+            rows = list(self.rows.values())
+            for column, descending in reversed(order):
+                rows.sort(key=lambda row: row.get(column) or "", reverse=descending)
+            self._sorted[order] = rows
+        return rows
+
+    def _document(self, row: dict) -> str:
+        """검색용 문서 (004의 archive_search_document와 같음, 소문자)"""
+        document = self._documents.get(row["id"])
+        if document is None:
+            document = self._documents[row["id"]] = " ".join([
+                row.get("title") or "", row.get("description") or "",
+                re.sub(r"<[^>]*>", " ", row.get("content") or "")
+            ]).lower()
+        return document
+
+    # ---------------------------------------------------------------- RPC
+
+    def _rpc(self, name: str, args: dict) -> list:
+        category = args.get("category_filter")
+        if name == "list_archive_items_page":
+            # (created_at, id) < 커서 행 비교 → 정렬된 목록에서 범위 탐색
+            source = self._sorted_rows(DEFAULT_ORDER)
+            status = args.get("status_filter")
+            page = []
+            for row in source[_seek(source, args["cursor_created_at"], args["cursor_id"]):]:
+                if (status is None or row.get("status") == status) and (category is None or row.get("category") == category):
+                    page.append(row)
+                    if len(page) >= args["page_size"]:
+                        break
+            return page
+        published = [
+            row for row in self.rows.values()
+            if row.get("status") == "published" and (category is None or row.get("category") == category)
+        ]
+        if name == "search_archive_items":
+            terms = args["search_query"].lower().split()
+            ranked = []
+            for row in published:
+                document = self._document(row)
+                if all(term in document for term in terms):
+                    ranked.append((sum(document.count(term) for term in terms), row))
+            ranked.sort(key=lambda item: (item[0], item[1]["created_at"], item[1]["id"]), reverse=True)
+            return [row for _, row in ranked]
+        if name == "search_archive_items_trgm":
+            needle = args["search_query"].lower()
+            return [row for row in published if needle in self._document(row)]
+        if name == "find_related_archive_items":
+            base = self.rows.get(args["base_id"])
+            if base is None:
+                return []
+            tags, techs = set(base.get("tags") or []), set(base.get("technologies") or [])
+            scored = []
+            for row in published:
+                if row["id"] == base["id"]:
+                    continue
+                shared_tags = len(tags & set(row.get("tags") or []))
+                shared_techs = len(techs & set(row.get("technologies") or []))
+                same_category = row.get("category") == base.get("category")
+                if shared_tags or shared_techs or same_category:
+                    score = 30 * same_category + 10 * shared_tags + 5 * shared_techs
+                    scored.append({"id": row["id"], "score": score})
+            scored.sort(key=lambda item: (item["score"], item["id"]), reverse=True)
+            return scored[:args.get("result_limit", 4)]
+        if name == "bulk_update_archive_items":
+            updated = []
+            for item in args["items"]:
+                row = self.rows.get(item["id"])
+                if row is not None:
+                    changes = {k: v for k, v in item.items() if v is not None}
+                    updated.append(self._store({**row, **changes}))
+            return updated
+        raise ValueError(f"unknown rpc {name}")
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _sentence(rng: random.Random, words: int) -> str:
+    pool = KOREAN_WORDS if rng.random() < 0.6 else ENGLISH_WORDS
+    return " ".join(rng.choice(pool) for _ in range(words)) + "."
+
+
+def _cases(rows: list, corpus: CorpusGenerator) -> dict:
+    """측정할 도구 호출 (이름 → (도구, rng로 입력을 만드는 함수))"""
+    ids = [row["id"] for row in rows]
+    published = [row for row in rows if row["status"] == "published"]
+
+    def cursor(rng):
+        row = rng.choice(published)
+        return server._encode_cursor({"c": row["created_at"], "i": row["id"]})
+
+    return {
+        "search_ilike_en": (server.archive_search_archives, lambda rng: server.SearchArchivesInput(
+            query=rng.choice(ENGLISH_WORDS), mode="ilike")),
+        "search_trigram_ko": (server.archive_search_archives, lambda rng: server.SearchArchivesInput(
+            query=rng.choice(KOREAN_WORDS))),
+        "search_fulltext_en": (server.archive_search_archives, lambda rng: server.SearchArchivesInput(
+            query=rng.choice(ENGLISH_WORDS), mode="fulltext")),
+        "list_first_page": (server.archive_list_archives, lambda rng: server.ListArchivesInput()),
+        "list_cursor_page": (server.archive_list_archives, lambda rng: server.ListArchivesInput(
+            cursor=cursor(rng))),
+        "get_markdown": (server.archive_get_archive, lambda rng: server.GetArchiveInput(
+            archive_id=rng.choice(ids))),
+        "get_json_html": (server.archive_get_archive, lambda rng: server.GetArchiveInput(
+            archive_id=rng.choice(ids), response_format="json", content_format="html")),
+        "find_related_index": (server.archive_find_related, lambda rng: server.FindRelatedInput(
+            archive_id=rng.choice(published)["id"])),
+        "find_related_rpc": (server.archive_find_related, lambda rng: server.FindRelatedInput(
+            archive_id=rng.choice(published)["id"])),
+        "create": (server.archive_create_archive, lambda rng: server.CreateArchiveInput(
+            title=_sentence(rng, 4).rstrip("."),
+            content=f"<p>{_sentence(rng, 40)}</p>",
+            category=rng.choice(["기술", "프로젝트"]),
+            description=_sentence(rng, 12),
+            tags=rng.sample(corpus.tags[:20], 3),
+            technologies=rng.sample(corpus.technologies[:10], 2))),
+        "update": (server.archive_update_archive, lambda rng: server.UpdateArchiveInput(
+            archive_id=rng.choice(ids), title=_sentence(rng, 5).rstrip("."))),
+    }
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def _run_case(standin: PostgrestStandIn, tool, make_input, iterations: int, warmup: int, seed: str) -> dict:
+    """
+    도구 하나 측정
+
+    서버 캐시/색인을 비운 뒤 처음 warmup번은 준비 단계(색인 생성, 캐시 채우기)로 따로 보고하고,
+    이후 iterations번의 정상 상태 값만 집계합니다. 그래서 결과가 호출 횟수에 따라 달라지지 않습니다.
+    """
+    rng = random.Random(seed)
+    _reset_server_state()
+    server._server_metrics.reset()
+    latencies, app_times, db_times, requests, received, rows, chars = [], [], [], [], [], [], []
+    cold: dict = {}
+    total_requests = total_bytes = 0
+    for call in range(warmup + iterations):
+        params = make_input(rng)
+        standin.reset_counters()
+        started = time.perf_counter()
+        output = await tool(params)
+        latency = (time.perf_counter() - started) * 1000
+        if output.startswith("Error"):
+            raise RuntimeError(f"{tool.__name__}: {output[:200]}")
+        total_requests += standin.requests
+        total_bytes += standin.bytes
+        if call < warmup:
+            if call == 0:
+                cold = {
+                    "cold_ms": round(latency, 2),
+                    "cold_round_trips": standin.requests,
+                    "cold_rows": standin.rows_returned,
+                    "cold_bytes": standin.bytes,
+                }
+            continue
+        latencies.append(latency)
+        db_times.append(standin.seconds * 1000)
+        app_times.append(latency - db_times[-1])
+        requests.append(standin.requests)
+        received.append(standin.bytes)
+        rows.append(standin.rows_returned)
+        chars.append(len(output))
+
+    # 서버의 요청 지표 훅(@_metered + response 훅)이 대역과 같은 값을 셌는지 확인
+    metered = server._server_metrics.snapshot(tool.__name__)["tools"][tool.__name__]
+    if (metered["calls"], metered["round_trips"]["db"], metered["bytes"]) != (
+            warmup + iterations, total_requests, total_bytes):
+        raise RuntimeError(
+            f"{tool.__name__}: metrics mismatch (calls {metered['calls']}, "
+            f"round trips {metered['round_trips']['db']} vs {total_requests}, bytes {metered['bytes']} vs {total_bytes})"
+        )
+
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "app_p50_ms": round(_percentile(app_times, 0.50), 2),
+        "db_ms": round(statistics.mean(db_times), 2),
+        "round_trips": round(statistics.mean(requests), 2),
+        "bytes": round(statistics.mean(received)),
+        "rows": round(statistics.mean(rows), 1),
+        "chars": round(statistics.mean(chars)),
+        **cold,
+        # 호출별 값 (입력 순서가 seed로 고정되므로 호출 횟수가 달라도 앞부분끼리 비교 가능)
+        "per_call": {"round_trips": requests, "rows": rows, "bytes": received},
+    }
+
+
+def _reset_server_state() -> None:
+    """측정마다 서버 캐시/색인을 비움 (이전 측정의 캐시가 결과에 섞이지 않도록)"""
+    server._archive_cache = server.ArchiveCache(server.CACHE_MAX_ENTRIES, server.CACHE_TTL_SECONDS)
+    server._rendered_content = server.RenderedContentCache(server.RENDER_CACHE_MAX_ENTRIES)
+    server._related_index = server.RelatedIndex(
+        server.RELATED_INDEX_REFRESH_SECONDS, server.RELATED_INDEX_REBUILD_SECONDS
+    )
+
+
+async def _run(sizes: list, iterations: int, warmup: int, only: list, body_words: int) -> dict:
+    results = {}
+    for size in sizes:
+        started = time.perf_counter()
+        corpus = CorpusGenerator(body_words=body_words)
+        rows = list(corpus.rows(size))
+        standin = PostgrestStandIn(rows)
+        # 서버와 같은 이벤트 훅 (작업별 타임아웃, 요청 지표)
+        server._http_client = httpx.Client(
+            transport=httpx.MockTransport(standin), event_hooks=server._http_event_hooks()
+        )
+        server.supabase = server._LazySupabaseClient()
+        print(f"\n📚 {size:,}개 아카이브 (생성 {time.perf_counter() - started:.1f}초)")
+        print(
+            f"{'도구':<20} {'p50':>8} {'p95':>8} {'p99':>8} {'서버 p50':>8} {'db 평균':>8} "
+            f"{'왕복':>5} {'받은 KB':>8} {'행':>7} {'응답 문자':>8} {'첫 호출':>9} {'첫 행':>7}"
+        )
+
+        results[str(size)] = {}
+        for name, (tool, make_input) in _cases(rows, corpus).items():
+            if only and name not in only:
+                continue
+            server.RELATED_STRATEGY = "rpc" if name == "find_related_rpc" else "index"
+            result = await _run_case(standin, tool, make_input, iterations, warmup, seed=f"{size}:{name}")
+            results[str(size)][name] = result
+            print(
+                f"{name:<20} {result['p50_ms']:>6.1f}ms {result['p95_ms']:>6.1f}ms {result['p99_ms']:>6.1f}ms "
+                f"{result['app_p50_ms']:>8.1f}ms {result['db_ms']:>8.1f}ms {result['round_trips']:>5.1f} "
+                f"{result['bytes'] / 1024:>10.1f} {result['rows']:>7.1f} {result['chars']:>11,} "
+                f"{result.get('cold_ms', 0):>9.1f}ms {result.get('cold_rows', 0):>7,}"
+            )
+    return results
+
+
+def _compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    기준 대비 회귀 목록
+
+    지연 시간은 대역 처리 시간을 뺀 서버 p50을 허용 비율로 비교하고,
+    왕복/행/바이트는 첫 호출 값과, 두 측정에 공통인 앞부분 호출의 평균이
+    5% 넘게 늘어나면 회귀로 봅니다 (같은 입력끼리 비교하므로 --iterations와 무관).
+    """
+    regressions = []
+    for size, cases in results.items():
+        for name, result in cases.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            if (result["app_p50_ms"] > base["app_p50_ms"] * (1 + tolerance)
+                    and result["app_p50_ms"] - base["app_p50_ms"] > 1):
+                regressions.append(f"{size}/{name}: 서버 p50 {base['app_p50_ms']}ms → {result['app_p50_ms']}ms")
+            for metric in ("cold_round_trips", "cold_rows", "cold_bytes"):
+                if metric in base and result[metric] > base[metric] * 1.05:
+                    regressions.append(f"{size}/{name}: {metric} {base[metric]} → {result[metric]}")
+            for metric, values in result["per_call"].items():
+                base_values = base.get("per_call", {}).get(metric)
+                if not base_values:
+                    continue
+                count = min(len(values), len(base_values))
+                current, expected = sum(values[:count]) / count, sum(base_values[:count]) / count
+                if current > expected * 1.05:
+                    regressions.append(
+                        f"{size}/{name}: {metric} {expected:,.1f} → {current:,.1f} (앞 {count}회 평균)"
+                    )
+    return regressions
+
+
+def _dump_baseline(baseline: dict) -> str:
+    """기준 파일 JSON (호출별 숫자 목록은 한 줄로)"""
+    text = json.dumps(baseline, ensure_ascii=False, indent=2)
+    return re.sub(
+        r"\[\n\s+((?:-?[\d.]+,\n\s+)*-?[\d.]+)\n\s+\]",
+        lambda match: "[" + re.sub(r",\n\s+", ", ", match.group(1)) + "]",
+        text
+    ) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MCP 도구 벤치마크 (PostgREST 대역 + 합성 코퍼스)")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="코퍼스 크기 (쉼표 구분)")
+    parser.add_argument("--iterations", type=int, default=30, help="도구별 호출 횟수 (준비 호출 제외)")
+    parser.add_argument("--warmup", type=int, default=1, help="집계에서 뺄 준비 호출 수 (첫 호출은 따로 보고)")
+    parser.add_argument("--only", default="", help="측정할 도구 이름 (쉼표 구분)")
+    parser.add_argument("--body-words", type=int, default=150, help="본문 단어 수 중앙값 (generate_corpus.py)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="기준 파일")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="지연 시간 허용 증가율")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준으로 저장")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    only = [name for name in args.only.split(",") if name.strip()]
+    results = asyncio.run(_run(sizes, args.iterations, args.warmup, only, args.body_words))
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        for size, cases in results.items():
+            baseline.setdefault(size, {}).update(cases)
+        baseline_path.write_text(_dump_baseline(baseline), encoding="utf-8")
+        print(f"\n💾 기준 저장: {baseline_path}")
+    elif baseline_path.exists():
+        regressions = _compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\n❌ 기준 대비 회귀:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
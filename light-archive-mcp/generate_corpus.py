@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Light Archive MCP - 합성 아카이브 코퍼스 생성기
+
+archive_items와 같은 모양의 행을 N개 만들어서 스트리밍으로 출력합니다.
+부하/규모 테스트용 로컬 DB를 채우거나 bench_tools.py의 코퍼스로 사용합니다.
+
+- 본문: 한국어/영어 HTML (제목, 문단, 목록, 코드 블록), 단어 수는 로그정규분포
+- 태그/기술: Zipf 분포 (소수의 인기 태그가 대부분의 아카이브에 등장)
+- 카테고리: archive_items CHECK 제약 값
+- created_at: 기간 전체에 고르게 분포, updated_at은 그 이후
+
+출력 형식:
+- copy: psql로 바로 실행할 수 있는 `COPY archive_items (...) FROM stdin;` 스크립트
+- ndjson: 한 줄에 행 하나 (`light_archive_mcp_fixed.py import`로 가져오기 가능)
+출력 파일이 .gz로 끝나면 gzip으로 압축합니다.
+
+사용법:
+    python generate_corpus.py 1000000 -o corpus.sql.gz
+    psql "$DATABASE_URL" -c "TRUNCATE archive_items" && gunzip -c corpus.sql.gz | psql "$DATABASE_URL"
+
+    python generate_corpus.py 10000 --format ndjson -o corpus.ndjson
+    python light_archive_mcp_fixed.py import corpus.ndjson
+"""
+
+import io
+import sys
+import json
+import gzip
+import math
+import time
+import random
+import string
+import argparse
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+CATEGORIES = ["기술", "프로젝트", "AI", "Technology", "Research", "News"]
+CATEGORY_WEIGHTS = [40, 25, 15, 10, 6, 4]
+STATUSES = ["published", "draft", "archived"]
+STATUS_WEIGHTS = [85, 10, 5]
+DIFFICULTIES = ["초급", "중급", "고급", None]
+
+KOREAN_WORDS = (
+    "데이터 서버 성능 배포 검색 색인 캐시 모델 학습 추론 설계 구조 테스트 문서 사용자 요청 응답 지연 "
+    "처리량 메모리 네트워크 보안 인증 이미지 변환 저장소 분석 실험 결과 개선 프로젝트 기능 구현 화면 "
+    "컴포넌트 상태 관리 비동기 병렬 파이프라인 모니터링 로그 장애 복구 확장 비용 자동화 품질 리뷰"
+).split()
+KOREAN_ENDINGS = ["합니다", "했습니다", "입니다", "할 수 있습니다", "되었습니다", "하는 방법을 정리했습니다"]
+ENGLISH_WORDS = (
+    "python postgres index cache latency throughput query vector embedding pipeline deploy kubernetes "
+    "docker search ranking model training inference storage image async thread request response server "
+    "client database migration schema benchmark profile memory network security token stream batch"
+).split()
+
+_TAG_STEMS = (
+    "AI 챗봇 웹개발 프론트엔드 백엔드 데이터분석 머신러닝 딥러닝 자연어처리 컴퓨터비전 클라우드 "
+    "DevOps 보안 성능최적화 데이터베이스 검색 모바일 UI/UX 오픈소스 자동화 테스트 아키텍처 MLOps "
+    "RAG LLM 튜토리얼 회고 리서치 뉴스 스타트업"
+).split()
+_TECH_STEMS = (
+    "Python TypeScript JavaScript React Next.js Vue Node.js FastAPI Django Flask PostgreSQL Supabase "
+    "Redis Docker Kubernetes AWS GCP Terraform PyTorch TensorFlow OpenAI API LangChain Tailwind CSS "
+    "Go Rust Java Spring Kotlin Swift GraphQL Elasticsearch Kafka Airflow Pandas NumPy"
+).split()
+
+SENTENCE_POOL_SIZE = 4096
+SENTENCE_WORDS = 12  # 문장 묶음의 평균 단어 수
+
+COPY_COLUMNS = [
+    "id", "title", "description", "excerpt", "content", "category", "sub_category", "status", "date",
+    "tags", "technologies", "difficulty", "author", "thumbnail_url", "view_count", "comment_count",
+    "created_at", "updated_at", "published_at",
+]
+
+
+def _vocabulary(stems: List[str], size: int) -> List[str]:
+    """기본 어휘 뒤에 번호 붙은 변형을 붙여서 size개로 확장 (앞쪽일수록 인기)"""
+    words = list(stems)
+    for n in itertools.count(2):
+        if len(words) >= size:
+            break
+        words.extend(f"{stem}-{n}" for stem in stems)
+    return words[:size]
+
+
+def _zipf_cumulative(size: int, exponent: float) -> List[float]:
+    """순위 r의 가중치 1/r^s 누적합 (random.choices의 cum_weights)"""
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+class CorpusGenerator:
+    """
+    합성 archive_items 행 생성기
+
+    같은 seed와 설정이면 항상 같은 행을 만듭니다.
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        body_words: int = 400,
+        body_sigma: float = 0.8,
+        korean_ratio: float = 0.6,
+        tag_vocabulary: int = 500,
+        tech_vocabulary: int = 150,
+        zipf_exponent: float = 1.1,
+        end: Optional[datetime] = None,
+        days: int = 3 * 365,
+        categories: Optional[List[str]] = None
+    ):
+        unknown = set(categories or []) - set(CATEGORIES)
+        if unknown:
+            raise ValueError(f"categories must be archive_items CHECK values {CATEGORIES}: {sorted(unknown)}")
+        self.categories = list(categories or CATEGORIES)
+        self._category_weights = [CATEGORY_WEIGHTS[CATEGORIES.index(c)] for c in self.categories]
+        self.rng = random.Random(seed)
+        self.body_mu = math.log(body_words)
+        self.body_sigma = body_sigma
+        self.korean_ratio = korean_ratio
+        self.tags = _vocabulary(_TAG_STEMS, tag_vocabulary)
+        self.technologies = _vocabulary(_TECH_STEMS, tech_vocabulary)
+        self._tag_weights = _zipf_cumulative(len(self.tags), zipf_exponent)
+        self._tech_weights = _zipf_cumulative(len(self.technologies), zipf_exponent)
+        self.end = end or datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.span_seconds = days * 86400
+        # 본문 문장은 미리 만든 문장 묶음에서 골라서 행 생성 속도를 유지
+        self._sentences = {
+            korean: [self._sentence(korean, self.rng.randint(6, 18)) for _ in range(SENTENCE_POOL_SIZE)]
+            for korean in (True, False)
+        }
+
+    # ---------------------------------------------------------------- 텍스트
+
+    def _sentence(self, korean: bool, words: int) -> str:
+        if korean:
+            return " ".join(self.rng.choices(KOREAN_WORDS, k=words)) + " " + self.rng.choice(KOREAN_ENDINGS) + "."
+        text = " ".join(self.rng.choices(ENGLISH_WORDS, k=words))
+        return text[0].upper() + text[1:] + "."
+
+    def _paragraph(self, korean: bool, words: int) -> str:
+        return " ".join(self.rng.choices(self._sentences[korean], k=max(1, words // SENTENCE_WORDS)))
+
+    def _body(self, korean: bool) -> str:
+        """제목/문단/목록/코드 블록으로 이루어진 HTML 본문 (단어 수는 로그정규분포)"""
+        remaining = max(30, int(self.rng.lognormvariate(self.body_mu, self.body_sigma)))
+        parts = []
+        while remaining > 0:
+            parts.append(f"<h2>{self._sentence(korean, self.rng.randint(2, 5)).rstrip('.')}</h2>")
+            for _ in range(self.rng.randint(1, 4)):
+                words = min(remaining, self.rng.randint(20, 80))
+                parts.append(f"<p>{self._paragraph(korean, words)}</p>")
+                remaining -= words
+            roll = self.rng.random()
+            if roll < 0.3:
+                items = "".join(
+                    f"<li><strong>{self.rng.choice(KOREAN_WORDS if korean else ENGLISH_WORDS)}:</strong> "
+                    f"{self._sentence(korean, self.rng.randint(4, 10))}</li>"
+                    for _ in range(self.rng.randint(2, 5))
+                )
+                parts.append(f"<ul>{items}</ul>")
+                remaining -= 20
+            elif roll < 0.45:
+                code = "\n".join(
+                    f"{self.rng.choice(ENGLISH_WORDS)} = {self.rng.choice(ENGLISH_WORDS)}({self.rng.randint(0, 99)})"
+                    for _ in range(self.rng.randint(2, 8))
+                )
+                parts.append(f'<pre><code class="language-python">{code}</code></pre>')
+                remaining -= 15
+        return "".join(parts)
+
+    # ---------------------------------------------------------------- 행
+
+    def row(self) -> Dict[str, Any]:
+        rng = self.rng
+        korean = rng.random() < self.korean_ratio
+        created = self.end - timedelta(seconds=rng.randrange(self.span_seconds))
+        updated = created + timedelta(seconds=int(rng.expovariate(1 / 86400)) if rng.random() < 0.3 else 0)
+        status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+        description = self._sentence(korean, rng.randint(10, 25))
+        return {
+            "id": f"{int(created.timestamp() * 1000)}-{''.join(rng.choices(string.ascii_lowercase + string.digits, k=6))}",
+            "title": self._sentence(korean, rng.randint(3, 8)).rstrip("."),
+            "description": description,
+            "excerpt": description if rng.random() < 0.5 else None,
+            "content": self._body(korean),
+            "category": rng.choices(self.categories, self._category_weights)[0],
+            "sub_category": rng.choice(self.tags[:30]) if rng.random() < 0.4 else None,
+            "status": status,
+            "date": f"{created.year}년 {created.month}월 {created.day}일",
+            "tags": sorted(set(rng.choices(self.tags, cum_weights=self._tag_weights, k=rng.randint(1, 8)))),
+            "technologies": sorted(set(
+                rng.choices(self.technologies, cum_weights=self._tech_weights, k=rng.randint(1, 6))
+            )),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "author": rng.choice(["Light", "Archive Bot", None]),
+            "thumbnail_url": None,
+            "view_count": int(rng.paretovariate(1.2) * 10),
+            "comment_count": int(rng.expovariate(1 / 3)),
+            "created_at": created.isoformat(),
+            "updated_at": updated.isoformat(),
+            "published_at": created.isoformat() if status == "published" else None,
+        }
+
+    def rows(self, count: int) -> Iterator[Dict[str, Any]]:
+        for _ in range(count):
+            yield self.row()
+
+
+def generate_rows(count: int, seed: int = 42, **options: Any) -> Iterator[Dict[str, Any]]:
+    """합성 행 count개 (옵션은 CorpusGenerator 참고)"""
+    return CorpusGenerator(seed, **options).rows(count)
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _copy_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _copy_array(values: List[str]) -> str:
+    """Postgres 배열 리터럴 {"a","b"}"""
+    return "{" + ",".join('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values) + "}"
+
+
+def _copy_line(row: Dict[str, Any]) -> str:
+    """COPY text 형식 한 줄 (NULL은 \\N)"""
+    fields = []
+    for column in COPY_COLUMNS:
+        value = row.get(column)
+        if value is None:
+            fields.append("\\N")
+        elif isinstance(value, list):
+            fields.append(_copy_escape(_copy_array(value)))
+        else:
+            fields.append(_copy_escape(str(value)))
+    return "\t".join(fields) + "\n"
+
+
+def _open_output(path: str):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", write_through=False)
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=1)
+    return open(path, "w", encoding="utf-8", buffering=1024 * 1024)
+
+
+def write_corpus(rows: Iterator[Dict[str, Any]], out, output_format: str, on_progress=None) -> int:
+    """행을 COPY 스크립트 또는 NDJSON으로 기록하고 행 수 반환"""
+    if output_format == "copy":
+        out.write(f"COPY archive_items ({', '.join(COPY_COLUMNS)}) FROM stdin;\n")
+    written = 0
+    for row in rows:
+        if output_format == "copy":
+            out.write(_copy_line(row))
+        else:
+            out.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+        written += 1
+        if on_progress is not None and written % 100_000 == 0:
+            on_progress(written)
+    if output_format == "copy":
+        out.write("\\.\n")
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="합성 archive_items 코퍼스 생성")
+    parser.add_argument("count", type=int, help="생성할 행 수")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: stdout, .gz면 압축)")
+    parser.add_argument("--format", choices=["copy", "ndjson"], default="copy", help="출력 형식")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--body-words", type=int, default=400, help="본문 단어 수 중앙값")
+    parser.add_argument("--body-sigma", type=float, default=0.8, help="본문 길이 로그정규분포 sigma")
+    parser.add_argument("--korean-ratio", type=float, default=0.6, help="한국어 아카이브 비율")
+    parser.add_argument("--tags", type=int, default=500, help="태그 어휘 수")
+    parser.add_argument("--technologies", type=int, default=150, help="기술 어휘 수")
+    parser.add_argument("--zipf", type=float, default=1.1, help="태그/기술 Zipf 지수")
+    parser.add_argument("--days", type=int, default=3 * 365, help="created_at 분포 기간 (일)")
+    parser.add_argument(
+        "--categories", default=",".join(CATEGORIES),
+        help="사용할 카테고리 (쉼표 구분, CHECK 값 중에서 선택. 예: 기술,프로젝트)"
+    )
+    args = parser.parse_args()
+
+    try:
+        generator = CorpusGenerator(
+            seed=args.seed,
+            body_words=args.body_words,
+            body_sigma=args.body_sigma,
+            korean_ratio=args.korean_ratio,
+            tag_vocabulary=args.tags,
+            tech_vocabulary=args.technologies,
+            zipf_exponent=args.zipf,
+            days=args.days,
+            categories=[c.strip() for c in args.categories.split(",") if c.strip()]
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    started = time.monotonic()
+
+    def progress(written: int) -> None:
+        elapsed = time.monotonic() - started
+        print(f"  {written:,}/{args.count:,}행 ({written / elapsed:,.0f}행/초)", file=sys.stderr)
+
+    with _open_output(args.output) as out:
+        written = write_corpus(generator.rows(args.count), out, args.format, progress)
+    print(f"✅ {written:,}행 생성 ({time.monotonic() - started:.1f}초)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
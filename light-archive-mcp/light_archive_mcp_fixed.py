@@ -13,24 +13,53 @@ v1.0.7 변경사항:
 """
 
 import os
+import sys
 import json
+import gzip
+import argparse
 import asyncio
 import time
 import random
 import string
 import io
-from typing import Optional, List, Dict, Any
+import re
+import base64
+import binascii
+import html
+import sqlite3
+import functools
+import heapq
+import bisect
+import hashlib
+import threading
+import importlib.util
+import tempfile
+import contextvars
+import multiprocessing
+from collections import OrderedDict, deque
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Set, TYPE_CHECKING
 from enum import Enum
 from datetime import datetime
 from pathlib import Path
 
 # Third-party imports
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field, ConfigDict
-from mcp.server.fastmcp import FastMCP
-from supabase import create_client, Client
-from openai import AsyncOpenAI
-from PIL import Image as PILImage
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from mcp.server.fastmcp import FastMCP, Context
+import httpx
+
+# supabase/openai/PIL/numpy는 처음 쓰는 경로에서 import (서버 시작 시간 단축)
+if TYPE_CHECKING:
+    from supabase import Client
+    from openai import AsyncOpenAI
+    import numpy as np
+
+try:
+    import zstandard  # 선택: zstd 압축 내보내기
+except ImportError:
+    zstandard = None
 
 # Load environment variables
 load_dotenv()
@@ -42,33 +71,113 @@ load_dotenv()
 # Initialize MCP server
 mcp = FastMCP("light_archive_mcp")
 
-# Initialize Supabase client
+# Shared HTTP client (PostgREST/Storage/TUS 업로드가 같은 커넥션 풀 사용)
+# 연결을 재사용해서 요청마다 TCP/TLS 핸드셰이크를 하지 않고, HTTP/2면 한 연결로 동시 요청을 보냅니다.
+HTTP2_ENABLED = os.getenv("ARCHIVE_HTTP2", "1") not in ("0", "false", "no")
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("ARCHIVE_HTTP_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("ARCHIVE_HTTP_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=float(os.getenv("ARCHIVE_HTTP_KEEPALIVE_SECONDS", "60"))
+)
+# 작업별 타임아웃 (연결/풀 대기는 공통, 읽기/쓰기는 DB와 Storage가 다름)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("ARCHIVE_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("ARCHIVE_HTTP_POOL_TIMEOUT", "10"))
+HTTP_TIMEOUTS = {
+    "/rest/": httpx.Timeout(
+        float(os.getenv("ARCHIVE_DB_TIMEOUT", "30")), connect=HTTP_CONNECT_TIMEOUT, pool=HTTP_POOL_TIMEOUT
+    ),
+    "/storage/": httpx.Timeout(
+        float(os.getenv("ARCHIVE_STORAGE_TIMEOUT", "120")), connect=HTTP_CONNECT_TIMEOUT, pool=HTTP_POOL_TIMEOUT
+    ),
+}
+
+
+def _apply_operation_timeout(request: httpx.Request) -> None:
+    """요청 경로(/rest/, /storage/)에 맞는 타임아웃 적용 (httpx request 훅)"""
+    for prefix, timeout in HTTP_TIMEOUTS.items():
+        if request.url.path.startswith(prefix):
+            request.extensions["timeout"] = timeout.as_dict()
+            return
+
+
+def _http_event_hooks() -> Dict[str, list]:
+    """공유 클라이언트 이벤트 훅 (작업별 타임아웃, 요청 지표) - 벤치마크 클라이언트도 사용"""
+    return {"request": [_apply_operation_timeout], "response": [_meter_response]}
+
+
+def _create_http_client(http2: bool = HTTP2_ENABLED) -> httpx.Client:
+    """공유 HTTP 클라이언트 생성 (h2 패키지가 없으면 HTTP/1.1)"""
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("Warning: h2 package not found, using HTTP/1.1 (pip install 'httpx[http2]')", file=sys.stderr)
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        limits=HTTP_LIMITS,
+        timeout=HTTP_TIMEOUTS["/rest/"],
+        follow_redirects=True,
+        event_hooks=_http_event_hooks()
+    )
+
+
+_http_client: Optional[httpx.Client] = None
+_client_lock = threading.RLock()
+
+
+def _get_http_client() -> httpx.Client:
+    """공유 HTTP 클라이언트 (첫 사용 시 생성)"""
+    global _http_client
+    if _http_client is None:
+        with _client_lock:
+            if _http_client is None:
+                _http_client = _create_http_client()
+    return _http_client
+
+
+# Initialize Supabase client (첫 요청 시 생성)
 SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
 SUPABASE_ANON_KEY = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY", "")
 
+
+class _LazySupabaseClient:
+    """
+    첫 속성 접근 시 supabase 패키지를 import하고 클라이언트를 생성하는 프록시
+
+    MCP 세션마다 서버가 새로 시작되므로, tools/list 응답 전에는 생성하지 않습니다.
+    """
+
+    def __init__(self):
+        self._client: Optional["Client"] = None
+
+    def _resolve(self) -> "Client":
+        if self._client is None:
+            with _client_lock:
+                if self._client is None:
+                    from supabase import create_client, ClientOptions
+                    try:
+                        self._client = create_client(
+                            SUPABASE_URL, SUPABASE_ANON_KEY, options=ClientOptions(httpx_client=_get_http_client())
+                        )
+                    except Exception as e:
+                        raise RuntimeError(f"Failed to initialize Supabase: {e}")
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-    print("Warning: Supabase credentials not found")
-    supabase: Optional[Client] = None
+    print("Warning: Supabase credentials not found", file=sys.stderr)
+    supabase: Optional["Client"] = None
 else:
-    try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-    except Exception as e:
-        print(f"Warning: Failed to initialize Supabase: {e}")
-        supabase = None
+    supabase = _LazySupabaseClient()
 
-# Initialize OpenAI client
+# Initialize OpenAI client (AI 경로에서 처음 사용할 때 생성)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 if not OPENAI_API_KEY:
-    print("Warning: OpenAI API key not found")
-    openai_client: Optional[AsyncOpenAI] = None
-else:
-    try:
-        openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-    except Exception as e:
-        print(f"Warning: Failed to initialize OpenAI: {e}")
-        openai_client = None
+    print("Warning: OpenAI API key not found", file=sys.stderr)
+openai_client: Optional["AsyncOpenAI"] = None
 
 # ============================================================================
 # CONSTANTS
@@ -76,8 +185,102 @@ else:
 
 CHARACTER_LIMIT = 25000
 DEFAULT_LIMIT = 20
+CONTENT_CHUNK_SIZE = 10000  # archive_get_archive_content 기본 조각 크기
 MAX_RETRIES = 3
 
+# 목록/검색/유사 항목 조회 시 기본으로 가져오는 요약 컬럼 (본문 content 제외)
+ARCHIVE_SUMMARY_FIELDS = [
+    "id", "title", "description", "category", "sub_category", "status",
+    "tags", "technologies", "thumbnail_url", "created_at", "updated_at"
+]
+
+# Markdown 응답 렌더링에 필요한 컬럼
+SEARCH_MARKDOWN_FIELDS = ["id", "title", "category", "sub_category", "description", "tags", "technologies"]
+LIST_MARKDOWN_FIELDS = ["id", "title", "category", "tags"]
+# 유사도 계산에 필요한 컬럼
+RELATED_SCORING_FIELDS = ["id", "title", "category", "tags", "technologies"]
+
+# 유사도 가중치 (카테고리 일치 / 태그 1개 / 기술 1개)
+RELATED_CATEGORY_WEIGHT = 30
+RELATED_TAG_WEIGHT = 10
+RELATED_TECH_WEIGHT = 5
+
+# 일괄 생성/수정 (항목 수 상한, 요청 하나당 행 수)
+BULK_MAX_ITEMS = 1000
+BULK_CHUNK_SIZE = int(os.getenv("ARCHIVE_BULK_CHUNK_SIZE", "100"))
+
+# 가져오기 (요청 하나당 행 수, 동시에 보내는 요청 수)
+IMPORT_BATCH_SIZE = int(os.getenv("ARCHIVE_IMPORT_BATCH_SIZE", "500"))
+IMPORT_CONCURRENCY = int(os.getenv("ARCHIVE_IMPORT_CONCURRENCY", "4"))
+IMPORT_MAX_RETRIES = 3
+
+# 원본에 값이 있으면 그대로 유지하는 컬럼 (내보내기 파일 재적재용)
+IMPORT_PRESERVED_FIELDS = [
+    "status", "date", "field", "image", "view_count", "comment_count",
+    "created_at", "updated_at", "published_at"
+]
+
+# 동시 실행 제한 (여러 에이전트가 서버 하나를 공유할 때 조정)
+DB_MAX_CONCURRENCY = int(os.getenv("ARCHIVE_DB_MAX_CONCURRENCY", "8"))
+STORAGE_MAX_CONCURRENCY = int(os.getenv("ARCHIVE_STORAGE_MAX_CONCURRENCY", "4"))
+IMAGE_MAX_WORKERS = int(os.getenv("ARCHIVE_IMAGE_MAX_WORKERS", "2"))
+
+# 재인코딩 없이 원본 그대로 업로드하는 이미지 형식 (파일 시그니처로 확인)
+PASSTHROUGH_IMAGE_FORMATS = ("png", "jpeg", "webp", "gif")
+
+# 이미지 일괄 업로드 (파일별 재시도 횟수)
+IMAGE_UPLOAD_MAX_RETRIES = 3
+
+# 큰 파일은 TUS 재개 가능 업로드 (Supabase Storage는 6MB 청크만 지원)
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+RESUMABLE_UPLOAD_THRESHOLD = int(os.getenv("ARCHIVE_RESUMABLE_THRESHOLD_MB", "6")) * 1024 * 1024
+RESUMABLE_STATE_DIR = os.getenv("ARCHIVE_RESUMABLE_STATE_DIR", "~/.cache/light-archive-mcp/uploads")
+RESUMABLE_MAX_RETRIES = 5
+
+# 반응형 파생 이미지 (너비별 WebP, 지원 시 AVIF)
+IMAGE_DERIVATIVE_WIDTHS = [
+    int(width) for width in os.getenv("ARCHIVE_IMAGE_WIDTHS", "").split(",") if width.strip()
+] or [320, 640, 1024, 1600]  # 비어 있으면 기본값
+IMAGE_QUALITY = {
+    "webp": int(os.getenv("ARCHIVE_IMAGE_WEBP_QUALITY", "80")),
+    "avif": int(os.getenv("ARCHIVE_IMAGE_AVIF_QUALITY", "55")),
+}
+# 내용 해시 파일명은 내용이 바뀌면 이름도 바뀌므로 1년 캐시
+IMMUTABLE_CACHE_SECONDS = "31536000"
+
+# 유사 이미지 색인 (dHash 64비트, 해밍 거리 기준)
+IMAGE_HASH_INDEX_PATH = os.getenv(
+    "ARCHIVE_IMAGE_HASH_INDEX", "~/.cache/light-archive-mcp/image_hashes.npz"
+)
+IMAGE_SIMILAR_DISTANCE = int(os.getenv("ARCHIVE_IMAGE_SIMILAR_DISTANCE", "6"))
+
+# archive_get_archive 캐시 (0이면 비활성화)
+CACHE_MAX_ENTRIES = int(os.getenv("ARCHIVE_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SECONDS = float(os.getenv("ARCHIVE_CACHE_TTL_SECONDS", "60"))
+
+# 본문 Markdown/텍스트 변환 결과 캐시 ((id, updated_at, 형식) 기준)
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("ARCHIVE_RENDER_CACHE_MAX_ENTRIES", "128"))
+
+# archive_find_related 역색인 동기화 주기
+RELATED_INDEX_REFRESH_SECONDS = float(os.getenv("ARCHIVE_RELATED_INDEX_REFRESH_SECONDS", "30"))
+RELATED_INDEX_REBUILD_SECONDS = float(os.getenv("ARCHIVE_RELATED_INDEX_REBUILD_SECONDS", "3600"))
+SYNC_PAGE_SIZE = 1000  # PostgREST 기본 max-rows
+
+# 로컬 SQLite 복제본 (경로 지정 시 활성화, 읽기 도구를 로컬에서 처리)
+LOCAL_REPLICA_PATH = os.getenv("ARCHIVE_LOCAL_REPLICA", "")
+REPLICA_SYNC_SECONDS = float(os.getenv("ARCHIVE_REPLICA_SYNC_SECONDS", "30"))
+REPLICA_RECONCILE_SECONDS = float(os.getenv("ARCHIVE_REPLICA_RECONCILE_SECONDS", "3600"))
+
+# archive_find_related 계산 방식 ("index": 프로세스 내 역색인, "rpc": DB 함수)
+RELATED_STRATEGY = os.getenv("ARCHIVE_RELATED_STRATEGY", "index").lower()
+
+# 도구/Supabase 요청 지표 (지연 시간 히스토그램 버킷은 초 단위)
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_SAMPLE_SIZE = 512  # 백분위 계산에 쓰는 최근 호출 수 (도구별)
+# Prometheus 텍스트 형식 파일 (node_exporter textfile collector 등이 읽음, 비우면 비활성화)
+METRICS_PROMETHEUS_FILE = os.getenv("ARCHIVE_METRICS_PROMETHEUS_FILE", "")
+METRICS_PROMETHEUS_INTERVAL = float(os.getenv("ARCHIVE_METRICS_PROMETHEUS_INTERVAL", "15"))
+
 # ============================================================================
 # ENUMS
 # ============================================================================
@@ -90,6 +293,16 @@ class ArchiveCategory(str, Enum):
     NEWS = "뉴스"
 
 
+class ArchiveDbCategory(str, Enum):
+    """archive_items.category CHECK 제약 값 (가져오기 검증용)"""
+    TECH = "기술"
+    PROJECT = "프로젝트"
+    AI = "AI"
+    TECHNOLOGY = "Technology"
+    RESEARCH = "Research"
+    NEWS = "News"
+
+
 class ArchiveStatus(str, Enum):
     """아카이브 상태"""
     DRAFT = "draft"
@@ -103,6 +316,53 @@ class ResponseFormat(str, Enum):
     JSON = "json"
 
 
+class ArchiveField(str, Enum):
+    """archive_items 컬럼 (응답 필드 선택용)"""
+    ID = "id"
+    TITLE = "title"
+    DESCRIPTION = "description"
+    EXCERPT = "excerpt"
+    CONTENT = "content"
+    CATEGORY = "category"
+    SUB_CATEGORY = "sub_category"
+    STATUS = "status"
+    DATE = "date"
+    TAGS = "tags"
+    TECHNOLOGIES = "technologies"
+    DIFFICULTY = "difficulty"
+    FIELD = "field"
+    AUTHOR = "author"
+    IMAGE = "image"
+    THUMBNAIL_URL = "thumbnail_url"
+    VIEW_COUNT = "view_count"
+    COMMENT_COUNT = "comment_count"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    PUBLISHED_AT = "published_at"
+
+
+class ContentFormat(str, Enum):
+    """본문 출력 형식"""
+    MARKDOWN = "markdown"
+    TEXT = "text"
+    HTML = "html"
+
+
+class ExportCompression(str, Enum):
+    """내보내기 압축 방식"""
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class SearchMode(str, Enum):
+    """검색 방식"""
+    AUTO = "auto"          # 한글 포함 시 trigram, 그 외 fulltext
+    FULLTEXT = "fulltext"  # tsvector 인덱스 + ts_rank 관련도 순 (search_archive_items RPC)
+    TRIGRAM = "trigram"    # pg_trgm 인덱스 부분 문자열 검색, 최신순 (search_archive_items_trgm RPC)
+    ILIKE = "ilike"        # 부분 문자열 검색, 최신순 (인덱스 미사용)
+
+
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
@@ -114,8 +374,25 @@ class SearchArchivesInput(BaseModel):
     query: str = Field(..., min_length=2, max_length=200,
                       description="검색어 (제목, 설명, 내용에서 검색)")
     category: Optional[ArchiveCategory] = Field(None, description="카테고리 필터")
+    mode: SearchMode = Field(
+        SearchMode.AUTO,
+        description=(
+            "검색 방식 (auto: 한글 검색어는 trigram, 그 외 fulltext / "
+            "fulltext: 관련도 순 전체 텍스트 검색 / trigram: 인덱스 부분 문자열 검색 / "
+            "ilike: 인덱스 없는 부분 문자열 검색)"
+        )
+    )
     limit: int = Field(DEFAULT_LIMIT, ge=1, le=100)
     offset: int = Field(0, ge=0)
+    cursor: Optional[str] = Field(
+        None,
+        description="이전 응답의 next_cursor (지정 시 offset 무시, 페이지 깊이와 관계없이 일정한 비용)"
+    )
+    fields: Optional[List[ArchiveField]] = Field(
+        None,
+        description="JSON 응답에 포함할 컬럼 (기본: 요약 필드, 본문 제외)"
+    )
+    include_content: bool = Field(False, description="본문(content) 포함 여부")
     response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
 
 
@@ -124,6 +401,34 @@ class GetArchiveInput(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
     archive_id: str = Field(..., description="아카이브 ID")
+    content_format: Optional[ContentFormat] = Field(
+        None,
+        description="본문 형식 (기본: markdown 응답은 markdown, json 응답은 원본 html)"
+    )
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class GetArchiveContentInput(BaseModel):
+    """아카이브 본문 부분 조회 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    archive_id: str = Field(..., description="아카이브 ID")
+    offset: int = Field(0, ge=0, description="시작 위치 (문자 단위, 이전 응답의 next_offset)")
+    length: int = Field(
+        CONTENT_CHUNK_SIZE,
+        ge=100,
+        le=CHARACTER_LIMIT - 5000,
+        description="최대 문자 수"
+    )
+    section: Optional[int] = Field(
+        None,
+        ge=0,
+        description="섹션 번호 (h1~h3 제목 기준, 첫 조각의 섹션 목록 참고, 지정 시 offset 무시)"
+    )
+    content_format: Optional[ContentFormat] = Field(
+        None,
+        description="본문 형식 (기본: markdown 응답은 markdown, json 응답은 원본 html)"
+    )
     response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
 
 
@@ -171,6 +476,32 @@ class UpdateArchiveInput(BaseModel):
     difficulty: Optional[str] = Field(None)
 
 
+class BulkCreateArchivesInput(BaseModel):
+    """아카이브 일괄 생성 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_MAX_ITEMS,
+        description="archive_create_archive와 같은 형식의 항목 배열 (content는 HTML)"
+    )
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class BulkUpdateArchivesInput(BaseModel):
+    """아카이브 일괄 수정 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_MAX_ITEMS,
+        description="archive_update_archive와 같은 형식의 항목 배열 (archive_id 필수)"
+    )
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
 class GenerateDraftInput(BaseModel):
     """AI 초안 생성 입력"""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -205,6 +536,126 @@ class FindRelatedInput(BaseModel):
 
     archive_id: str
     limit: int = Field(4, ge=1, le=10)
+    fields: Optional[List[ArchiveField]] = Field(
+        None,
+        description="JSON 응답에 포함할 컬럼 (기본: 요약 필드, 본문 제외)"
+    )
+    include_content: bool = Field(False, description="본문(content) 포함 여부")
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class CacheStatsInput(BaseModel):
+    """캐시 통계 조회 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class ServerStatsInput(BaseModel):
+    """서버 지표 조회 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    tool: Optional[str] = Field(None, description="이 도구의 지표만 조회 (예: archive_find_related)")
+    reset: bool = Field(False, description="조회 후 누적 지표 초기화")
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class ExportArchivesInput(BaseModel):
+    """아카이브 내보내기 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    output_path: str = Field(
+        ...,
+        min_length=1,
+        description="저장할 NDJSON 파일 경로 (예: ~/backup/archive.ndjson.gz)"
+    )
+    compression: Optional[ExportCompression] = Field(
+        None,
+        description="압축 방식 (기본: 확장자로 판단, .gz → gzip / .zst → zstd)"
+    )
+    status: Optional[ArchiveStatus] = Field(None, description="상태 필터 (기본: 전체)")
+    category: Optional[ArchiveCategory] = Field(None)
+    fields: Optional[List[ArchiveField]] = Field(
+        None,
+        description="내보낼 컬럼 (기본: 전체 컬럼)"
+    )
+    overwrite: bool = Field(False, description="기존 파일 덮어쓰기 여부")
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class ImportArchivesInput(BaseModel):
+    """아카이브 가져오기 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    source_path: str = Field(
+        ...,
+        min_length=1,
+        description="NDJSON 파일 경로 (.ndjson / .ndjson.gz / .ndjson.zst, 또는 JSON 배열 .json)"
+    )
+    batch_size: int = Field(IMPORT_BATCH_SIZE, ge=1, le=1000, description="요청 하나당 행 수")
+    concurrency: int = Field(IMPORT_CONCURRENCY, ge=1, le=32, description="동시에 보내는 요청 수")
+    checkpoint_path: Optional[str] = Field(None, description="체크포인트 파일 (기본: {source}.checkpoint.json)")
+    rejected_path: Optional[str] = Field(None, description="거부된 행 파일 (기본: {source}.rejected.ndjson)")
+    restart: bool = Field(False, description="체크포인트를 무시하고 처음부터 다시 가져오기")
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class ImportArchiveRow(BaseModel):
+    """
+    가져오기 행 검증
+
+    생성 도구 입력(CreateArchiveInput)이 아니라 archive_items 테이블 제약을 따르므로
+    archive_export_archives로 내보낸 파일을 그대로 다시 가져올 수 있습니다.
+    """
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    title: str = Field(..., min_length=1)
+    category: ArchiveDbCategory
+    content: Optional[str] = None
+    description: Optional[str] = None
+    excerpt: Optional[str] = None
+    sub_category: Optional[str] = None
+    status: Optional[ArchiveStatus] = None
+    tags: Optional[List[str]] = None
+    technologies: Optional[List[str]] = None
+    author: Optional[str] = None
+    difficulty: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+
+
+class UploadImagesInput(BaseModel):
+    """이미지 일괄 업로드 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    image_paths: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="업로드할 이미지 파일 경로 목록 (결과 URL은 같은 순서로 반환)"
+    )
+    max_concurrency: int = Field(
+        STORAGE_MAX_CONCURRENCY,
+        ge=1,
+        le=STORAGE_MAX_CONCURRENCY,
+        # 업로드는 모두 Storage 세마포어를 거치므로 그보다 크게 지정해도 더 빨라지지 않음
+        description=f"동시에 처리할 파일 수 (최대 {STORAGE_MAX_CONCURRENCY}, ARCHIVE_STORAGE_MAX_CONCURRENCY)"
+    )
+    max_retries: int = Field(IMAGE_UPLOAD_MAX_RETRIES, ge=0, le=10, description="파일별 재시도 횟수")
+    response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
+
+
+class FindSimilarImagesInput(BaseModel):
+    """유사 이미지 찾기 입력"""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    image_path: str = Field(..., min_length=1, description="비교할 이미지 파일 경로")
+    max_distance: int = Field(
+        IMAGE_SIMILAR_DISTANCE,
+        ge=0,
+        le=32,
+        description="최대 해밍 거리 (0: 거의 동일, 6 내외: 크기/압축만 다른 이미지)"
+    )
+    limit: int = Field(5, ge=1, le=50)
     response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
 
 
@@ -216,6 +667,15 @@ class ListArchivesInput(BaseModel):
     status: Optional[ArchiveStatus] = Field(None)
     limit: int = Field(DEFAULT_LIMIT, ge=1, le=100)
     offset: int = Field(0, ge=0)
+    cursor: Optional[str] = Field(
+        None,
+        description="이전 응답의 next_cursor (지정 시 offset 무시, 페이지 깊이와 관계없이 일정한 비용)"
+    )
+    fields: Optional[List[ArchiveField]] = Field(
+        None,
+        description="JSON 응답에 포함할 컬럼 (기본: 요약 필드, 본문 제외)"
+    )
+    include_content: bool = Field(False, description="본문(content) 포함 여부")
     response_format: ResponseFormat = Field(ResponseFormat.MARKDOWN)
 
 
@@ -260,250 +720,3478 @@ class GenerateDraftWithImagesInput(BaseModel):
 
 
 # ============================================================================
-# UTILITY FUNCTIONS
+# METRICS
 # ============================================================================
+# 도구 호출마다 지연 시간, 응답 문자 수, 받은 행/바이트, DB/Storage 왕복 수를 기록합니다.
+# Supabase 요청은 공유 HTTP 클라이언트의 response 훅에서 세고, 어느 도구 호출의
+# 요청인지는 contextvar로 찾습니다 (워커 스레드로 넘길 때 컨텍스트를 복사).
+
+# 요청 경로 → 종류
+HTTP_REQUEST_KINDS = {"/rest/": "db", "/storage/": "storage"}
+
+
+class LatencyHistogram:
+    """누적 버킷 히스토그램 (Prometheus 형식) + 백분위 계산용 최근 값"""
+
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS, sample_size: int = METRICS_SAMPLE_SIZE):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._recent: deque = deque(maxlen=sample_size)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, 누적 개수) 목록"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((f"{bound:g}", total))
+        result.append(("+Inf", self.count))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 2),
+            "p95_ms": round(self.percentile(0.95) * 1000, 2),
+            "p99_ms": round(self.percentile(0.99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+            "buckets": dict(self.cumulative()),
+        }
 
-def _check_supabase() -> None:
-    if supabase is None:
-        raise RuntimeError("Supabase not initialized. Please check environment variables.")
 
+class CallMetrics:
+    """도구 호출 1회 동안 쌓이는 값 (HTTP 훅이 워커 스레드에서 갱신)"""
+
+    def __init__(self):
+        self.round_trips = {"db": 0, "storage": 0, "other": 0}
+        self.bytes = 0
+        self.rows = 0
+        # 호출이 끝난 뒤 남은 백그라운드 작업(복제본 동기화 등)의 요청은 합산하지 않음
+        self.closed = False
+
+
+class ToolMetrics:
+    """도구별 누적 지표"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.response_chars = 0
+        self.rows = 0
+        self.max_rows = 0
+        self.bytes = 0
+        self.max_bytes = 0
+        self.round_trips = {"db": 0, "storage": 0, "other": 0}
+
+    def observe(self, call: CallMetrics, seconds: float, chars: int, failed: bool) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.latency.observe(seconds)
+        self.response_chars += chars
+        self.rows += call.rows
+        self.max_rows = max(self.max_rows, call.rows)
+        self.bytes += call.bytes
+        self.max_bytes = max(self.max_bytes, call.bytes)
+        for kind, count in call.round_trips.items():
+            self.round_trips[kind] += count
+
+    def stats(self) -> Dict[str, Any]:
+        calls = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency": self.latency.stats(),
+            "response_chars": self.response_chars,
+            "avg_response_chars": round(self.response_chars / calls),
+            "rows": self.rows,
+            "avg_rows": round(self.rows / calls, 1),
+            "max_rows": self.max_rows,
+            "bytes": self.bytes,
+            "avg_bytes": round(self.bytes / calls),
+            "max_bytes": self.max_bytes,
+            "round_trips": dict(self.round_trips),
+            "avg_db_round_trips": round(self.round_trips["db"] / calls, 2),
+            "avg_storage_round_trips": round(self.round_trips["storage"] / calls, 2),
+        }
 
-def _check_openai() -> None:
-    if openai_client is None:
-        raise RuntimeError("OpenAI not initialized. Please check OPENAI_API_KEY.")
+
+class RequestMetrics:
+    """Supabase 요청 종류(db/storage)별 누적 지표 (도구 호출 밖의 요청 포함)"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"count": self.count, "errors": self.errors, "bytes": self.bytes, "latency": self.latency.stats()}
+
+
+class ServerMetrics:
+    """도구 호출/Supabase 요청 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.since = time.time()
+            self.tools: Dict[str, ToolMetrics] = {}
+            self.requests: Dict[str, RequestMetrics] = {}
+
+    def record_request(
+        self, kind: str, status: int, received: int, seconds: float, call: Optional[CallMetrics]
+    ) -> None:
+        with self._lock:
+            stats = self.requests.get(kind)
+            if stats is None:
+                stats = self.requests[kind] = RequestMetrics()
+            stats.count += 1
+            stats.errors += int(status >= 400)
+            stats.bytes += received
+            stats.latency.observe(seconds)
+            if call is not None and not call.closed:
+                call.round_trips[kind] += 1
+                call.bytes += received
+
+    def record_rows(self, call: Optional[CallMetrics], data: Any) -> None:
+        if call is None or data is None:
+            return
+        rows = len(data) if isinstance(data, list) else 1
+        with self._lock:
+            if not call.closed:
+                call.rows += rows
+
+    def record_call(self, tool: str, call: CallMetrics, seconds: float, chars: int, failed: bool) -> None:
+        with self._lock:
+            call.closed = True
+            stats = self.tools.get(tool)
+            if stats is None:
+                stats = self.tools[tool] = ToolMetrics()
+            stats.observe(call, seconds, chars, failed)
+
+    def snapshot(self, tool: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            tools = {
+                name: stats.stats() for name, stats in self.tools.items()
+                if tool is None or name == tool
+            }
+            requests = {kind: stats.stats() for kind, stats in self.requests.items()}
+            since = self.since
+        return {
+            "since": datetime.fromtimestamp(since).isoformat(timespec="seconds"),
+            "uptime_seconds": round(time.time() - since, 1),
+            "tools": tools,
+            "supabase_requests": requests,
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, labels: str, histo: LatencyHistogram) -> None:
+            for le, count in histo.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {histo.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histo.count}")
+
+        with self._lock:
+            tools = sorted(self.tools.items())
+            requests = sorted(self.requests.items())
+
+            metric("archive_tool_calls_total", "counter", "MCP tool calls")
+            for name, stats in tools:
+                lines.append(f'archive_tool_calls_total{{tool="{name}"}} {stats.calls}')
+            metric("archive_tool_errors_total", "counter", "MCP tool calls that returned an error")
+            for name, stats in tools:
+                lines.append(f'archive_tool_errors_total{{tool="{name}"}} {stats.errors}')
+            metric("archive_tool_duration_seconds", "histogram", "MCP tool call latency")
+            for name, stats in tools:
+                histogram("archive_tool_duration_seconds", f'tool="{name}"', stats.latency)
+            metric("archive_tool_response_chars_total", "counter", "Characters returned by MCP tools")
+            for name, stats in tools:
+                lines.append(f'archive_tool_response_chars_total{{tool="{name}"}} {stats.response_chars}')
+            metric("archive_tool_rows_total", "counter", "Rows fetched from PostgREST by MCP tools")
+            for name, stats in tools:
+                lines.append(f'archive_tool_rows_total{{tool="{name}"}} {stats.rows}')
+            metric("archive_tool_received_bytes_total", "counter", "Bytes received from Supabase by MCP tools")
+            for name, stats in tools:
+                lines.append(f'archive_tool_received_bytes_total{{tool="{name}"}} {stats.bytes}')
+            metric("archive_tool_round_trips_total", "counter", "Supabase requests made by MCP tools")
+            for name, stats in tools:
+                for kind, count in stats.round_trips.items():
+                    lines.append(f'archive_tool_round_trips_total{{tool="{name}",kind="{kind}"}} {count}')
+
+            metric("archive_supabase_requests_total", "counter", "Supabase HTTP requests")
+            for kind, stats in requests:
+                lines.append(f'archive_supabase_requests_total{{kind="{kind}"}} {stats.count}')
+            metric("archive_supabase_errors_total", "counter", "Supabase HTTP responses with status >= 400")
+            for kind, stats in requests:
+                lines.append(f'archive_supabase_errors_total{{kind="{kind}"}} {stats.errors}')
+            metric("archive_supabase_received_bytes_total", "counter", "Bytes received from Supabase")
+            for kind, stats in requests:
+                lines.append(f'archive_supabase_received_bytes_total{{kind="{kind}"}} {stats.bytes}')
+            metric("archive_supabase_request_duration_seconds", "histogram", "Supabase HTTP request latency")
+            for kind, stats in requests:
+                histogram("archive_supabase_request_duration_seconds", f'kind="{kind}"', stats.latency)
+        return "\n".join(lines) + "\n"
+
+
+_server_metrics = ServerMetrics()
+_current_call: contextvars.ContextVar[Optional[CallMetrics]] = contextvars.ContextVar("archive_call", default=None)
+_prometheus_written_at = 0.0
+
+
+def _request_kind(request: httpx.Request) -> str:
+    for prefix, kind in HTTP_REQUEST_KINDS.items():
+        if request.url.path.startswith(prefix):
+            return kind
+    return "other"
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    """받은 바이트를 세고, 응답이 닫힐 때 요청 지표를 기록하는 응답 스트림"""
+
+    def __init__(self, response: httpx.Response, call: Optional[CallMetrics]):
+        self._response = response
+        self._stream = response.stream
+        self._call = call
+        self._received = 0
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._received += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        self._stream.close()  # response.elapsed가 여기서 정해짐
+        _server_metrics.record_request(
+            _request_kind(self._response.request), self._response.status_code, self._received,
+            self._response.elapsed.total_seconds(), self._call
+        )
+
+
+def _meter_response(response: httpx.Response) -> None:
+    """Supabase 요청 지표 수집 (httpx response 훅, 본문을 읽기 전에 호출됨)"""
+    response.stream = _MeteredStream(response, _current_call.get())
+
+
+def _write_prometheus_file(force: bool = False) -> None:
+    """ARCHIVE_METRICS_PROMETHEUS_FILE에 지표 저장 (최대 METRICS_PROMETHEUS_INTERVAL초마다, 원자적 교체)"""
+    global _prometheus_written_at
+    if not METRICS_PROMETHEUS_FILE:
+        return
+    now = time.monotonic()
+    if not force and now - _prometheus_written_at < METRICS_PROMETHEUS_INTERVAL:
+        return
+    _prometheus_written_at = now
+    path = Path(METRICS_PROMETHEUS_FILE).expanduser()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_text(_server_metrics.prometheus(), encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Warning: failed to write metrics file {path}: {e}", file=sys.stderr)
 
 
-def _generate_archive_id() -> str:
+def _metered(func):
     """
-    아카이브 ID 생성 (Next.js 앱과 동일한 패턴)
-    패턴: {timestamp}-{random_string}
-    예: 1761901131544-a2mnqr
+    도구 호출 지표 기록 (@mcp.tool 바로 아래에 적용)
+
+    다른 도구 안에서 호출되면 바깥 호출에 합산합니다.
     """
-    timestamp = str(int(time.time() * 1000))  # 밀리초 단위 타임스탬프
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        current = _current_call.get()
+        if current is not None and not current.closed:
+            return await func(*args, **kwargs)
+        call = CallMetrics()
+        token = _current_call.set(call)
+        started = time.perf_counter()
+        output = None
+        try:
+            output = await func(*args, **kwargs)
+            return output
+        finally:
+            _current_call.reset(token)
+            _server_metrics.record_call(
+                func.__name__, call, time.perf_counter() - started,
+                len(output) if isinstance(output, str) else 0,
+                not isinstance(output, str) or output.startswith("Error")
+            )
+            _write_prometheus_file()
+    return wrapper
 
-    # 랜덤 문자열 생성 (6자리, 소문자+숫자)
-    # JavaScript의 Math.random().toString(36).substring(7)과 동일한 결과
-    random_chars = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
 
-    return f"{timestamp}-{random_chars}"
+# ============================================================================
+# DATA ACCESS (비동기 I/O 계층)
+# ============================================================================
+# supabase 클라이언트는 동기 방식이므로, 모든 네트워크 호출을 워커 스레드로
+# 넘겨서 이벤트 루프가 막히지 않도록 합니다. 도구들은 반드시 이 계층을 거칩니다.
 
+_io_executor = ThreadPoolExecutor(
+    max_workers=DB_MAX_CONCURRENCY + STORAGE_MAX_CONCURRENCY,
+    thread_name_prefix="archive-io"
+)
+# 이미지 변환(PIL)은 CPU 작업이므로 네트워크 호출과 별도의 작은 풀에서 실행
+_image_executor = ThreadPoolExecutor(max_workers=IMAGE_MAX_WORKERS, thread_name_prefix="archive-image")
+_db_semaphore = asyncio.Semaphore(DB_MAX_CONCURRENCY)
+_storage_semaphore = asyncio.Semaphore(STORAGE_MAX_CONCURRENCY)
 
-async def _upload_image_to_storage(
-    image_path: str,
-    filename: Optional[str] = None
-) -> str:
+
+async def _run_blocking(semaphore: asyncio.Semaphore, func, *args, **kwargs) -> Any:
+    """블로킹 함수를 세마포어 한도 내에서 워커 스레드로 실행"""
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        # 현재 도구 호출 지표가 워커 스레드의 HTTP 훅에서도 보이도록 컨텍스트 복사
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(_io_executor, context.run, functools.partial(func, *args, **kwargs))
+
+
+async def _run_image_task(func, *args, **kwargs) -> Any:
+    """이미지 변환 함수를 이미지 워커 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_image_executor, functools.partial(func, *args, **kwargs))
+
+
+def _archive_table():
+    """archive_items 테이블 쿼리 빌더"""
+    _check_supabase()
+    return supabase.table("archive_items")
+
+
+def _archive_rpc(function_name: str, params: Dict[str, Any]):
+    """Postgres 함수(RPC) 쿼리 빌더"""
+    _check_supabase()
+    return supabase.rpc(function_name, params)
+
+
+async def _execute(query) -> Any:
     """
-    파일 경로에서 이미지를 직접 읽어서 Supabase Storage에 업로드
-    Base64 인코딩 없이 바이너리로 직접 처리
+    PostgREST 쿼리를 워커 스레드에서 실행
 
-    Args:
-        image_path: 이미지 파일 경로 (e.g., /mnt/user-data/uploads/image.png)
-        filename: 파일명 (없으면 자동 생성)
+    동시 실행 수는 ARCHIVE_DB_MAX_CONCURRENCY로 제한됩니다.
+    """
+    result = await _run_blocking(_db_semaphore, query.execute)
+    _server_metrics.record_rows(_current_call.get(), getattr(result, "data", None))
+    return result
 
-    Returns:
-        Public URL
+
+async def _storage_call(func, *args, **kwargs) -> Any:
     """
-    _check_supabase()
+    Storage API 호출을 워커 스레드에서 실행
 
-    try:
-        # 파일 존재 확인
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+    동시 실행 수는 ARCHIVE_STORAGE_MAX_CONCURRENCY로 제한됩니다.
+    """
+    return await _run_blocking(_storage_semaphore, func, *args, **kwargs)
 
-        # PIL로 이미지 열기 (검증 + 포맷 확인)
-        with PILImage.open(image_path) as img:
-            # 이미지 포맷 확인
-            img_format = img.format.lower() if img.format else 'png'
 
-            # 바이너리로 변환
-            buffer = io.BytesIO()
-            img.save(buffer, format=img_format.upper())
-            image_data = buffer.getvalue()
-
-        # 파일명 생성 (Next.js 앱과 동일한 패턴)
-        if not filename:
-            filename = _generate_archive_id()
-
-        filename_with_ext = f"{filename}.{img_format}"
-        file_path = f"archive-images/{filename_with_ext}"
-
-        # Supabase Storage에 업로드
-        response = supabase.storage.from_("thumbnails").upload(
-            file_path,
-            image_data,
-            {
-                "content-type": f"image/{img_format}",
-                "cacheControl": "3600",
-                "upsert": "false"
-            }
-        )
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class ArchiveCache:
+    """
+    아카이브 상세 조회용 LRU + TTL 캐시 (프로세스 내, 아카이브 ID 기준)
 
-        # 업로드 실패 체크
-        if hasattr(response, 'error') and response.error:
-            raise RuntimeError(f"Image upload failed: {response.error}")
+    - 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - TTL이 지난 항목은 updated_at만 조회해서 변경이 없으면 재사용
+    - 이벤트 루프 스레드에서만 접근하므로 별도 잠금 없음
+    """
 
-        # Public URL 가져오기
-        public_url = supabase.storage.from_("thumbnails").get_public_url(file_path)
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def lookup(self, archive_id: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        캐시 조회
+
+        Returns:
+            (캐시된 행 또는 None, TTL 이내 여부)
+        """
+        entry = self._entries.get(archive_id)
+        if entry is None:
+            return None, False
+        stored_at, row = entry
+        self._entries.move_to_end(archive_id)
+        return row, (time.monotonic() - stored_at) < self.ttl_seconds
+
+    def put(self, archive_id: str, row: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        self._entries[archive_id] = (time.monotonic(), row)
+        self._entries.move_to_end(archive_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, archive_id: str) -> None:
+        if self._entries.pop(archive_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.revalidations + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.revalidations) / lookups, 4) if lookups else 0.0
+        }
 
-        return public_url
 
-    except FileNotFoundError as e:
-        raise RuntimeError(str(e))
-    except Exception as e:
-        raise RuntimeError(f"Image upload failed: {str(e)}")
+_archive_cache = ArchiveCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
 
 
-def _handle_error(e: Exception) -> str:
-    if isinstance(e, RuntimeError):
-        return f"Error: {str(e)}"
-    return f"Error: {type(e).__name__} - {str(e)}"
+async def _fetch_archive(archive_id: str) -> Optional[Dict[str, Any]]:
+    """
+    아카이브 한 건을 캐시를 거쳐 조회 (read-through)
 
+    TTL이 지난 항목은 updated_at 컬럼만 조회해서 변경 여부를 확인하고,
+    변경되지 않았으면 본문을 다시 받지 않고 캐시를 갱신합니다.
+    """
+    cached, fresh = _archive_cache.lookup(archive_id)
+    if cached is not None and fresh:
+        _archive_cache.hits += 1
+        return cached
 
-async def _call_openai_with_retry(prompt: str, max_tokens: int = 1000) -> str:
-    _check_openai()
+    if cached is not None:
+        response = await _execute(_archive_table().select("updated_at").eq("id", archive_id))
+        if response.data and response.data[0].get("updated_at") == cached.get("updated_at"):
+            _archive_cache.revalidations += 1
+            _archive_cache.put(archive_id, cached)
+            return cached
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = await openai_client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant for a technical archive platform."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                await asyncio.sleep(3 * (attempt + 1))
-                continue
-            else:
-                raise e
+    _archive_cache.misses += 1
+    response = await _execute(_archive_table().select("*").eq("id", archive_id))
+    if not response.data:
+        _archive_cache.invalidate(archive_id)
+        return None
+
+    archive = response.data[0]
+    _archive_cache.put(archive_id, archive)
+    return archive
 
 
 # ============================================================================
-# TOOLS
+# CONTENT RENDERING
 # ============================================================================
 
-@mcp.tool(
-    name="archive_search_archives",
-    annotations={
-        "title": "Search Archives",
-        "readOnlyHint": True,
-        "destructiveHint": False,
-        "idempotentHint": True,
-        "openWorldHint": True
-    }
-)
-async def archive_search_archives(params: SearchArchivesInput) -> str:
+class _MarkdownRenderer(HTMLParser):
     """
-    Light Archive 데이터베이스에서 아카이브를 검색합니다.
+    HTML 본문을 Markdown 또는 일반 텍스트로 변환
 
-    테이블: archive_items
-    검색 대상: title, description, content
+    아카이브 본문에 쓰이는 태그(h1~h6, p, ul/ol, pre/code, a, img, table,
+    blockquote, strong/em)만 다루고, 나머지 태그는 내용만 남깁니다.
+    """
+
+    _BLOCK_TAGS = {"p", "div", "section", "article", "header", "footer", "figure", "figcaption", "table"}
+    _SKIP_TAGS = {"script", "style", "head", "template"}
+
+    def __init__(self, plain: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.plain = plain
+        self._parts: List[str] = []
+        self._pending = 0  # 다음 텍스트 앞에 넣을 줄바꿈 수
+        self._line_start = True
+        self._item_start = False
+        self._lists: List[List[Any]] = []  # [ordered, 다음 번호]
+        self._quote = 0
+        self._pre = 0
+        self._fence: Optional[str] = None  # 아직 쓰지 않은 코드 블록 펜스의 언어
+        self._skip = 0
+        self._links: List[Optional[str]] = []
+        self._cells = 0
+        self._rows = 0
+
+    def _break(self, count: int) -> None:
+        if self._parts and not self._item_start:
+            self._pending = max(self._pending, count)
+
+    def _write(self, text: str, indent: Optional[int] = None) -> None:
+        if self._pending:
+            self._parts.append("\n" * self._pending)
+            self._pending = 0
+            self._line_start = True
+        if self._line_start:
+            depth = len(self._lists) if indent is None else indent
+            self._parts.append("> " * self._quote + "  " * depth)
+            self._line_start = False
+        self._parts.append(text)
+        self._item_start = False
+
+    @staticmethod
+    def _language(attributes: Dict[str, Optional[str]]) -> str:
+        for name in (attributes.get("class") or "").split():
+            if name.startswith("language-"):
+                return name[len("language-"):]
+        return ""
+
+    def _open_fence(self) -> None:
+        if self._fence is not None and not self.plain:
+            self._write(f"```{self._fence}\n")
+            self._line_start = True
+        self._fence = None
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip += 1
+            return
+        if self._skip:
+            return
+        attributes = dict(attrs)
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._break(2)
+            if not self.plain:
+                self._write("#" * int(tag[1]) + " ")
+        elif tag in self._BLOCK_TAGS:
+            self._break(2)
+        elif tag == "br":
+            self._break(1)
+        elif tag == "hr":
+            self._break(2)
+            self._write("---")
+            self._break(2)
+        elif tag in ("ul", "ol"):
+            self._break(1 if self._lists else 2)
+            self._lists.append([tag == "ol", 1])
+        elif tag == "li":
+            self._break(1)
+            marker = "- "
+            if self._lists and self._lists[-1][0]:
+                marker = f"{self._lists[-1][1]}. "
+                self._lists[-1][1] += 1
+            self._write(marker, indent=max(len(self._lists) - 1, 0))
+            self._item_start = True
+        elif tag == "blockquote":
+            self._break(2)
+            self._quote += 1
+        elif tag == "pre":
+            self._break(2)
+            self._pre += 1
+            # 언어는 <pre> 또는 안쪽 <code>의 class에 있으므로 첫 내용 직전에 펜스 작성
+            self._fence = "" if self.plain else self._language(attributes)
+        elif tag == "code":
+            if self._pre:
+                if self._fence == "":
+                    self._fence = self._language(attributes)
+            elif not self.plain:
+                self._write("`")
+        elif tag in ("strong", "b"):
+            if not self.plain:
+                self._write("**")
+        elif tag in ("em", "i"):
+            if not self.plain:
+                self._write("*")
+        elif tag == "a":
+            href = attributes.get("href")
+            self._links.append(href)
+            if href and not self.plain:
+                self._write("[")
+        elif tag == "img":
+            alt = attributes.get("alt") or ""
+            if self.plain:
+                if alt:
+                    self._write(alt)
+            elif attributes.get("src"):
+                self._write(f"![{alt}]({attributes['src']})")
+        elif tag == "tr":
+            self._break(1)
+            self._cells = 0
+        elif tag in ("td", "th"):
+            self._write("| " if self._cells == 0 else " | ")
+            self._cells += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+            return
+        if self._skip:
+            return
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6") or tag in self._BLOCK_TAGS:
+            self._break(2)
+            if tag == "table":
+                self._rows = 0
+        elif tag in ("ul", "ol"):
+            if self._lists:
+                self._lists.pop()
+            self._break(1 if self._lists else 2)
+        elif tag == "blockquote":
+            self._quote = max(self._quote - 1, 0)
+            self._break(2)
+        elif tag == "pre":
+            self._pre = max(self._pre - 1, 0)
+            self._open_fence()
+            if not self.plain:
+                if self._parts and not self._parts[-1].endswith("\n"):
+                    self._parts.append("\n")
+                self._line_start = True
+                self._write("```")
+            self._break(2)
+        elif tag == "code":
+            if not self._pre and not self.plain:
+                self._write("`")
+        elif tag in ("strong", "b"):
+            if not self.plain:
+                self._write("**")
+        elif tag in ("em", "i"):
+            if not self.plain:
+                self._write("*")
+        elif tag == "a":
+            href = self._links.pop() if self._links else None
+            if href and not self.plain:
+                self._write(f"]({href})")
+        elif tag == "tr":
+            if self._cells:
+                self._write(" |")
+                self._rows += 1
+                if self._rows == 1 and not self.plain:
+                    self._break(1)
+                    self._write("|" + " --- |" * self._cells)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        if self._pre:
+            self._open_fence()
+            if self._pending:
+                self._write("")
+            self._parts.append(data)
+            self._line_start = data.endswith("\n")
+            return
+        text = re.sub(r"\s+", " ", data)
+        if self._line_start or self._pending or self._item_start:
+            text = text.lstrip()
+        if text:
+            self._write(text)
+
+    def render(self, content: str) -> str:
+        self.feed(content)
+        self.close()
+        return re.sub(r"\n{3,}", "\n\n", "".join(self._parts)).strip()
+
+
+class RenderedContentCache:
+    """
+    본문 변환 결과 캐시 ((아카이브 ID, updated_at, 형식) 기준 LRU)
+
+    updated_at이 키에 포함되므로 수정된 아카이브는 자동으로 다시 변환됩니다.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self.hits = 0
+        self.conversions = 0
+        self.html_chars = 0
+        self.rendered_chars = 0
+
+    def render(self, archive: Dict[str, Any], content_format: ContentFormat) -> str:
+        content = archive.get("content") or ""
+        if content_format == ContentFormat.HTML or not content:
+            return content
+
+        key = (archive.get("id") or "", str(archive.get("updated_at") or ""), content_format.value)
+        cached = self._entries.get(key) if key[0] and key[1] else None
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+
+        rendered = _MarkdownRenderer(plain=content_format == ContentFormat.TEXT).render(content)
+        self.conversions += 1
+        self.html_chars += len(content)
+        self.rendered_chars += len(rendered)
+        if key[0] and key[1] and self.max_entries > 0:
+            self._entries[key] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "conversions": self.conversions,
+            "html_chars": self.html_chars,
+            "rendered_chars": self.rendered_chars,
+            "reduction_ratio": round(1 - self.rendered_chars / self.html_chars, 4) if self.html_chars else 0.0
+        }
+
+
+_rendered_content = RenderedContentCache(RENDER_CACHE_MAX_ENTRIES)
+
+
+def _content_format_for(content_format: Optional[ContentFormat], response_format: ResponseFormat) -> ContentFormat:
+    """본문 형식 기본값 (markdown 응답은 markdown, json 응답은 원본 html)"""
+    if content_format is not None:
+        return content_format
+    return ContentFormat.MARKDOWN if response_format == ResponseFormat.MARKDOWN else ContentFormat.HTML
+
+
+# ============================================================================
+# RELATED INDEX
+# ============================================================================
+
+class RelatedIndex:
     """
+    archive_find_related용 역색인 (태그/기술/카테고리 → 아카이브 ID)
+
+    - 최초 호출 시 게시된 아카이브의 요약 컬럼만 받아서 한 번 구축
+    - 이후에는 updated_at 이후 변경분만 받아서 증분 반영
+    - 삭제는 updated_at으로 감지할 수 없으므로 주기적으로 전체 재구축
+    - 점수 계산은 기준 아카이브와 태그/기술이 겹치는 후보만 대상으로 함
+    """
+
+    def __init__(self, refresh_seconds: float, rebuild_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_tech: Dict[str, Set[str]] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._synced_until: Optional[str] = None
+        self._last_refresh = 0.0
+        self._last_rebuild = 0.0
+        self._built = False
+        self._lock = asyncio.Lock()
+
+    def _unlink(self, archive_id: str) -> None:
+        doc = self._docs.pop(archive_id, None)
+        if doc is None:
+            return
+        for posting, keys in (
+            (self._by_tag, doc.get("tags") or []),
+            (self._by_tech, doc.get("technologies") or []),
+            (self._by_category, [doc.get("category")])
+        ):
+            for key in keys:
+                ids = posting.get(key)
+                if ids is not None:
+                    ids.discard(archive_id)
+                    if not ids:
+                        del posting[key]
+
+    def apply(self, row: Dict[str, Any]) -> None:
+        """행 하나를 색인에 반영 (게시 상태가 아니면 제거)"""
+        archive_id = row["id"]
+        self._unlink(archive_id)
+        if row.get("status") != "published":
+            return
+        doc = {column: row.get(column) for column in ARCHIVE_SUMMARY_FIELDS}
+        self._docs[archive_id] = doc
+        for posting, keys in (
+            (self._by_tag, doc.get("tags") or []),
+            (self._by_tech, doc.get("technologies") or []),
+            (self._by_category, [doc.get("category")])
+        ):
+            for key in keys:
+                posting.setdefault(key, set()).add(archive_id)
+
+    def get(self, archive_id: str) -> Optional[Dict[str, Any]]:
+        return self._docs.get(archive_id)
+
+    async def _load(self, since: Optional[str]) -> None:
+        """요약 컬럼을 페이지 단위로 받아서 반영"""
+        columns = ",".join(ARCHIVE_SUMMARY_FIELDS)
+        last_id: Optional[str] = None
+        while True:
+            query = _archive_table().select(columns)
+            if since is None:
+                query = query.eq("status", "published")
+            else:
+                # 비공개로 바뀐 항목도 제거해야 하므로 상태 필터 없이 조회
+                query = query.gte("updated_at", since)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            query = query.order("id").limit(SYNC_PAGE_SIZE)
+            response = await _execute(query)
+            for row in response.data:
+                self.apply(row)
+                updated_at = row.get("updated_at")
+                if updated_at and (self._synced_until is None or updated_at > self._synced_until):
+                    self._synced_until = updated_at
+            if len(response.data) < SYNC_PAGE_SIZE:
+                break
+            last_id = response.data[-1]["id"]
+
+    async def ensure_fresh(self) -> None:
+        """필요하면 전체 재구축 또는 증분 동기화"""
+        async with self._lock:
+            now = time.monotonic()
+            if not self._built or now - self._last_rebuild >= self.rebuild_seconds:
+                self._docs.clear()
+                self._by_tag.clear()
+                self._by_tech.clear()
+                self._by_category.clear()
+                self._synced_until = None
+                await self._load(since=None)
+                self._built = True
+                self._last_rebuild = self._last_refresh = now
+            elif now - self._last_refresh >= self.refresh_seconds:
+                await self._load(since=self._synced_until)
+                self._last_refresh = now
+
+    def top_related(self, base: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        기준 아카이브와 유사한 상위 limit개 (점수 내림차순)
+
+        태그/기술이 겹치는 후보만 점수를 계산하고 heap으로 상위 k개를 고릅니다.
+        카테고리만 같은 항목(30점)은 상위 k개에 들 수 있을 때만 id 내림차순으로 최대 k개 보충합니다.
+        """
+        base_id = base["id"]
+        scores: Dict[str, int] = {}
+        for tag in set(base.get("tags") or []):
+            for archive_id in self._by_tag.get(tag, ()):
+                scores[archive_id] = scores.get(archive_id, 0) + RELATED_TAG_WEIGHT
+        for tech in set(base.get("technologies") or []):
+            for archive_id in self._by_tech.get(tech, ()):
+                scores[archive_id] = scores.get(archive_id, 0) + RELATED_TECH_WEIGHT
+
+        same_category = self._by_category.get(base.get("category"), set())
+        for archive_id in scores:
+            if archive_id in same_category:
+                scores[archive_id] += RELATED_CATEGORY_WEIGHT
+        scores.pop(base_id, None)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        if len(top) < limit or top[-1][1] <= RELATED_CATEGORY_WEIGHT:
+            # 집합 순회 순서는 실행마다 다르므로 복제본 경로와 같이 id 내림차순으로 고름
+            category_only = heapq.nlargest(
+                limit,
+                (archive_id for archive_id in same_category
+                 if archive_id not in scores and archive_id != base_id)
+            )
+            top = heapq.nlargest(
+                limit,
+                top + [(archive_id, RELATED_CATEGORY_WEIGHT) for archive_id in category_only],
+                key=lambda item: (item[1], item[0])
+            )
+
+        return [{"archive": self._docs[archive_id], "score": score} for archive_id, score in top]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self._built,
+            "documents": len(self._docs),
+            "tags": len(self._by_tag),
+            "technologies": len(self._by_tech),
+            "synced_until": self._synced_until
+        }
+
+
+_related_index = RelatedIndex(RELATED_INDEX_REFRESH_SECONDS, RELATED_INDEX_REBUILD_SECONDS)
+
+
+async def _find_related_indexed(
+    archive_id: str,
+    limit: int,
+    columns: str
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    역색인으로 유사 아카이브 계산
+
+    Returns:
+        (기준 아카이브 또는 None, [{"archive": ..., "score": ...}])
+    """
+    await _related_index.ensure_fresh()
+
+    # 기준 아카이브 조회 (draft 등 색인에 없는 항목은 DB에서 조회)
+    base_archive = _related_index.get(archive_id)
+    if base_archive is None:
+        base_response = await _execute(_archive_table().select(columns).eq("id", archive_id))
+        if not base_response.data:
+            return None, []
+        base_archive = base_response.data[0]
+
+    # 태그/기술이 겹치는 후보만 점수 계산
+    related = _related_index.top_related(base_archive, limit)
+
+    # 요약 컬럼 외의 필드를 요청한 경우 결과 항목만 추가 조회
+    if not set(columns.split(",")) <= set(ARCHIVE_SUMMARY_FIELDS):
+        ids = [archive_id] + [item["archive"]["id"] for item in related]
+        rows_response = await _execute(_archive_table().select(columns).in_("id", ids))
+        rows = {row["id"]: row for row in rows_response.data}
+        base_archive = rows.get(archive_id, base_archive)
+        related = [
+            {"archive": rows.get(item["archive"]["id"], item["archive"]), "score": item["score"]}
+            for item in related
+        ]
+
+    return base_archive, related
+
+
+async def _find_related_rpc(
+    archive_id: str,
+    limit: int,
+    columns: str
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    find_related_archive_items RPC로 유사 아카이브 계산
+
+    점수 계산은 DB에서 하고, 상위 ID와 기준 아카이브의 컬럼만 한 번에 조회합니다.
+    아카이브 수와 관계없이 작은 요청 두 번으로 끝납니다.
+    """
+    scored = await _execute(_archive_rpc("find_related_archive_items", {
+        "base_id": archive_id,
+        "result_limit": limit
+    }))
+    ids = [archive_id] + [row["id"] for row in scored.data]
+    rows_response = await _execute(_archive_table().select(columns).in_("id", ids))
+    rows = {row["id"]: row for row in rows_response.data}
+
+    base_archive = rows.get(archive_id)
+    if base_archive is None:
+        return None, []
+    related = [
+        {"archive": rows[row["id"]], "score": row["score"]}
+        for row in scored.data if row["id"] in rows
+    ]
+    return base_archive, related
+
+
+# ============================================================================
+# LOCAL REPLICA (SQLite + FTS5)
+# ============================================================================
+# ARCHIVE_LOCAL_REPLICA에 파일 경로를 지정하면 archive_items를 로컬 SQLite로
+# 미러링하고 검색/조회/목록/유사 항목 도구를 로컬에서 처리합니다.
+# 쓰기는 항상 Supabase로 보내고, 응답으로 받은 행을 즉시 로컬에 반영합니다.
+
+_REPLICA_COLUMNS = [field.value for field in ArchiveField]
+_REPLICA_ARRAY_COLUMNS = ("tags", "technologies")
+_HTML_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+_REPLICA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_items (
+  id TEXT PRIMARY KEY,
+  title TEXT,
+  description TEXT,
+  excerpt TEXT,
+  content TEXT,
+  category TEXT,
+  sub_category TEXT,
+  status TEXT,
+  date TEXT,
+  tags TEXT,
+  technologies TEXT,
+  difficulty TEXT,
+  field TEXT,
+  author TEXT,
+  image TEXT,
+  thumbnail_url TEXT,
+  view_count INTEGER,
+  comment_count INTEGER,
+  created_at TEXT,
+  updated_at TEXT,
+  published_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_archive_items_created_at_id ON archive_items(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_archive_items_category ON archive_items(category);
+
+-- 유사 항목 계산용 태그/기술 색인
+CREATE TABLE IF NOT EXISTS archive_terms (
+  archive_id TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  value TEXT NOT NULL,
+  PRIMARY KEY (archive_id, kind, value)
+);
+CREATE INDEX IF NOT EXISTS idx_archive_terms_value ON archive_terms(kind, value);
+
+-- 검색용 FTS5 (trigram: 한국어 부분 문자열 검색 지원), rowid = archive_items.rowid
+CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts USING fts5(title, description, body, tokenize='trigram');
+
+CREATE TABLE IF NOT EXISTS replica_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT
+);
+"""
+
+
+def _strip_html(content: Optional[str]) -> str:
+    """HTML 태그 제거 (검색 색인용)"""
+    return html.unescape(_HTML_TAG_PATTERN.sub(" ", content or ""))
+
+
+def _like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class LocalReplica:
+    """
+    archive_items 로컬 읽기 전용 복제본
+
+    - 최초 사용 시 전체 동기화, 이후 updated_at 기준 증분 동기화 (백그라운드)
+    - 삭제는 주기적으로 ID 목록을 비교해서 반영
+    - SQLite 접근은 전용 단일 스레드에서만 수행 (이벤트 루프 비차단, 직렬화)
+    """
+
+    def __init__(self, path: str, sync_seconds: float, reconcile_seconds: float):
+        self.path = os.path.expanduser(path)
+        self.sync_seconds = sync_seconds
+        self.reconcile_seconds = reconcile_seconds
+        self.last_error: Optional[str] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive-replica")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._ready = False
+        self._sync_lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+        self._next_attempt = 0.0
+        self._last_reconcile = 0.0
+
+    async def _run(self, func, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    # ------------------------------------------------------------------
+    # SQLite (복제본 스레드 전용)
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_REPLICA_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM replica_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO replica_meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def _upsert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        conn = self._connect()
+        columns = ", ".join(_REPLICA_COLUMNS)
+        placeholders = ", ".join("?" for _ in _REPLICA_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _REPLICA_COLUMNS if c != "id")
+        with conn:
+            for row in rows:
+                values = [
+                    json.dumps(row.get(c) or [], ensure_ascii=False) if c in _REPLICA_ARRAY_COLUMNS else row.get(c)
+                    for c in _REPLICA_COLUMNS
+                ]
+                conn.execute(
+                    f"INSERT INTO archive_items ({columns}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                    values
+                )
+                rowid = conn.execute("SELECT rowid FROM archive_items WHERE id = ?", (row["id"],)).fetchone()[0]
+                conn.execute("DELETE FROM archive_fts WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT INTO archive_fts (rowid, title, description, body) VALUES (?, ?, ?, ?)",
+                    (rowid, row.get("title") or "", row.get("description") or "", _strip_html(row.get("content")))
+                )
+                conn.execute("DELETE FROM archive_terms WHERE archive_id = ?", (row["id"],))
+                conn.executemany(
+                    "INSERT INTO archive_terms (archive_id, kind, value) VALUES (?, ?, ?)",
+                    [(row["id"], "tag", tag) for tag in set(row.get("tags") or [])]
+                    + [(row["id"], "tech", tech) for tech in set(row.get("technologies") or [])]
+                )
+
+    def _retain_ids(self, ids: Set[str]) -> int:
+        """원격에 없는 항목 삭제 (삭제 반영)"""
+        conn = self._connect()
+        local = [(row["id"], row["rowid"]) for row in conn.execute("SELECT id, rowid FROM archive_items")]
+        stale = [(archive_id, rowid) for archive_id, rowid in local if archive_id not in ids]
+        with conn:
+            for archive_id, rowid in stale:
+                conn.execute("DELETE FROM archive_fts WHERE rowid = ?", (rowid,))
+                conn.execute("DELETE FROM archive_terms WHERE archive_id = ?", (archive_id,))
+                conn.execute("DELETE FROM archive_items WHERE id = ?", (archive_id,))
+        return len(stale)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, columns: List[str]) -> Dict[str, Any]:
+        result = {}
+        for column in columns:
+            value = row[column]
+            if column in _REPLICA_ARRAY_COLUMNS:
+                value = json.loads(value) if value else []
+            result[column] = value
+        return result
+
+    def _get(self, archive_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT * FROM archive_items WHERE id = ?", (archive_id,)).fetchone()
+        return self._to_dict(row, _REPLICA_COLUMNS) if row else None
+
+    @staticmethod
+    def _page_clause(
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+        keyset: bool,
+        alias: str
+    ) -> Tuple[str, List[Any], str]:
+        """(추가 WHERE 조건, 파라미터, LIMIT 절) - 원격과 같은 커서 형식 사용"""
+        position = _decode_cursor(cursor) if cursor else None
+        if not keyset:
+            start = position.get("o", 0) if position else offset
+            return "", [], f"LIMIT {limit + 1} OFFSET {start}"
+        if position:
+            if "c" not in position or "i" not in position:
+                raise RuntimeError(f"Invalid cursor: {cursor}")
+            return (
+                f" AND ({alias}.created_at, {alias}.id) < (?, ?)",
+                [position["c"], position["i"]],
+                f"LIMIT {limit + 1}"
+            )
+        return "", [], f"LIMIT {limit + 1} OFFSET {offset}"
+
+    def _list(
+        self,
+        columns: List[str],
+        category: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int,
+        cursor: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        where = "1 = 1"
+        args: List[Any] = []
+        if category:
+            where += " AND a.category = ?"
+            args.append(category)
+        if status:
+            where += " AND a.status = ?"
+            args.append(status)
+        page_where, page_args, limit_clause = self._page_clause(limit, offset, cursor, True, "a")
+        sql = (
+            f"SELECT a.* FROM archive_items a WHERE {where}{page_where} "
+            f"ORDER BY a.created_at DESC, a.id DESC {limit_clause}"
+        )
+        rows = self._connect().execute(sql, args + page_args).fetchall()
+        return [self._to_dict(row, columns) for row in rows]
+
+    def _search(
+        self,
+        columns: List[str],
+        text: str,
+        mode: SearchMode,
+        category: Optional[str],
+        limit: int,
+        offset: int,
+        cursor: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        FTS5 검색
+
+        - fulltext: 공백으로 나눈 단어를 모두 포함, bm25 관련도 순
+        - trigram/ilike: 검색어 전체를 부분 문자열로 검색, 최신순
+        trigram 토크나이저는 3글자 이상만 색인을 사용하므로 짧은 단어는 LIKE로 검사합니다.
+        """
+        terms = text.split() if mode == SearchMode.FULLTEXT else [text]
+        match_terms = [term for term in terms if len(term) >= 3]
+        like_terms = [term for term in terms if len(term) < 3]
+
+        where = "a.status = 'published'"
+        args: List[Any] = []
+        if match_terms:
+            where += " AND archive_fts MATCH ?"
+            args.append(" AND ".join(_fts_phrase(term) for term in match_terms))
+        for term in like_terms:
+            where += " AND (f.title LIKE ? ESCAPE '\\' OR f.description LIKE ? ESCAPE '\\' OR f.body LIKE ? ESCAPE '\\')"
+            args.extend([_like_pattern(term)] * 3)
+        if category:
+            where += " AND a.category = ?"
+            args.append(category)
+
+        # fulltext는 원격과 같이 offset 커서 사용
+        keyset = mode != SearchMode.FULLTEXT
+        ranked = not keyset and bool(match_terms)
+        page_where, page_args, limit_clause = self._page_clause(limit, offset, cursor, keyset, "a")
+        order = "bm25(archive_fts), a.created_at DESC, a.id DESC" if ranked else "a.created_at DESC, a.id DESC"
+        sql = (
+            f"SELECT a.* FROM archive_fts f JOIN archive_items a ON a.rowid = f.rowid "
+            f"WHERE {where}{page_where} ORDER BY {order} {limit_clause}"
+        )
+        rows = self._connect().execute(sql, args + page_args).fetchall()
+        return [self._to_dict(row, columns) for row in rows]
+
+    def _related(
+        self,
+        archive_id: str,
+        limit: int,
+        columns: List[str]
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        conn = self._connect()
+        base_row = conn.execute("SELECT * FROM archive_items WHERE id = ?", (archive_id,)).fetchone()
+        if base_row is None:
+            return None, []
+        base = self._to_dict(base_row, _REPLICA_COLUMNS)
+
+        terms = [("tag", tag) for tag in set(base["tags"])] + [("tech", tech) for tech in set(base["technologies"])]
+        term_clause = " OR ".join("(t.kind = ? AND t.value = ?)" for _ in terms) or "0"
+        term_args = [value for term in terms for value in term]
+
+        # 태그/기술이 겹치는 후보
+        scored = conn.execute(
+            f"SELECT a.id AS id, "
+            f"SUM(CASE t.kind WHEN 'tag' THEN {RELATED_TAG_WEIGHT} ELSE {RELATED_TECH_WEIGHT} END) "
+            f"+ CASE WHEN a.category = ? THEN {RELATED_CATEGORY_WEIGHT} ELSE 0 END AS score "
+            f"FROM archive_terms t JOIN archive_items a ON a.id = t.archive_id "
+            f"WHERE a.status = 'published' AND a.id != ? AND ({term_clause}) "
+            f"GROUP BY a.id ORDER BY score DESC, a.id DESC LIMIT ?",
+            [base["category"], archive_id] + term_args + [limit]
+        ).fetchall()
+        top = [(row["id"], row["score"]) for row in scored]
+
+        # 카테고리만 같은 후보 (30점)
+        if len(top) < limit or top[-1][1] <= RELATED_CATEGORY_WEIGHT:
+            category_only = conn.execute(
+                f"SELECT a.id AS id FROM archive_items a "
+                f"WHERE a.status = 'published' AND a.id != ? AND a.category = ? "
+                f"AND NOT EXISTS (SELECT 1 FROM archive_terms t WHERE t.archive_id = a.id AND ({term_clause})) "
+                f"ORDER BY a.id DESC LIMIT ?",
+                [archive_id, base["category"]] + term_args + [limit]
+            ).fetchall()
+            top = heapq.nlargest(
+                limit,
+                top + [(row["id"], RELATED_CATEGORY_WEIGHT) for row in category_only],
+                key=lambda item: (item[1], item[0])
+            )
+
+        related = []
+        for related_id, score in top:
+            row = conn.execute("SELECT * FROM archive_items WHERE id = ?", (related_id,)).fetchone()
+            related.append({"archive": self._to_dict(row, columns), "score": score})
+        return {column: base[column] for column in columns}, related
+
+    def _stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        return {
+            "path": self.path,
+            "documents": conn.execute("SELECT COUNT(*) FROM archive_items").fetchone()[0],
+            "synced_until": self._get_meta("synced_until")
+        }
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+
+    async def _fetch_all_ids(self) -> Set[str]:
+        ids: Set[str] = set()
+        last_id: Optional[str] = None
+        while True:
+            query = _archive_table().select("id")
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            response = await _execute(query.order("id").limit(SYNC_PAGE_SIZE))
+            ids.update(row["id"] for row in response.data)
+            if len(response.data) < SYNC_PAGE_SIZE:
+                return ids
+            last_id = response.data[-1]["id"]
+
+    async def sync(self) -> None:
+        """updated_at 이후 변경분을 받아서 반영 (최초에는 전체)"""
+        async with self._sync_lock:
+            since = await self._run(self._get_meta, "synced_until")
+            newest = since
+            last_id: Optional[str] = None
+            while True:
+                query = _archive_table().select("*")
+                if since:
+                    query = query.gte("updated_at", since)
+                if last_id is not None:
+                    query = query.gt("id", last_id)
+                response = await _execute(query.order("id").limit(SYNC_PAGE_SIZE))
+                rows = response.data
+                if rows:
+                    await self._run(self._upsert_rows, rows)
+                    for row in rows:
+                        if row.get("updated_at") and (newest is None or row["updated_at"] > newest):
+                            newest = row["updated_at"]
+                if len(rows) < SYNC_PAGE_SIZE:
+                    break
+                last_id = rows[-1]["id"]
+
+            if newest:
+                await self._run(self._set_meta, "synced_until", newest)
+
+            now = time.monotonic()
+            if now - self._last_reconcile >= self.reconcile_seconds:
+                remote_ids = await self._fetch_all_ids()
+                await self._run(self._retain_ids, remote_ids)
+                self._last_reconcile = now
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    async def ensure_ready(self) -> bool:
+        """
+        복제본 사용 가능 여부 (최초 호출 시 동기화 후 백그라운드 동기화 시작)
+
+        동기화에 실패하면 False를 반환하고, 도구는 Supabase로 직접 조회합니다.
+        """
+        if self._ready:
+            return True
+        if time.monotonic() < self._next_attempt:
+            return False
+        try:
+            await self.sync()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            self._next_attempt = time.monotonic() + self.sync_seconds
+            return False
+        self._ready = True
+        self.last_error = None
+        self._sync_task = asyncio.create_task(self._sync_loop())
+        return True
+
+    # ------------------------------------------------------------------
+    # 비동기 인터페이스
+    # ------------------------------------------------------------------
+
+    async def apply_writes(self, rows: List[Dict[str, Any]]) -> None:
+        """Supabase 쓰기 응답을 즉시 반영"""
+        if rows:
+            await self._run(self._upsert_rows, rows)
+
+    async def get(self, archive_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self._get, archive_id)
+
+    async def list(self, columns: List[str], category: Optional[str], status: Optional[str],
+                   limit: int, offset: int, cursor: Optional[str]) -> List[Dict[str, Any]]:
+        return await self._run(self._list, columns, category, status, limit, offset, cursor)
+
+    async def search(self, columns: List[str], text: str, mode: SearchMode, category: Optional[str],
+                     limit: int, offset: int, cursor: Optional[str]) -> List[Dict[str, Any]]:
+        return await self._run(self._search, columns, text, mode, category, limit, offset, cursor)
+
+    async def related(self, archive_id: str, limit: int,
+                      columns: List[str]) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        return await self._run(self._related, archive_id, limit, columns)
+
+    async def stats(self) -> Dict[str, Any]:
+        stats = await self._run(self._stats)
+        stats.update({"ready": self._ready, "last_error": self.last_error})
+        return stats
+
+
+_local_replica: Optional[LocalReplica] = (
+    LocalReplica(LOCAL_REPLICA_PATH, REPLICA_SYNC_SECONDS, REPLICA_RECONCILE_SECONDS)
+    if LOCAL_REPLICA_PATH else None
+)
+
+
+async def _use_local_replica() -> Optional[LocalReplica]:
+    """동기화된 로컬 복제본 (비활성화 또는 준비 전이면 None)"""
+    if _local_replica is not None and await _local_replica.ensure_ready():
+        return _local_replica
+    return None
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def _export_compression_for(path: Path) -> ExportCompression:
+    """확장자로 압축 방식 판단"""
+    if path.suffix == ".gz":
+        return ExportCompression.GZIP
+    if path.suffix == ".zst":
+        return ExportCompression.ZSTD
+    return ExportCompression.NONE
+
+
+def _open_export_stream(path: Path, compression: ExportCompression):
+    """바이너리 쓰기 스트림 (압축 방식별)"""
+    if compression == ExportCompression.GZIP:
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == ExportCompression.ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+    return open(path, "wb")
+
+
+def _write_ndjson(stream, rows: List[Dict[str, Any]]) -> None:
+    stream.write("".join(
+        json.dumps(row, ensure_ascii=False) + "\n" for row in rows
+    ).encode("utf-8"))
+
+
+async def _fetch_export_page(
+    columns: str,
+    last_id: Optional[str],
+    status: Optional[str],
+    category: Optional[str],
+    with_count: bool
+) -> Any:
+    """id 순서로 다음 페이지 조회 (첫 페이지는 전체 건수 포함)"""
+    query = _archive_table().select(columns, count="exact") if with_count else _archive_table().select(columns)
+    if status:
+        query = query.eq("status", status)
+    if category:
+        query = query.eq("category", category)
+    if last_id is not None:
+        query = query.gt("id", last_id)
+    return await _execute(query.order("id").limit(SYNC_PAGE_SIZE))
+
+
+async def _export_archives(
+    output_path: str,
+    compression: Optional[ExportCompression] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    columns: str = "*",
+    overwrite: bool = False,
+    on_progress=None
+) -> Dict[str, Any]:
+    """
+    archive_items를 NDJSON 파일로 스트리밍 내보내기
+
+    id 기준 keyset 페이지로 조회하면서 다음 페이지를 미리 요청하고,
+    받은 페이지는 바로 파일에 씁니다. 메모리에는 최대 두 페이지만 유지됩니다.
+    파일은 `.part`로 쓴 뒤 완료 시 원래 이름으로 바꿉니다.
+
+    Args:
+        on_progress: async (rows, total, elapsed) 진행 상황 콜백
+
+    Returns:
+        경로, 행 수, 파일 크기, 소요 시간, 처리량
+    """
+    _check_supabase()
+
+    path = Path(output_path).expanduser()
+    if path.exists() and not overwrite:
+        raise RuntimeError(f"File already exists: {path} (set overwrite to replace it)")
+    compression = compression or _export_compression_for(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".part")
+
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    rows_written = 0
+    total: Optional[int] = None
+    pending = None
+    stream = _open_export_stream(temp_path, compression)
+    try:
+        pending = asyncio.ensure_future(_fetch_export_page(columns, None, status, category, True))
+        while pending is not None:
+            response = await pending
+            rows = response.data
+            if total is None:
+                total = response.count
+            # 현재 페이지를 쓰는 동안 다음 페이지 조회
+            pending = (
+                asyncio.ensure_future(_fetch_export_page(columns, rows[-1]["id"], status, category, False))
+                if len(rows) == SYNC_PAGE_SIZE else None
+            )
+            await loop.run_in_executor(_io_executor, _write_ndjson, stream, rows)
+            rows_written += len(rows)
+            if on_progress is not None:
+                await on_progress(rows_written, total, time.monotonic() - started)
+        stream.close()
+        os.replace(temp_path, path)
+    except BaseException:
+        if pending is not None:
+            pending.cancel()
+        stream.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    elapsed = time.monotonic() - started
+    return {
+        "path": str(path),
+        "compression": compression.value,
+        "rows": rows_written,
+        "bytes": path.stat().st_size,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_written / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def _format_export_result(result: Dict[str, Any]) -> str:
+    lines = ["# 📦 내보내기 완료", ""]
+    lines.append(f"**파일**: `{result['path']}`")
+    lines.append(f"**행 수**: {result['rows']:,}")
+    lines.append(f"**크기**: {result['bytes'] / 1024 / 1024:.2f} MB ({result['compression']})")
+    lines.append(f"**소요 시간**: {result['elapsed_seconds']}초 ({result['rows_per_second'] or 0:,.0f} 행/초)")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def _open_import_stream(path: Path):
+    """텍스트 읽기 스트림 (확장자로 압축 판단)"""
+    compression = _export_compression_for(path)
+    if compression == ExportCompression.GZIP:
+        return gzip.open(path, "rt", encoding="utf-8")
+    if compression == ExportCompression.ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd decompression requires the zstandard package (pip install zstandard)")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")), encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _iter_import_records(path: Path):
+    """(줄 번호, 원본) 순회 - JSON 배열(.json)은 전체를 읽은 뒤 순회"""
+    if path.suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise RuntimeError("JSON import file must contain an array")
+        yield from enumerate(data, 1)
+        return
+    with _open_import_stream(path) as stream:
+        for line_no, line in enumerate(stream, 1):
+            if line.strip():
+                yield line_no, line
+
+
+def _import_archive_id(item: Dict[str, Any], state: Dict[str, Any]) -> str:
+    """
+    id가 없는 행의 ID (행 내용 해시로 결정)
+
+    재개나 restart로 같은 행을 다시 보내도 같은 ID가 되어 새 행이 생기지 않습니다
+    (id 기준 upsert). 타임스탬프 부분은 created_at, 없으면 원본 파일 수정 시각입니다.
+    """
+    digest = hashlib.blake2b(
+        json.dumps(item, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    timestamp_ms = state["source_mtime_ms"]
+    if item.get("created_at"):
+        try:
+            timestamp_ms = int(datetime.fromisoformat(str(item["created_at"]).replace("Z", "+00:00")).timestamp() * 1000)
+        except ValueError:
+            pass
+    return _generate_archive_id(timestamp_ms, random.Random(digest))
+
+
+def _import_row(record: Any, state: Dict[str, Any], now: str) -> Dict[str, Any]:
+    """원본 한 줄을 archive_items 행으로 변환 (테이블 제약으로 검증)"""
+    item = json.loads(record) if isinstance(record, str) else record
+    if not isinstance(item, dict):
+        raise ValueError("record is not a JSON object")
+    validated = ImportArchiveRow.model_validate(item)
+    archive_id = item.get("id") or _import_archive_id(item, state)
+    row = _build_archive_row(validated, str(archive_id), now)
+    row["tags"] = row["tags"] or []
+    row["technologies"] = row["technologies"] or []
+    for field in IMPORT_PRESERVED_FIELDS:
+        if item.get(field) is not None:
+            row[field] = item[field]
+    return row
+
+
+def _prepare_import_batch(records, batch_size: int, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    다음 배치를 읽고 검증 (작업 스레드에서 실행)
+
+    Returns:
+        {"end_line", "rows", "lines", "rejects"} 또는 파일 끝이면 None
+    """
+    now = datetime.utcnow().isoformat()
+    batch: Dict[str, Any] = {"end_line": None, "rows": [], "lines": [], "rejects": []}
+    count = 0
+    for line_no, record in records:
+        if line_no <= state["line"]:
+            continue  # 이전 실행에서 처리된 줄
+        batch["end_line"] = line_no
+        try:
+            batch["rows"].append(_import_row(record, state, now))
+            batch["lines"].append(line_no)
+        except ValidationError as e:
+            batch["rejects"].append({"line": line_no, "error": _format_validation_error(e), "record": record})
+        except ValueError as e:
+            batch["rejects"].append({"line": line_no, "error": str(e), "record": record})
+        count += 1
+        if count >= batch_size:
+            break
+    return batch if count else None
+
+
+async def _upsert_import_rows(rows: List[Dict[str, Any]]) -> None:
+    """id 기준 upsert (일시적 오류는 지수 백오프로 재시도)"""
+    for attempt in range(IMPORT_MAX_RETRIES):
+        try:
+            response = await _execute(
+                _archive_table().upsert(rows, on_conflict="id", default_to_null=False)
+            )
+            await _after_write(response.data or [])
+            return
+        except Exception:
+            if attempt == IMPORT_MAX_RETRIES - 1:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+
+async def _commit_import_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    배치 저장
+
+    배치 요청이 계속 실패하면 한 건씩 다시 보내서 문제 행만 거부합니다.
+    모든 행이 실패하면 연결 문제로 보고 예외를 그대로 올립니다 (체크포인트에서 재개).
+    """
+    rows = batch["rows"]
+    batch["imported"] = 0
+    if not rows:
+        return batch
+    try:
+        await _upsert_import_rows(rows)
+        batch["imported"] = len(rows)
+        return batch
+    except Exception as batch_error:
+        if len(rows) == 1:
+            raise
+        results = await asyncio.gather(*[_upsert_import_rows([row]) for row in rows], return_exceptions=True)
+        if all(isinstance(r, Exception) for r in results):
+            raise batch_error
+        for line_no, row, result in zip(batch["lines"], rows, results):
+            if isinstance(result, Exception):
+                batch["rejects"].append({"line": line_no, "error": str(result), "record": row})
+            else:
+                batch["imported"] += 1
+        return batch
+
+
+def _write_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+async def _import_archives(
+    source_path: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    concurrency: int = IMPORT_CONCURRENCY,
+    checkpoint_path: Optional[str] = None,
+    rejected_path: Optional[str] = None,
+    restart: bool = False,
+    on_progress=None
+) -> Dict[str, Any]:
+    """
+    NDJSON 파일을 스트리밍으로 읽어서 archive_items에 upsert
+
+    배치는 최대 concurrency개까지 동시에 보내고, 앞에서부터 연속으로 완료된
+    배치까지만 체크포인트에 기록합니다. 중단 후 다시 실행하면 마지막으로
+    기록된 줄 다음부터 이어서 가져옵니다.
+
+    Args:
+        on_progress: async (committed_line, imported, rejected, elapsed) 진행 상황 콜백
+
+    Returns:
+        가져온/거부된 행 수, 재개 위치, 처리량
+    """
+    _check_supabase()
+
+    source = Path(source_path).expanduser().resolve()
+    if not source.exists():
+        raise RuntimeError(f"File not found: {source}")
+    checkpoint_file = (
+        Path(checkpoint_path).expanduser() if checkpoint_path
+        else source.with_name(source.name + ".checkpoint.json")
+    )
+    rejected_file = (
+        Path(rejected_path).expanduser() if rejected_path
+        else source.with_name(source.name + ".rejected.ndjson")
+    )
+    source_size = source.stat().st_size
+
+    state: Optional[Dict[str, Any]] = None
+    if checkpoint_file.exists() and not restart:
+        state = json.loads(checkpoint_file.read_text(encoding="utf-8"))
+        if state.get("source") != str(source) or state.get("source_size") != source_size:
+            raise RuntimeError(
+                f"Checkpoint {checkpoint_file} belongs to a different or modified file (set restart to start over)"
+            )
+    if state is None:
+        state = {
+            "source": str(source),
+            "source_size": source_size,
+            "source_mtime_ms": int(source.stat().st_mtime * 1000),
+            "line": 0,
+            "imported": 0,
+            "rejected": 0,
+            "rejected_offset": 0,
+            "completed": False
+        }
+        _write_checkpoint(checkpoint_file, state)
+
+    resumed_from = state["line"]
+    result = {
+        "source": str(source),
+        "checkpoint": str(checkpoint_file),
+        "rejected_file": str(rejected_file),
+        "resumed_from_line": resumed_from,
+        "imported": 0,
+        "rejected": 0
+    }
+    if state["completed"]:
+        result.update(already_completed=True, total_imported=state["imported"], total_rejected=state["rejected"])
+        return result
+
+    started = time.monotonic()
+    records = _iter_import_records(source)
+    # 거부 파일은 체크포인트 시점까지만 유지 (이후 기록은 재개 시 다시 생성됨)
+    rejects_out = open(rejected_file, "r+b" if rejected_file.exists() else "wb")
+    rejects_out.truncate(state["rejected_offset"])
+    rejects_out.seek(state["rejected_offset"])
+
+    in_flight: Dict[int, asyncio.Future] = {}
+    finished: Dict[int, Dict[str, Any]] = {}
+    reading = None
+    next_seq = 0
+    next_commit = 0
+    exhausted = False
+    try:
+        while not exhausted or in_flight:
+            while not exhausted and len(in_flight) < concurrency:
+                reading = _io_executor.submit(_prepare_import_batch, records, batch_size, state)
+                batch = await asyncio.wrap_future(reading)
+                if batch is None:
+                    exhausted = True
+                    break
+                in_flight[next_seq] = asyncio.ensure_future(_commit_import_batch(batch))
+                next_seq += 1
+            if not in_flight:
+                break
+
+            await asyncio.wait(in_flight.values(), return_when=asyncio.FIRST_COMPLETED)
+            for seq in [seq for seq, task in in_flight.items() if task.done()]:
+                finished[seq] = in_flight.pop(seq).result()
+
+            # 앞에서부터 연속으로 완료된 배치만 체크포인트에 반영
+            while next_commit in finished:
+                batch = finished.pop(next_commit)
+                for reject in sorted(batch["rejects"], key=lambda r: r["line"]):
+                    rejects_out.write((json.dumps(reject, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                rejects_out.flush()
+                state["line"] = batch["end_line"]
+                state["imported"] += batch["imported"]
+                state["rejected"] += len(batch["rejects"])
+                state["rejected_offset"] = rejects_out.tell()
+                _write_checkpoint(checkpoint_file, state)
+                result["imported"] += batch["imported"]
+                result["rejected"] += len(batch["rejects"])
+                next_commit += 1
+                if on_progress is not None:
+                    await on_progress(state["line"], result["imported"], result["rejected"], time.monotonic() - started)
+
+        state["completed"] = True
+        _write_checkpoint(checkpoint_file, state)
+    except BaseException:
+        for task in in_flight.values():
+            task.cancel()
+        raise
+    finally:
+        rejects_out.close()
+        # 취소되어도 작업 스레드는 records를 계속 읽고 있을 수 있으므로 읽기가 끝난 뒤 닫음
+        # (읽는 중에 닫으면 "generator already executing"이 원래 예외를 가림)
+        if reading is not None:
+            reading.add_done_callback(lambda _: records.close())
+        else:
+            records.close()
+
+    elapsed = time.monotonic() - started
+    result.update(
+        total_imported=state["imported"],
+        total_rejected=state["rejected"],
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(result["imported"] / elapsed, 1) if elapsed > 0 else None
+    )
+    return result
+
+
+def _format_import_result(result: Dict[str, Any]) -> str:
+    if result.get("already_completed"):
+        return (
+            f"# 📥 이미 완료된 가져오기\n\n"
+            f"**파일**: `{result['source']}`\n"
+            f"**가져온 행**: {result['total_imported']:,} / **거부**: {result['total_rejected']:,}\n\n"
+            f"다시 가져오려면 restart를 지정하세요."
+        )
+    lines = ["# 📥 가져오기 완료", ""]
+    lines.append(f"**파일**: `{result['source']}`")
+    if result["resumed_from_line"]:
+        lines.append(f"**재개 위치**: {result['resumed_from_line']:,}번째 줄 이후")
+    lines.append(f"**가져온 행**: {result['imported']:,} (누적 {result['total_imported']:,})")
+    lines.append(f"**거부된 행**: {result['rejected']:,} (누적 {result['total_rejected']:,})")
+    if result["total_rejected"]:
+        lines.append(f"**거부 목록**: `{result['rejected_file']}`")
+    lines.append(f"**소요 시간**: {result['elapsed_seconds']}초 ({result['rows_per_second'] or 0:,.0f} 행/초)")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# RESUMABLE UPLOAD (TUS)
+# ============================================================================
+# 큰 파일은 {SUPABASE_URL}/storage/v1/upload/resumable에 TUS 1.0 프로토콜로
+# 6MB 청크씩 디스크에서 읽어서 보냅니다. 업로드 URL은 상태 파일에 기록되므로
+# 중간에 끊기면 다음 호출이 서버의 Upload-Offset부터 이어서 보냅니다.
+# 메모리에는 청크 하나만 올라갑니다.
+
+TUS_VERSION = "1.0.0"
+
+
+class ResumableUploadError(RuntimeError):
+    """TUS 업로드 오류 (status: HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _tus_headers(**extra: str) -> Dict[str, str]:
+    headers = {
+        "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
+        "apikey": SUPABASE_ANON_KEY,
+        "Tus-Resumable": TUS_VERSION,
+    }
+    headers.update(extra)
+    return headers
+
+
+def _tus_metadata(**values: str) -> str:
+    """Upload-Metadata 헤더 (키 base64값, 쉼표 구분)"""
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}" for key, value in values.items()
+    )
+
+
+def _resumable_state_path(bucket: str, object_path: str, source_path: str) -> Path:
+    """업로드 상태 파일 경로 (대상 객체 + 원본 파일 크기/수정 시각 기준)"""
+    stat = os.stat(source_path)
+    key = f"{bucket}/{object_path}|{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return Path(RESUMABLE_STATE_DIR).expanduser() / f"{name}.json"
+
+
+def _tus_offset(client: httpx.Client, upload_url: str) -> Optional[int]:
+    """서버에 받은 바이트 수 (업로드가 만료/삭제되었으면 None)"""
+    response = client.head(upload_url, headers=_tus_headers())
+    if response.status_code in (404, 410):
+        return None
+    if response.status_code >= 400:
+        raise ResumableUploadError(f"Upload offset check failed: {response.text}", response.status_code)
+    return int(response.headers["Upload-Offset"])
+
+
+def _tus_create(
+    client: httpx.Client,
+    bucket: str,
+    object_path: str,
+    size: int,
+    content_type: str,
+    cache_control: str,
+    upsert: bool
+) -> str:
+    """업로드 생성 후 업로드 URL 반환"""
+    response = client.post(
+        f"{SUPABASE_URL}/storage/v1/upload/resumable",
+        headers=_tus_headers(**{
+            "Upload-Length": str(size),
+            "Upload-Metadata": _tus_metadata(
+                bucketName=bucket,
+                objectName=object_path,
+                contentType=content_type,
+                cacheControl=cache_control
+            ),
+            "x-upsert": "true" if upsert else "false",
+        })
+    )
+    if response.status_code >= 400:
+        raise ResumableUploadError(f"Resumable upload failed: {response.text}", response.status_code)
+    return str(httpx.URL(f"{SUPABASE_URL}/storage/v1/upload/resumable").join(response.headers["Location"]))
+
+
+def _upload_resumable(
+    bucket: str,
+    object_path: str,
+    source_path: str,
+    content_type: str,
+    cache_control: str = "3600",
+    upsert: bool = False,
+    on_progress: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    파일을 TUS 재개 가능 업로드로 전송 (워커 스레드에서 실행)
+
+    청크 전송이 실패하면 서버 오프셋을 다시 확인하고 백오프 후 이어서 보냅니다.
+    재시도를 모두 실패해도 상태 파일은 남아서 다음 호출이 이어서 업로드합니다.
+
+    Returns:
+        {path, size, resumed_from, chunks}
+    """
+    size = os.path.getsize(source_path)
+    state_path = _resumable_state_path(bucket, object_path, source_path)
+    state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+
+    client = _get_http_client()
+    upload_url = state.get("upload_url")
+    offset = _tus_offset(client, upload_url) if upload_url else None
+    if offset is None:
+        upload_url = _tus_create(client, bucket, object_path, size, content_type, cache_control, upsert)
+        offset = 0
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_checkpoint(state_path, {"upload_url": upload_url, "object": f"{bucket}/{object_path}", "size": size})
+    resumed_from = offset
+
+    chunks = 0
+    failures = 0
+    with open(source_path, "rb") as f:
+        while offset < size:
+            f.seek(offset)
+            chunk = f.read(RESUMABLE_CHUNK_SIZE)
+            try:
+                response = client.patch(
+                    upload_url,
+                    content=chunk,
+                    headers=_tus_headers(**{
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    })
+                )
+                if response.status_code >= 400:
+                    raise ResumableUploadError(f"Chunk upload failed: {response.text}", response.status_code)
+                offset = int(response.headers.get("Upload-Offset", offset + len(chunk)))
+                chunks += 1
+                failures = 0
+                if on_progress is not None:
+                    on_progress(offset, size)
+            except (httpx.TransportError, ResumableUploadError) as e:
+                failures += 1
+                status = getattr(e, "status", None)
+                if failures > RESUMABLE_MAX_RETRIES or (status is not None and status < 500 and status != 409):
+                    raise
+                time.sleep(min(0.5 * 2 ** (failures - 1), 8.0) + random.uniform(0, 0.25))
+                # 409는 오프셋 불일치 (이전 청크가 실제로는 도착한 경우 등)
+                server_offset = _tus_offset(client, upload_url)
+                if server_offset is None:
+                    raise ResumableUploadError("Resumable upload expired", 410)
+                offset = server_offset
+
+    state_path.unlink(missing_ok=True)
+    return {"path": object_path, "size": size, "resumed_from": resumed_from, "chunks": chunks}
+
+
+# ============================================================================
+# IMAGE HASH INDEX
+# ============================================================================
+
+def _dhash(source: Any) -> int:
+    """
+    이미지 dHash (64비트)
+
+    9x8 흑백으로 줄인 뒤 가로로 이웃한 픽셀의 밝기 증가 여부를 비트로 기록합니다.
+    크기 변경/재압축에는 거의 변하지 않아 해밍 거리로 유사 이미지를 찾을 수 있습니다.
+
+    Args:
+        source: 파일 경로 또는 이미지 바이트
+    """
+    from PIL import Image as PILImage, ImageOps
+    import numpy as np
+
+    with PILImage.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        img.draft("L", (64, 64))  # JPEG는 축소 디코딩
+        gray = ImageOps.exif_transpose(img).convert("L").resize((9, 8), PILImage.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int(np.packbits(bits.flatten()).view(">u8")[0])
+
+
+def _popcount64(values: "np.ndarray") -> "np.ndarray":
+    """uint64 배열 각 원소의 1비트 수"""
+    import numpy as np
+
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class ImageHashIndex:
+    """
+    thumbnails 버킷 이미지의 dHash 색인
+
+    - 해시는 uint64 배열 하나에 모아서, 검색은 XOR + popcount 한 번으로 전체를 계산
+    - 로컬 파일(.npz)에 저장하고, 새 업로드는 즉시 추가
+    - 버킷 전체 색인은 `index-images` CLI로 생성/갱신
+    - 추가/검색은 이벤트 루프, 저장은 이미지 워커 스레드에서 실행되므로 잠금으로 보호
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self._hashes: Optional["np.ndarray"] = None
+        self._size = 0
+        self._paths: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+        # 저장은 한 번에 하나씩 (늦게 찍은 스냅샷이 먼저 찍은 스냅샷에 덮이지 않도록)
+        self._save_lock = threading.Lock()
+
+    def _load(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._read()
+
+    def _read(self) -> None:
+        import numpy as np
+
+        self._loaded = True
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        if not self.path.exists():
+            return
+        with np.load(self.path) as data:
+            self._hashes = data["hashes"].astype(np.uint64)
+            self._paths = [p.decode("utf-8") for p in data["paths"].tolist()]
+        self._size = len(self._paths)
+        self._positions = {p: i for i, p in enumerate(self._paths)}
+
+    def __contains__(self, object_path: str) -> bool:
+        with self._lock:
+            self._load()
+            return object_path in self._positions
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return self._size
+
+    def add(self, object_path: str, value: int) -> None:
+        import numpy as np
+
+        with self._lock:
+            self._load()
+            position = self._positions.get(object_path)
+            if position is None:
+                if self._size == len(self._hashes):
+                    # 용량을 두 배로 늘려서 추가 비용을 상각
+                    grown = np.zeros(max(1024, 2 * len(self._hashes)), dtype=np.uint64)
+                    grown[:self._size] = self._hashes[:self._size]
+                    self._hashes = grown
+                position = self._size
+                self._size += 1
+                self._paths.append(object_path)
+                self._positions[object_path] = position
+            self._hashes[position] = np.uint64(value)
+            self._dirty = True
+
+    def search(self, value: int, max_distance: int, limit: int = 5) -> List[Tuple[str, int]]:
+        """해밍 거리 max_distance 이하인 (경로, 거리) 목록 (가까운 순)"""
+        import numpy as np
+
+        with self._lock:
+            self._load()
+            if self._size == 0:
+                return []
+            distances = _popcount64(self._hashes[:self._size] ^ np.uint64(value))
+            matches = np.flatnonzero(distances <= max_distance)
+            if len(matches) > limit:
+                matches = matches[np.argpartition(distances[matches], limit - 1)[:limit]]
+            ordered = sorted(matches.tolist(), key=lambda i: (int(distances[i]), self._paths[i]))
+            return [(self._paths[i], int(distances[i])) for i in ordered]
+
+    def save(self) -> None:
+        """변경이 있으면 스냅샷을 고유한 임시 파일에 쓴 뒤 원자적으로 교체"""
+        import numpy as np
+
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                hashes = self._hashes[:self._size].copy()
+                paths = np.array([p.encode("utf-8") for p in self._paths], dtype=bytes)
+                self._dirty = False
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle = tempfile.NamedTemporaryFile(
+                dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp", delete=False
+            )
+            try:
+                with handle:
+                    np.savez_compressed(handle, hashes=hashes, paths=paths)
+                os.replace(handle.name, self.path)
+            except BaseException:
+                with self._lock:
+                    self._dirty = True
+                if os.path.exists(handle.name):
+                    os.unlink(handle.name)
+                raise
+
+
+_image_hash_index = ImageHashIndex(IMAGE_HASH_INDEX_PATH)
+
+
+def _find_similar_images(
+    image_hash: int,
+    max_distance: int = IMAGE_SIMILAR_DISTANCE,
+    limit: int = 5,
+    exclude: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """색인에서 유사 이미지 검색 (공개 URL, 해밍 거리)"""
+    bucket = supabase.storage.from_("thumbnails")
+    matches = _image_hash_index.search(image_hash, max_distance, limit + 1)
+    return [
+        {"path": path, "url": bucket.get_public_url(path), "distance": distance}
+        for path, distance in matches if path != exclude
+    ][:limit]
+
+
+def _log_index_error(object_path: str, error: Exception) -> str:
+    """유사 이미지 색인 오류를 stderr에 남기고 결과에 넣을 메시지 반환"""
+    message = f"{type(error).__name__}: {error}"
+    print(f"Warning: image hash index failed for {object_path}: {message}", file=sys.stderr)
+    return message
+
+
+async def _index_uploaded_image(object_path: str, image_hash: int) -> None:
+    _image_hash_index.add(object_path, image_hash)
+    await _run_image_task(_image_hash_index.save)
+
+
+async def _refresh_image_hash_index(on_progress=None) -> Dict[str, Any]:
+    """
+    thumbnails/archive-images/의 이미지 중 색인에 없는 것만 내려받아서 dHash 추가
+
+    Returns:
+        전체/추가/실패 수
+    """
+    _check_supabase()
+    bucket = supabase.storage.from_("thumbnails")
+
+    missing: List[str] = []
+    offset = 0
+    while True:
+        page = await _storage_call(
+            bucket.list, "archive-images", {"limit": SYNC_PAGE_SIZE, "offset": offset}
+        )
+        for item in page:
+            object_path = f"archive-images/{item['name']}"
+            if item.get("id") and object_path not in _image_hash_index:
+                missing.append(object_path)
+        if len(page) < SYNC_PAGE_SIZE:
+            break
+        offset += SYNC_PAGE_SIZE
+
+    added = failed = 0
+
+    async def index_one(object_path: str) -> None:
+        nonlocal added, failed
+        try:
+            data = await _storage_call(bucket.download, object_path)
+            _image_hash_index.add(object_path, await _run_image_task(_dhash, data))
+            added += 1
+        except Exception:
+            failed += 1  # 이미지가 아니거나 손상된 파일
+        if on_progress is not None:
+            await on_progress(added + failed, len(missing))
+
+    # 동시 다운로드는 Storage 세마포어로 제한, 1000개마다 중간 저장
+    for start in range(0, len(missing), SYNC_PAGE_SIZE):
+        await asyncio.gather(*[index_one(path) for path in missing[start:start + SYNC_PAGE_SIZE]])
+        await _run_image_task(_image_hash_index.save)
+
+    return {"indexed": len(_image_hash_index), "added": added, "failed": failed, "path": str(_image_hash_index.path)}
+
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _check_supabase() -> None:
+    if supabase is None:
+        raise RuntimeError("Supabase not initialized. Please check environment variables.")
+
+
+def _check_openai() -> None:
+    global openai_client
+    if openai_client is not None:
+        return
+    if not OPENAI_API_KEY:
+        raise RuntimeError("OpenAI not initialized. Please check OPENAI_API_KEY.")
+    from openai import AsyncOpenAI
+    try:
+        openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    except Exception as e:
+        raise RuntimeError(f"OpenAI not initialized: {e}")
+
+
+def _generate_archive_id(timestamp_ms: Optional[int] = None, rng: Optional[random.Random] = None) -> str:
+    """
+    아카이브 ID 생성 (Next.js 앱과 동일한 패턴)
+    패턴: {timestamp}-{random_string}
+    예: 1761901131544-a2mnqr
+
+    Args:
+        timestamp_ms: 타임스탬프 (기본: 현재 시간, 가져오기 재시도 시 같은 ID를 만들기 위해 지정)
+        rng: 난수 생성기 (기본: random 모듈)
+    """
+    if timestamp_ms is None:
+        timestamp_ms = int(time.time() * 1000)  # 밀리초 단위 타임스탬프
+    timestamp = str(timestamp_ms)
+
+    # 랜덤 문자열 생성 (6자리, 소문자+숫자)
+    # JavaScript의 Math.random().toString(36).substring(7)과 동일한 결과
+    random_chars = ''.join((rng or random).choices(string.ascii_lowercase + string.digits, k=6))
+
+    return f"{timestamp}-{random_chars}"
+
+
+def _build_archive_row(params: CreateArchiveInput, archive_id: str, now: str) -> Dict[str, Any]:
+    """
+    생성 입력을 archive_items 행으로 변환
+
+    Args:
+        params: 검증된 생성 입력 (가져오기는 같은 필드를 가진 ImportArchiveRow)
+        archive_id: 아카이브 ID (_generate_archive_id)
+        now: 현재 시간 (ISO 8601)
+    """
+    archive_data = {
+        "id": archive_id,
+        "title": params.title,
+        "content": params.content,
+        "category": params.category.value,
+        "description": params.description,
+        "tags": params.tags,
+        "technologies": params.technologies,
+        "status": "draft",
+        "view_count": 0,
+        "comment_count": 0,
+        "created_at": now,
+        "updated_at": now,
+        "published_at": now  # 날짜 자동 설정 (Next.js 앱과 동일)
+    }
+
+    # 선택적 필드
+    if params.sub_category:
+        archive_data["sub_category"] = params.sub_category
+    if params.excerpt:
+        archive_data["excerpt"] = params.excerpt
+    if params.author:
+        archive_data["author"] = params.author
+    if params.difficulty:
+        archive_data["difficulty"] = params.difficulty
+    if params.thumbnail_url:
+        archive_data["thumbnail_url"] = params.thumbnail_url
+
+    return archive_data
+
+
+def _build_update_fields(params: UpdateArchiveInput) -> Dict[str, Any]:
+    """수정 입력에서 값이 있는 필드만 추출 (updated_at 제외)"""
+    update_data: Dict[str, Any] = {}
+
+    if params.title:
+        update_data["title"] = params.title
+    if params.content:
+        update_data["content"] = params.content
+    if params.description:
+        update_data["description"] = params.description
+    if params.excerpt:
+        update_data["excerpt"] = params.excerpt
+    if params.category:
+        update_data["category"] = params.category.value
+    if params.sub_category:
+        update_data["sub_category"] = params.sub_category
+    if params.tags:
+        update_data["tags"] = params.tags
+    if params.technologies:
+        update_data["technologies"] = params.technologies
+    if params.difficulty:
+        update_data["difficulty"] = params.difficulty
+
+    return update_data
+
+
+async def _after_write(rows: List[Dict[str, Any]]) -> None:
+    """쓰기 응답 행을 캐시/역색인/로컬 복제본에 반영"""
+    for row in rows:
+        _archive_cache.invalidate(row["id"])
+        _related_index.apply(row)
+    if _local_replica is not None:
+        await _local_replica.apply_writes(rows)
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    """pydantic 검증 오류를 한 줄로 요약"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in e.errors()
+    )
+
+
+def _chunked(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def _insert_rows(rows: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    여러 행을 한 번의 요청으로 삽입
+
+    요청이 실패하면 문제 행을 찾기 위해 한 건씩 다시 시도합니다.
+
+    Returns:
+        {아카이브 ID: None(성공) 또는 오류 메시지}
+    """
+    try:
+        # 항목마다 선택 필드가 다르므로 빠진 컬럼은 기본값 사용
+        response = await _execute(_archive_table().insert(rows, default_to_null=False))
+    except Exception as e:
+        if len(rows) == 1:
+            return {rows[0]["id"]: _handle_error(e)}
+        results: Dict[str, Optional[str]] = {}
+        for partial in await asyncio.gather(*[_insert_rows([row]) for row in rows]):
+            results.update(partial)
+        return results
+
+    await _after_write(response.data or [])
+    return {row["id"]: None for row in rows}
+
+
+async def _bulk_update_rows(items: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    여러 행을 bulk_update_archive_items RPC 한 번으로 수정
+
+    요청이 실패하면 문제 항목을 찾기 위해 한 건씩 다시 시도합니다.
+
+    Returns:
+        {아카이브 ID: None(성공) 또는 오류 메시지}
+    """
+    try:
+        response = await _execute(_archive_rpc("bulk_update_archive_items", {"items": items}))
+    except Exception as e:
+        if len(items) == 1:
+            return {items[0]["id"]: _handle_error(e)}
+        results: Dict[str, Optional[str]] = {}
+        for partial in await asyncio.gather(*[_bulk_update_rows([item]) for item in items]):
+            results.update(partial)
+        return results
+
+    rows = response.data or []
+    await _after_write(rows)
+    updated = {row["id"] for row in rows}
+    return {
+        item["id"]: None if item["id"] in updated else f"Error: Archive '{item['id']}' not found"
+        for item in items
+    }
+
+
+def _format_bulk_report(
+    title: str,
+    results: List[Dict[str, Any]],
+    requests: int,
+    response_format: ResponseFormat
+) -> str:
+    """일괄 처리 결과 (항목별 성공/실패)"""
+    succeeded = [r for r in results if r["ok"]]
+    failed = [r for r in results if not r["ok"]]
+
+    if response_format == ResponseFormat.JSON:
+        return json.dumps({
+            "succeeded": len(succeeded),
+            "failed": len(failed),
+            "requests": requests,
+            "results": results
+        }, ensure_ascii=False, indent=2)
+
+    lines = [f"# {'✅' if not failed else '⚠️'} {title}", ""]
+    lines.append(f"**성공**: {len(succeeded)}개 / **실패**: {len(failed)}개 / **요청 수**: {requests}")
+    if failed:
+        lines.append("")
+        lines.append("## 실패 항목")
+        for r in failed:
+            lines.append(f"- #{r['index']}: {r['error']}")
+    if succeeded:
+        lines.append("")
+        lines.append("## 처리된 ID")
+        lines.append(", ".join(f"`{r['id']}`" for r in succeeded))
+    return "\n".join(lines)
+
+
+def _sniff_image_format(header: bytes) -> Optional[str]:
+    """파일 시그니처로 원본 업로드 가능한 형식 확인 (PNG/JPEG/WebP/GIF, 그 외 None)"""
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"  # 애니메이션 유지
+    return None
+
+
+def _transcode_image(image_path: str) -> str:
+    """
+    PIL로 열어서 PNG로 다시 인코딩 (이미지 워커에서 실행)
+
+    결과는 임시 파일에 쓰고 경로를 반환합니다. 업로드도 파일에서 읽어서 보내므로
+    변환 결과 전체를 메모리에 복사하지 않습니다. 사용 후 호출한 쪽에서 삭제합니다.
+    """
+    from PIL import Image as PILImage
+
+    fd, output_path = tempfile.mkstemp(suffix=".png", prefix="archive-image-")
+    try:
+        with os.fdopen(fd, "wb") as out, PILImage.open(image_path) as img:
+            if img.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+                img = img.convert("RGBA")
+            img.save(out, format="PNG")
+    except Exception:
+        os.unlink(output_path)
+        raise
+    return output_path
+
+
+def _upload_storage_object(
+    file_path: str,
+    source: Any,
+    content_type: str,
+    cache_control: str = "3600",
+    upsert: bool = False
+) -> Any:
+    """
+    Storage 업로드 (워커 스레드에서 실행)
+
+    source가 파일 경로면 열린 파일 객체를 넘겨서 메모리에 전체를 올리지 않고 전송합니다.
+    RESUMABLE_UPLOAD_THRESHOLD보다 큰 파일은 TUS 재개 가능 업로드로 청크씩 보냅니다.
+    """
+    if not isinstance(source, bytes) and os.path.getsize(source) > RESUMABLE_UPLOAD_THRESHOLD:
+        return _upload_resumable("thumbnails", file_path, source, content_type, cache_control, upsert)
+
+    bucket = supabase.storage.from_("thumbnails")
+    file_options = {
+        "content-type": content_type,
+        "cache-control": cache_control,
+        "upsert": "true" if upsert else "false"
+    }
+    if isinstance(source, bytes):
+        return bucket.upload(file_path, source, file_options)
+    with open(source, "rb") as f:
+        return bucket.upload(file_path, f, file_options)
+
+
+# 업로드가 확인된 이미지 (내용 해시 경로 → 공개 URL, 프로세스 내 기록)
+_known_images: Dict[str, str] = {}
+
+
+async def _find_existing_image(file_path: str) -> Optional[str]:
+    """같은 경로(내용 해시)의 이미지가 이미 있으면 공개 URL (로컬 기록 → Storage HEAD 순)"""
+    url = _known_images.get(file_path)
+    if url is not None:
+        return url
+    bucket = supabase.storage.from_("thumbnails")
+    if await _storage_call(bucket.exists, file_path):
+        url = bucket.get_public_url(file_path)
+        _known_images[file_path] = url
+        return url
+    return None
+
+
+def _is_duplicate_error(e: Exception) -> bool:
+    """동시에 같은 객체를 올려서 생긴 중복 오류 여부"""
+    return str(getattr(e, "status", "")) == "409" or "Duplicate" in str(e) or "already exists" in str(e)
+
+
+def _safe_dhash(image_path: str) -> Optional[int]:
+    """dHash (PIL로 열 수 없는 파일은 None)"""
+    try:
+        return _dhash(image_path)
+    except Exception:
+        return None
+
+
+async def _store_image(image_path: str, filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    이미지 한 개를 Supabase Storage에 저장하고 결과 보고
+
+    PNG/JPEG/WebP/GIF는 파일 시그니처만 확인하고 원본 파일을 그대로 업로드합니다.
+    그 외 형식만 이미지 워커에서 PNG로 변환합니다.
+
+    파일명을 지정하지 않으면 원본 내용 해시(BLAKE2b)를 파일명으로 사용하고,
+    같은 내용이 이미 업로드되어 있으면 업로드(와 변환)를 건너뛰고 기존 URL을 반환합니다.
+    dHash 색인에서 비슷한 기존 이미지도 함께 찾습니다.
+
+    색인 조회/추가 실패는 업로드 실패로 보지 않고 index_error로만 알립니다.
+
+    Returns:
+        {path, url, deduplicated, similar: [{path, url, distance}], index_error?}
+    """
+    _check_supabase()
+
+    try:
+        # 파일 존재 확인
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+
+        # 헤더만 읽어서 형식 확인
+        with open(image_path, "rb") as f:
+            source_format = _sniff_image_format(f.read(16))
+        img_format = source_format if source_format in PASSTHROUGH_IMAGE_FORMATS else "png"
+
+        # 내용 해시와 dHash를 이미지 워커에서 동시에 계산
+        if filename:
+            digest, image_hash = None, await _run_image_task(_safe_dhash, image_path)
+        else:
+            digest, image_hash = await asyncio.gather(
+                _run_image_task(_file_digest, image_path),
+                _run_image_task(_safe_dhash, image_path)
+            )
+        file_path = f"archive-images/{filename or digest}.{img_format}"
+        result = {"path": file_path, "deduplicated": False, "similar": []}
+        if image_hash is not None:
+            try:
+                result["similar"] = _find_similar_images(image_hash, exclude=file_path)
+            except Exception as e:
+                result["index_error"] = _log_index_error(file_path, e)
+
+        existing_url = None if filename else await _find_existing_image(file_path)
+        if existing_url is not None:
+            result.update(url=existing_url, deduplicated=True)
+        else:
+            if source_format in PASSTHROUGH_IMAGE_FORMATS:
+                source = image_path
+            else:
+                source = await _run_image_task(_transcode_image, image_path)
+
+            # Supabase Storage에 업로드
+            try:
+                response = await _storage_call(_upload_storage_object, file_path, source, f"image/{img_format}")
+            except Exception as e:
+                # 다른 호출이 같은 내용을 먼저 올린 경우
+                if filename or not _is_duplicate_error(e):
+                    raise
+                response = None
+            finally:
+                if source != image_path:
+                    os.unlink(source)
+
+            # 업로드 실패 체크
+            if hasattr(response, 'error') and response.error:
+                raise RuntimeError(f"Image upload failed: {response.error}")
+
+            # Public URL 가져오기
+            result["url"] = supabase.storage.from_("thumbnails").get_public_url(file_path)
+            if not filename:
+                _known_images[file_path] = result["url"]
+
+        # 이미 Storage에 올라간 뒤이므로 색인 실패는 업로드 결과에 영향 없음
+        if image_hash is not None and "index_error" not in result:
+            try:
+                if file_path not in _image_hash_index:
+                    await _index_uploaded_image(file_path, image_hash)
+            except Exception as e:
+                result["index_error"] = _log_index_error(file_path, e)
+
+        return result
+
+    except FileNotFoundError as e:
+        raise RuntimeError(str(e))
+    except Exception as e:
+        raise RuntimeError(f"Image upload failed: {str(e)}")
+
+
+async def _store_images(
+    image_paths: List[str],
+    max_concurrency: int = STORAGE_MAX_CONCURRENCY,
+    max_retries: int = IMAGE_UPLOAD_MAX_RETRIES
+) -> List[Dict[str, Any]]:
+    """
+    여러 이미지를 동시에 저장 (입력 순서대로 결과 반환)
+
+    동시에 처리하는 파일은 max_concurrency개로 제한하고, 실패한 파일은
+    지수 백오프(+지터)로 max_retries번까지 다시 시도합니다. 없는 파일은 재시도하지 않습니다.
+    Storage 요청 자체는 전역 세마포어로 STORAGE_MAX_CONCURRENCY개까지만 동시에 보냅니다.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def store(index: int, image_path: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"index": index, "image_path": image_path, "ok": False, "attempts": 0}
+        if not os.path.exists(image_path):
+            result["error"] = f"이미지 파일을 찾을 수 없습니다: {image_path}"
+            return result
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                result["attempts"] = attempt + 1
+                try:
+                    result.update(await _store_image(image_path), ok=True)
+                    result.pop("error", None)
+                    return result
+                except Exception as e:
+                    result["error"] = str(e)
+                    if attempt < max_retries:
+                        await asyncio.sleep(0.5 * 2 ** attempt + random.uniform(0, 0.25))
+        return result
+
+    return await asyncio.gather(*[store(i, path) for i, path in enumerate(image_paths)])
+
+
+async def _upload_image_to_storage(
+    image_path: str,
+    filename: Optional[str] = None
+) -> str:
+    """
+    파일 경로에서 이미지를 직접 읽어서 Supabase Storage에 업로드
+    Base64 인코딩 없이 바이너리로 직접 처리 (_store_image 참고)
+
+    Args:
+        image_path: 이미지 파일 경로 (e.g., /mnt/user-data/uploads/image.png)
+        filename: 파일명 (없으면 내용 해시)
+
+    Returns:
+        Public URL
+    """
+    return (await _store_image(image_path, filename))["url"]
+
+
+def _image_output_formats() -> List[str]:
+    """파생 이미지 형식 (Pillow에 AVIF 인코더가 있으면 AVIF 추가)"""
+    from PIL import Image as PILImage
+
+    PILImage.init()
+    return ["webp", "avif"] if "AVIF" in PILImage.SAVE else ["webp"]
+
+
+def _render_image_variants(
+    image_path: str,
+    widths: List[int],
+    formats: List[str],
+    quality: Dict[str, int]
+) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    너비/형식별 파생 이미지 생성 (프로세스 풀에서 실행)
+
+    EXIF 방향은 픽셀에 반영한 뒤 메타데이터 없이 저장합니다 (색 유지를 위해 ICC 프로필만 유지).
+    원본보다 큰 너비는 만들지 않습니다.
+
+    Returns:
+        (원본 너비, 원본 높이, [{format, width, height, hash, data}])
+    """
+    from PIL import Image as PILImage, ImageOps
+
+    with PILImage.open(image_path) as source:
+        icc_profile = source.info.get("icc_profile")
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    targets = sorted({width for width in widths if width < image.width} | {min(image.width, max(widths, default=image.width))})
+    variants = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), PILImage.LANCZOS)
+        for image_format in formats:
+            options: Dict[str, Any] = {"quality": quality[image_format]}
+            if image_format == "webp":
+                options["method"] = 4
+            if icc_profile:
+                options["icc_profile"] = icc_profile
+            buffer = io.BytesIO()
+            resized.save(buffer, format=image_format.upper(), **options)
+            data = buffer.getvalue()
+            variants.append({
+                "format": image_format,
+                "width": width,
+                "height": height,
+                "hash": hashlib.blake2b(data, digest_size=16).hexdigest(),
+                "data": data
+            })
+    return image.width, image.height, variants
+
+
+def _file_digest(path: str) -> str:
+    """파일 내용 해시 (BLAKE2b 128비트, 1MB 단위로 읽음)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_image_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _image_pool() -> ProcessPoolExecutor:
+    """
+    파생 이미지 생성용 프로세스 풀 (첫 사용 시 생성)
+
+    서버는 이미 스레드(작업 풀, HTTP 클라이언트)가 도는 상태이므로 fork 대신 spawn으로 시작합니다.
+    fork하면 다른 스레드가 잡고 있던 잠금이 자식에 잠긴 채로 복사되어 멈출 수 있습니다.
+    """
+    global _image_process_pool
+    if _image_process_pool is None:
+        _image_process_pool = ProcessPoolExecutor(
+            max_workers=IMAGE_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _image_process_pool
+
+
+async def _upload_image_derivatives(image_path: str, include_original: bool = True) -> Dict[str, Any]:
+    """
+    반응형 파생 이미지를 만들어서 Supabase Storage에 업로드
+
+    파생 이미지는 프로세스 풀에서 만들고, 업로드는 동시에 진행합니다.
+    파일명은 내용 해시이므로 같은 이름은 항상 같은 내용이고, 1년 캐시로 업로드합니다.
+    이미 있는 파일은 다시 올리지 않습니다.
+
+    파생 이미지는 archive-images/variants/에 저장되어 유사 이미지 색인(원본만)에 섞이지 않습니다.
+
+    원본이 그대로 올릴 수 없는 형식(HEIC 등)이면 original에 {"skipped": "<형식> not pass-through"}를 남깁니다.
+
+    Returns:
+        원본/파생 이미지 URL 목록, 유사한 기존 이미지, 형식별 srcset, <picture> HTML
+    """
+    _check_supabase()
+
+    if not os.path.exists(image_path):
+        raise RuntimeError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+
+    loop = asyncio.get_running_loop()
+    width, height, variants = await loop.run_in_executor(
+        _image_pool(),
+        _render_image_variants,
+        image_path,
+        IMAGE_DERIVATIVE_WIDTHS,
+        _image_output_formats(),
+        IMAGE_QUALITY
+    )
+
+    async def upload(file_path: str, source: Any, content_type: str) -> str:
+        existing_url = await _find_existing_image(file_path)
+        if existing_url is not None:
+            return existing_url
+        await _storage_call(
+            _upload_storage_object, file_path, source, content_type, IMMUTABLE_CACHE_SECONDS, True
+        )
+        url = supabase.storage.from_("thumbnails").get_public_url(file_path)
+        _known_images[file_path] = url
+        return url
+
+    uploads = [
+        upload(f"archive-images/variants/{v['hash']}.{v['format']}", v["data"], f"image/{v['format']}")
+        for v in variants
+    ]
+
+    original = None
+    original_path = None
+    image_hash = None
+    similar: List[Dict[str, Any]] = []
+    if include_original:
+        with open(image_path, "rb") as f:
+            original_format = _sniff_image_format(f.read(16))
+        if original_format in PASSTHROUGH_IMAGE_FORMATS:
+            digest, image_hash = await asyncio.gather(
+                _run_image_task(_file_digest, image_path),
+                _run_image_task(_safe_dhash, image_path)
+            )
+            original_path = f"archive-images/{digest}.{original_format}"
+            original = {
+                "format": original_format,
+                "width": width,
+                "height": height,
+                "bytes": os.path.getsize(image_path)
+            }
+            if image_hash is not None:
+                try:
+                    similar = _find_similar_images(image_hash, exclude=original_path)
+                except Exception as e:
+                    original["index_error"] = _log_index_error(original_path, e)
+            uploads.append(upload(original_path, image_path, f"image/{original_format}"))
+        else:
+            # 원본을 변환해서 올리면 내용 해시 경로가 달라지므로 건너뛰고 매니페스트에 남김
+            from PIL import Image as PILImage
+
+            with PILImage.open(image_path) as img:
+                source_format = (img.format or "unknown").lower()
+            original = {"skipped": f"{source_format} not pass-through"}
+
+    urls = await asyncio.gather(*uploads)
+
+    manifest_variants = [
+        {"format": v["format"], "width": v["width"], "height": v["height"], "bytes": len(v["data"]), "url": url}
+        for v, url in zip(variants, urls)
+    ]
+    if original_path is not None:
+        original["url"] = urls[-1]
+        # 업로드가 끝난 뒤에 색인하며, 색인 실패는 업로드 결과에 영향 없음
+        if image_hash is not None and "index_error" not in original:
+            try:
+                if original_path not in _image_hash_index:
+                    await _index_uploaded_image(original_path, image_hash)
+            except Exception as e:
+                original["index_error"] = _log_index_error(original_path, e)
+
+    srcset = {}
+    for image_format in dict.fromkeys(v["format"] for v in manifest_variants):
+        srcset[image_format] = ", ".join(
+            f"{v['url']} {v['width']}w" for v in manifest_variants if v["format"] == image_format
+        )
+    largest = max((v for v in manifest_variants if v["format"] == "webp"), key=lambda v: v["width"])
+    sources = "".join(
+        f'<source type="image/{image_format}" srcset="{srcset[image_format]}">'
+        for image_format in ("avif", "webp") if image_format in srcset
+    )
+    picture = (
+        f'<picture>{sources}<img src="{largest["url"]}" width="{largest["width"]}" '
+        f'height="{largest["height"]}" alt="" loading="lazy" decoding="async"></picture>'
+    )
+
+    return {
+        "original": original,
+        "similar": similar,
+        "variants": manifest_variants,
+        "srcset": srcset,
+        "src": largest["url"],
+        "html": picture
+    }
+
+
+def _select_columns(
+    fields: Optional[List[ArchiveField]],
+    include_content: bool = False,
+    required: Optional[List[str]] = None
+) -> str:
+    """
+    PostgREST select 컬럼 목록 생성
+
+    Args:
+        fields: 호출자가 지정한 컬럼 (없으면 ARCHIVE_SUMMARY_FIELDS)
+        include_content: 본문(content) 포함 여부
+        required: 응답 렌더링/계산에 반드시 필요한 컬럼
+
+    Returns:
+        "id,title,..." 형식의 select 문자열
+    """
+    columns = [f.value for f in fields] if fields else list(ARCHIVE_SUMMARY_FIELDS)
+    extra = ["id"] + (required or [])
+    if include_content:
+        extra.append("content")
+    for column in extra:
+        if column not in columns:
+            columns.append(column)
+    return ",".join(columns)
+
+
+def _encode_cursor(position: Dict[str, Any]) -> str:
+    """페이지 위치를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps(position, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error):
+        raise RuntimeError(f"Invalid cursor: {cursor}")
+    if not isinstance(position, dict):
+        raise RuntimeError(f"Invalid cursor: {cursor}")
+    return position
+
+
+def _apply_page(query, limit: int, offset: int, cursor: Optional[str], keyset: bool):
+    """
+    페이지 조건 적용 (다음 페이지 존재 여부 확인을 위해 limit + 1개 요청)
+
+    keyset=True: (created_at, id) 내림차순 커서. 호출자가 같은 순서로 정렬해야 합니다.
+    keyset=False: 관련도 순처럼 정렬 키를 알 수 없는 경우 커서에 offset을 담습니다.
+    """
+    position = _decode_cursor(cursor) if cursor else None
+
+    if not keyset:
+        start = position.get("o", 0) if position else offset
+        return query.range(start, start + limit)
+
+    if position:
+        if "c" not in position or "i" not in position:
+            raise RuntimeError(f"Invalid cursor: {cursor}")
+        created_at = position["c"]
+        archive_id = position["i"]
+        # OR만으로는 인덱스 범위 스캔이 안 되므로 created_at 상한을 함께 지정
+        query = query.lte("created_at", created_at).or_(
+            f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{archive_id}")'
+        )
+    elif offset:
+        query = query.offset(offset)
+    return query.limit(limit + 1)
+
+
+def _split_page(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+    keyset: bool
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    limit + 1개 결과를 현재 페이지와 next_cursor로 분리
+
+    Returns:
+        (현재 페이지 행, 다음 페이지 커서 또는 None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _next_page_cursor(rows, offset, cursor, keyset)
+
+
+def _next_page_cursor(
+    rows: List[Dict[str, Any]],
+    offset: int,
+    cursor: Optional[str],
+    keyset: bool
+) -> str:
+    """현재 페이지 마지막 행 다음을 가리키는 커서"""
+    if keyset:
+        last = rows[-1]
+        return _encode_cursor({"c": last["created_at"], "i": last["id"]})
+
+    position = _decode_cursor(cursor) if cursor else None
+    start = position.get("o", 0) if position else offset
+    return _encode_cursor({"o": start + len(rows)})
+
+
+def _cut_point(text: str, limit: int) -> int:
+    """limit 이하에서 자를 위치 (HTML 태그 중간은 피하고, 가능하면 줄 경계)"""
+    if len(text) <= limit:
+        return len(text)
+    window = text[:limit]
+    tag_start = window.rfind("<")
+    if tag_start > window.rfind(">") and tag_start > 0:
+        return tag_start
+    newline = window.rfind("\n", limit - limit // 10)
+    return newline + 1 if newline > 0 else limit
+
+
+def _clip_content(archive: Dict[str, Any], max_chars: int) -> Dict[str, Any]:
+    """본문이 max_chars를 넘으면 잘라내고 이어보기 위치(next_offset)를 추가"""
+    content = archive.get("content")
+    if not content or len(content) <= max_chars:
+        return archive
+    end = _cut_point(content, max(max_chars, 0))
+    return {
+        **archive,
+        "content": content[:end],
+        "content_truncated": True,
+        "content_length": len(content),
+        "next_offset": end
+    }
+
+
+def _clip_contents(archives: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """여러 행의 본문을 CHARACTER_LIMIT 안에서 균등하게 자름 (절반은 나머지 필드 몫)"""
+    if not any(archive.get("content") for archive in archives):
+        return archives
+    share = CHARACTER_LIMIT // (2 * len(archives))
+    return [_clip_content(archive, share) for archive in archives]
+
+
+def _fit_archive(archive: Dict[str, Any], render) -> str:
+    """render(archive) 결과가 CHARACTER_LIMIT 이하가 되도록 본문을 잘라서 렌더링"""
+    output = render(archive)
+    if len(output) <= CHARACTER_LIMIT or not archive.get("content"):
+        return output
+    budget = CHARACTER_LIMIT - len(render({**archive, "content": ""}))
+    for _ in range(4):
+        output = render(_clip_content(archive, budget))
+        if len(output) <= CHARACTER_LIMIT:
+            break
+        # JSON 이스케이프 등으로 늘어난 만큼 다시 줄임
+        budget -= len(output) - CHARACTER_LIMIT
+    return output
+
+
+def _fit_page(
+    archives: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    render,
+    offset: int,
+    cursor: Optional[str],
+    keyset: bool
+) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+    """
+    render(행, next_cursor, 잘림 여부) 결과가 CHARACTER_LIMIT를 넘으면
+    뒤쪽 행을 덜어내고 next_cursor를 남은 마지막 행 기준으로 다시 계산
+
+    Returns:
+        (행, next_cursor, 잘림 여부)
+    """
+    if len(archives) <= 1 or len(render(archives, next_cursor, False)) <= CHARACTER_LIMIT:
+        return archives, next_cursor, False
+
+    def fits(count: int) -> bool:
+        rows = archives[:count]
+        return len(render(rows, _next_page_cursor(rows, offset, cursor, keyset), True)) <= CHARACTER_LIMIT
+
+    low, high = 1, len(archives) - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    rows = archives[:low]
+    return rows, _next_page_cursor(rows, offset, cursor, keyset), True
+
+
+_SECTION_HEADING_PATTERN = re.compile(r"<h([1-3])\b[^>]*>(.*?)</h\1\s*>", re.IGNORECASE | re.DOTALL)
+_MARKDOWN_HEADING_PATTERN = re.compile(r"^(#{1,3}) +(.+)$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=64)
+def _content_sections(content: str, content_format: ContentFormat) -> Tuple[Tuple[int, str], ...]:
+    """h1~h3 제목 위치로 본문 섹션 목록 생성 ((시작 위치, 제목), ...) - 텍스트 형식은 섹션 없음"""
+    sections: List[Tuple[int, str]] = []
+    if content_format == ContentFormat.HTML:
+        for match in _SECTION_HEADING_PATTERN.finditer(content):
+            title = " ".join(_strip_html(match.group(2)).split())
+            sections.append((match.start(), title))
+    elif content_format == ContentFormat.MARKDOWN:
+        for match in _MARKDOWN_HEADING_PATTERN.finditer(content):
+            sections.append((match.start(), match.group(2).strip()))
+    if not sections or sections[0][0] > 0:
+        sections.insert(0, (0, ""))  # 첫 제목 앞부분
+    return tuple(sections)
+
+
+_HANGUL_PATTERN = re.compile(r"[\u3131-\u318e\uac00-\ud7a3]")
+
+# 검색 방식별 Postgres 함수 (supabase/migrations 참고)
+_SEARCH_RPC_FUNCTIONS = {
+    SearchMode.FULLTEXT: "search_archive_items",
+    SearchMode.TRIGRAM: "search_archive_items_trgm",
+}
+
+
+def _resolve_search_mode(mode: SearchMode, query: str) -> SearchMode:
+    """
+    auto 검색 방식을 실제 방식으로 변환
+
+    'english' tsvector는 한국어를 토큰화하지 못하므로 한글이 포함된
+    검색어는 trigram 인덱스 검색을 사용합니다.
+    """
+    if mode != SearchMode.AUTO:
+        return mode
+    if _HANGUL_PATTERN.search(query):
+        return SearchMode.TRIGRAM
+    return SearchMode.FULLTEXT
+
+
+def _truncation_notice(count: int) -> str:
+    return f"> ⚠️ 응답 크기 제한({CHARACTER_LIMIT:,}자)으로 {count}개만 표시했습니다. 아래 커서로 이어서 조회하세요."
+
+
+def _format_search_markdown(
+    query: str,
+    archives: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    truncated: bool
+) -> str:
+    lines = [f"# 검색 결과: '{query}'", ""]
+    lines.append(f"총 {len(archives)}개 결과")
+    lines.append("")
+
+    for i, archive in enumerate(archives, 1):
+        lines.append(f"## {i}. {archive['title']}")
+        lines.append(f"**ID**: `{archive['id']}`")
+        lines.append(f"**카테고리**: {archive['category']}")
+        if archive.get('sub_category'):
+            lines.append(f"**분야**: {archive['sub_category']}")
+        if archive.get('description'):
+            lines.append(f"**설명**: {archive['description']}")
+        if archive.get('tags'):
+            tags_str = ", ".join([f"`{tag}`" for tag in archive['tags']])
+            lines.append(f"**태그**: {tags_str}")
+        if archive.get('technologies'):
+            tech_str = ", ".join([f"`{tech}`" for tech in archive['technologies']])
+            lines.append(f"**기술**: {tech_str}")
+        lines.append("")
+
+    if truncated:
+        lines.append(_truncation_notice(len(archives)))
+    if next_cursor:
+        lines.append(f"**다음 페이지**: `cursor=\"{next_cursor}\"`")
+
+    return "\n".join(lines)
+
+
+def _format_list_markdown(
+    archives: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    truncated: bool
+) -> str:
+    lines = ["# 📚 아카이브 목록", ""]
+    lines.append(f"총 {len(archives)}개")
+    lines.append("")
+
+    for i, archive in enumerate(archives, 1):
+        lines.append(f"## {i}. {archive['title']}")
+        lines.append(f"**ID**: `{archive['id']}`")
+        lines.append(f"**카테고리**: {archive['category']}")
+        if archive.get('tags'):
+            lines.append(f"**태그**: {', '.join([f'`{t}`' for t in archive['tags']])}")
+        lines.append("")
+
+    if truncated:
+        lines.append(_truncation_notice(len(archives)))
+    if next_cursor:
+        lines.append(f"**다음 페이지**: `cursor=\"{next_cursor}\"`")
+
+    return "\n".join(lines)
+
+
+def _format_archive_markdown(archive: Dict[str, Any], content_format: ContentFormat) -> str:
+    lines = [f"# {archive['title']}", ""]
+    lines.append(f"**카테고리**: {archive['category']}")
+    if archive.get('sub_category'):
+        lines.append(f"**분야**: {archive['sub_category']}")
+    if archive.get('description'):
+        lines.append(f"**설명**: {archive['description']}")
+    if archive.get('tags'):
+        tags_str = ", ".join([f"`{tag}`" for tag in archive['tags']])
+        lines.append(f"**태그**: {tags_str}")
+    if archive.get('technologies'):
+        tech_str = ", ".join([f"`{tech}`" for tech in archive['technologies']])
+        lines.append(f"**기술**: {tech_str}")
+    lines.append("")
+    lines.append("---")
+    lines.append("")
+    if archive.get('content'):
+        lines.append(archive['content'])
+    if archive.get('content_truncated'):
+        lines.append("")
+        lines.append("---")
+        lines.append(
+            f"> ⚠️ 본문이 길어서 {archive['next_offset']:,}/{archive['content_length']:,}자까지만 표시했습니다. "
+            f"나머지는 `archive_get_archive_content(archive_id=\"{archive['id']}\", "
+            f"offset={archive['next_offset']}"
+            + (f", content_format=\"{content_format.value}\"" if content_format != ContentFormat.MARKDOWN else "")
+            + ")`로 조회하세요."
+        )
+
+    return "\n".join(lines)
+
+
+def _handle_error(e: Exception) -> str:
+    if isinstance(e, RuntimeError):
+        return f"Error: {str(e)}"
+    return f"Error: {type(e).__name__} - {str(e)}"
+
+
+async def _call_openai_with_retry(prompt: str, max_tokens: int = 1000) -> str:
+    _check_openai()
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = await openai_client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant for a technical archive platform."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.7
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            if attempt < MAX_RETRIES - 1:
+                await asyncio.sleep(3 * (attempt + 1))
+                continue
+            else:
+                raise e
+
+
+# ============================================================================
+# TOOLS
+# ============================================================================
+
+@mcp.tool(
+    name="archive_search_archives",
+    annotations={
+        "title": "Search Archives",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_search_archives(params: SearchArchivesInput) -> str:
+    """
+    Light Archive 데이터베이스에서 아카이브를 검색합니다.
+
+    테이블: archive_items
+    검색 대상: title, description, content
+
+    검색 방식:
+    - auto (기본): 한글 검색어는 trigram, 그 외 fulltext
+    - fulltext: search_archive_items RPC, tsvector GIN 인덱스, 관련도(ts_rank) 순
+    - trigram: search_archive_items_trgm RPC, pg_trgm GIN 인덱스, 최신순
+    - ilike: 인덱스 없는 부분 문자열 검색, 최신순
+    """
+    try:
+        _check_supabase()
+
+        mode = _resolve_search_mode(params.mode, params.query)
+        columns = _select_columns(
+            params.fields,
+            params.include_content,
+            (SEARCH_MARKDOWN_FIELDS if params.response_format == ResponseFormat.MARKDOWN else []) + ["created_at"]
+        )
+        # 관련도 순(fulltext)을 제외하면 (created_at, id) 커서 사용
+        keyset = mode != SearchMode.FULLTEXT
+
+        replica = await _use_local_replica()
+        if replica is not None:
+            rows = await replica.search(
+                columns.split(","), params.query, mode,
+                params.category.value if params.category else None,
+                params.limit, params.offset, params.cursor
+            )
+        elif mode in _SEARCH_RPC_FUNCTIONS:
+            query = _archive_rpc(_SEARCH_RPC_FUNCTIONS[mode], {
+                "search_query": params.query,
+                "category_filter": params.category.value if params.category else None
+            }).select(columns)
+            if keyset:
+                query = query.order("created_at", desc=True).order("id", desc=True)
+            # fulltext는 ts_rank 정렬이 함수 내부에서 처리되므로 order를 추가하지 않음
+            query = _apply_page(query, params.limit, params.offset, params.cursor, keyset)
+        else:
+            query = _archive_table().select(columns)
+
+            # 카테고리 필터
+            if params.category:
+                query = query.eq("category", params.category.value)
+
+            # Published 상태만 (기본)
+            query = query.eq("status", "published")
+
+            # 텍스트 검색
+            search_term = f"%{params.query}%"
+            query = query.or_(f"title.ilike.{search_term},description.ilike.{search_term},content.ilike.{search_term}")
+
+            # 페이지네이션 및 정렬
+            query = query.order("created_at", desc=True).order("id", desc=True)
+            query = _apply_page(query, params.limit, params.offset, params.cursor, keyset)
+
+        if replica is None:
+            response = await _execute(query)
+            rows = response.data
+
+        archives, next_cursor = _split_page(rows, params.limit, params.offset, params.cursor, keyset)
+
+        if not archives:
+            return f"검색 결과가 없습니다: '{params.query}'"
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            def render(rows, cursor, truncated):
+                return _format_search_markdown(params.query, rows, cursor, truncated)
+        else:
+            def render(rows, cursor, truncated):
+                result = {"query": params.query, "mode": mode.value, "archives": rows, "next_cursor": cursor}
+                if truncated:
+                    result["truncated"] = True
+                return json.dumps(result, ensure_ascii=False, indent=2)
+
+        archives, next_cursor, truncated = _fit_page(
+            _clip_contents(archives), next_cursor, render, params.offset, params.cursor, keyset
+        )
+        return render(archives, next_cursor, truncated)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
+@mcp.tool(
+    name="archive_get_archive",
+    annotations={
+        "title": "Get Archive Details",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_get_archive(params: GetArchiveInput) -> str:
+    """특정 아카이브의 상세 정보를 조회합니다."""
     try:
         _check_supabase()
 
-        # 검색 쿼리 구성
-        query = supabase.table("archive_items").select("*")
-
-        # 카테고리 필터
-        if params.category:
-            query = query.eq("category", params.category.value)
-
-        # Published 상태만 (기본)
-        query = query.eq("status", "published")
-
-        # 텍스트 검색
-        search_term = f"%{params.query}%"
-        query = query.or_(f"title.ilike.{search_term},description.ilike.{search_term},content.ilike.{search_term}")
-
-        # 페이지네이션 및 정렬
-        query = query.range(params.offset, params.offset + params.limit - 1)
-        query = query.order("created_at", desc=True)
+        replica = await _use_local_replica()
+        if replica is not None:
+            archive = await replica.get(params.archive_id)
+        else:
+            archive = await _fetch_archive(params.archive_id)
 
-        response = query.execute()
-        archives = response.data
+        if archive is None:
+            return f"Error: Archive '{params.archive_id}' not found"
 
-        if not archives:
-            return f"검색 결과가 없습니다: '{params.query}'"
+        content_format = _content_format_for(params.content_format, params.response_format)
+        archive = {**archive, "content": _rendered_content.render(archive, content_format)}
 
-        # Markdown 포맷
         if params.response_format == ResponseFormat.MARKDOWN:
-            lines = [f"# 검색 결과: '{params.query}'", ""]
-            lines.append(f"총 {len(archives)}개 결과")
-            lines.append("")
-
-            for i, archive in enumerate(archives, 1):
-                lines.append(f"## {i}. {archive['title']}")
-                lines.append(f"**ID**: `{archive['id']}`")
-                lines.append(f"**카테고리**: {archive['category']}")
-                if archive.get('sub_category'):
-                    lines.append(f"**분야**: {archive['sub_category']}")
-                if archive.get('description'):
-                    lines.append(f"**설명**: {archive['description']}")
-                if archive.get('tags'):
-                    tags_str = ", ".join([f"`{tag}`" for tag in archive['tags']])
-                    lines.append(f"**태그**: {tags_str}")
-                if archive.get('technologies'):
-                    tech_str = ", ".join([f"`{tech}`" for tech in archive['technologies']])
-                    lines.append(f"**기술**: {tech_str}")
-                lines.append("")
-
-            return "\n".join(lines)
+            return _fit_archive(archive, lambda row: _format_archive_markdown(row, content_format))
         else:
-            return json.dumps({"query": params.query, "archives": archives}, ensure_ascii=False, indent=2)
+            return _fit_archive(
+                archive,
+                lambda row: json.dumps(row, ensure_ascii=False, indent=2, default=str)
+            )
 
     except Exception as e:
         return _handle_error(e)
 
 
 @mcp.tool(
-    name="archive_get_archive",
+    name="archive_get_archive_content",
     annotations={
-        "title": "Get Archive Details",
+        "title": "Get Archive Content Chunk",
         "readOnlyHint": True,
         "destructiveHint": False,
         "idempotentHint": True,
         "openWorldHint": True
     }
 )
-async def archive_get_archive(params: GetArchiveInput) -> str:
-    """특정 아카이브의 상세 정보를 조회합니다."""
+@_metered
+async def archive_get_archive_content(params: GetArchiveContentInput) -> str:
+    """
+    긴 아카이브 본문을 조각 단위로 조회합니다.
+
+    archive_get_archive 응답이 잘렸을 때 next_offset부터 이어서 읽거나,
+    section 번호(h1~h3 제목 기준)로 원하는 부분만 읽을 때 사용합니다.
+    첫 조각(offset=0)에는 섹션 목록이 포함됩니다.
+    """
     try:
         _check_supabase()
 
-        response = supabase.table("archive_items").select("*").eq("id", params.archive_id).execute()
+        replica = await _use_local_replica()
+        if replica is not None:
+            archive = await replica.get(params.archive_id)
+        else:
+            archive = await _fetch_archive(params.archive_id)
 
-        if not response.data:
+        if archive is None:
             return f"Error: Archive '{params.archive_id}' not found"
 
-        archive = response.data[0]
+        content_format = _content_format_for(params.content_format, params.response_format)
+        content = _rendered_content.render(archive, content_format)
+        sections = _content_sections(content, content_format)
+        section_starts = [start for start, _ in sections]
+
+        if params.section is not None:
+            if params.section >= len(sections):
+                return f"Error: Section {params.section} not found (0-{len(sections) - 1})"
+            start = sections[params.section][0]
+            stop = section_starts[params.section + 1] if params.section + 1 < len(sections) else len(content)
+        else:
+            start = min(params.offset, len(content))
+            stop = len(content)
+        end = start + _cut_point(content[start:stop], params.length)
+        chunk = content[start:end]
+        next_offset = end if end < len(content) else None
+        current_section = bisect.bisect_right(section_starts, start) - 1
+        # 섹션 목록은 첫 조각에만 포함
+        section_list = [
+            {"index": i, "title": title[:80], "offset": offset}
+            for i, (offset, title) in enumerate(sections)
+        ] if start == 0 and params.section is None else None
 
         if params.response_format == ResponseFormat.MARKDOWN:
-            lines = [f"# {archive['title']}", ""]
-            lines.append(f"**카테고리**: {archive['category']}")
-            if archive.get('sub_category'):
-                lines.append(f"**분야**: {archive['sub_category']}")
-            if archive.get('description'):
-                lines.append(f"**설명**: {archive['description']}")
-            if archive.get('tags'):
-                tags_str = ", ".join([f"`{tag}`" for tag in archive['tags']])
-                lines.append(f"**태그**: {tags_str}")
-            if archive.get('technologies'):
-                tech_str = ", ".join([f"`{tech}`" for tech in archive['technologies']])
-                lines.append(f"**기술**: {tech_str}")
+            lines = [f"# {archive['title']} (본문 {start:,}–{end:,} / {len(content):,}자)", ""]
+            if section_list and len(section_list) > 1:
+                lines.append("## 섹션 목록")
+                for item in section_list[:50]:
+                    lines.append(f"- {item['index']}. {item['title'] or '(머리말)'} (offset {item['offset']:,})")
+                if len(section_list) > 50:
+                    lines.append(f"- ... 외 {len(section_list) - 50}개")
+                lines.append("")
+            lines.append(f"**현재 섹션**: {current_section}. {sections[current_section][1] or '(머리말)'}")
             lines.append("")
             lines.append("---")
             lines.append("")
-            if archive.get('content'):
-                lines.append(archive['content'])
-
+            lines.append(chunk)
+            if next_offset is not None:
+                lines.append("")
+                lines.append("---")
+                lines.append(
+                    f"> 다음 조각: `archive_get_archive_content(archive_id=\"{params.archive_id}\", "
+                    f"offset={next_offset}"
+                    + (f", content_format=\"{content_format.value}\"" if params.content_format else "")
+                    + ")`"
+                )
             return "\n".join(lines)
         else:
-            return json.dumps(archive, ensure_ascii=False, indent=2, default=str)
+            result = {
+                "archive_id": params.archive_id,
+                "title": archive.get("title"),
+                "offset": start,
+                "next_offset": next_offset,
+                "content_format": content_format.value,
+                "content_length": len(content),
+                "section": current_section,
+                "content": chunk
+            }
+            if section_list is not None:
+                result["sections"] = section_list
+            return json.dumps(result, ensure_ascii=False, indent=2)
 
     except Exception as e:
         return _handle_error(e)
@@ -519,6 +4207,7 @@ async def archive_get_archive(params: GetArchiveInput) -> str:
         "openWorldHint": True
     }
 )
+@_metered
 async def archive_create_archive(params: CreateArchiveInput) -> str:
     """
     새 아카이브를 생성합니다.
@@ -536,43 +4225,15 @@ async def archive_create_archive(params: CreateArchiveInput) -> str:
         # ID 자동 생성 (Next.js 앱과 동일한 패턴)
         archive_id = _generate_archive_id()
 
-        # 현재 시간 (ISO 8601 형식)
-        now = datetime.utcnow().isoformat()
-
-        archive_data = {
-            "id": archive_id,
-            "title": params.title,
-            "content": params.content,
-            "category": params.category.value,
-            "description": params.description,
-            "tags": params.tags,
-            "technologies": params.technologies,
-            "status": "draft",
-            "view_count": 0,
-            "comment_count": 0,
-            "created_at": now,
-            "updated_at": now,
-            "published_at": now  # 날짜 자동 설정 (Next.js 앱과 동일)
-        }
-
-        # 선택적 필드
-        if params.sub_category:
-            archive_data["sub_category"] = params.sub_category
-        if params.excerpt:
-            archive_data["excerpt"] = params.excerpt
-        if params.author:
-            archive_data["author"] = params.author
-        if params.difficulty:
-            archive_data["difficulty"] = params.difficulty
-        if params.thumbnail_url:
-            archive_data["thumbnail_url"] = params.thumbnail_url
+        archive_data = _build_archive_row(params, archive_id, datetime.utcnow().isoformat())
 
-        response = supabase.table("archive_items").insert(archive_data).execute()
+        response = await _execute(_archive_table().insert(archive_data))
 
         if not response.data:
             return "Error: Failed to create archive"
 
         new_archive = response.data[0]
+        await _after_write(response.data)
 
         # HTML 구조화된 응답 (4-5줄 결론 요약 포함)
         created_date = datetime.fromisoformat(new_archive['created_at'].replace('Z', '+00:00'))
@@ -641,36 +4302,22 @@ async def archive_create_archive(params: CreateArchiveInput) -> str:
         "openWorldHint": True
     }
 )
+@_metered
 async def archive_update_archive(params: UpdateArchiveInput) -> str:
     """아카이브를 수정합니다."""
     try:
         _check_supabase()
 
-        update_data = {"updated_at": datetime.utcnow().isoformat()}
-
-        if params.title:
-            update_data["title"] = params.title
-        if params.content:
-            update_data["content"] = params.content
-        if params.description:
-            update_data["description"] = params.description
-        if params.excerpt:
-            update_data["excerpt"] = params.excerpt
-        if params.category:
-            update_data["category"] = params.category.value
-        if params.sub_category:
-            update_data["sub_category"] = params.sub_category
-        if params.tags:
-            update_data["tags"] = params.tags
-        if params.technologies:
-            update_data["technologies"] = params.technologies
-        if params.difficulty:
-            update_data["difficulty"] = params.difficulty
-
-        if len(update_data) == 1:
+        update_data = _build_update_fields(params)
+
+        if not update_data:
             return "변경할 내용이 없습니다."
 
-        supabase.table("archive_items").update(update_data).eq("id", params.archive_id).execute()
+        update_data["updated_at"] = datetime.utcnow().isoformat()
+
+        response = await _execute(_archive_table().update(update_data).eq("id", params.archive_id))
+        _archive_cache.invalidate(params.archive_id)
+        await _after_write(response.data or [])
 
         return f"# ✅ 아카이브 수정 완료\n\n**ID**: `{params.archive_id}`"
 
@@ -678,6 +4325,321 @@ async def archive_update_archive(params: UpdateArchiveInput) -> str:
         return _handle_error(e)
 
 
+@mcp.tool(
+    name="archive_bulk_create",
+    annotations={
+        "title": "Bulk Create Archives",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_bulk_create(params: BulkCreateArchivesInput) -> str:
+    """
+    여러 아카이브를 한 번에 생성합니다. (최대 1000개)
+
+    모든 항목을 먼저 검증한 뒤, 유효한 항목만 묶어서 여러 행 삽입 요청으로 저장합니다.
+    각 항목의 형식과 자동 생성 규칙은 archive_create_archive와 같습니다.
+    """
+    try:
+        _check_supabase()
+
+        results: List[Dict[str, Any]] = []
+        rows: List[Dict[str, Any]] = []
+        ids: Set[str] = set()
+        now = datetime.utcnow().isoformat()
+
+        # 1. 전체 검증
+        for index, item in enumerate(params.items):
+            try:
+                validated = CreateArchiveInput.model_validate(item)
+            except ValidationError as e:
+                results.append({"index": index, "ok": False, "error": _format_validation_error(e)})
+                continue
+            archive_id = _generate_archive_id()
+            # 같은 밀리초에 생성된 ID의 충돌 방지
+            while archive_id in ids:
+                archive_id = _generate_archive_id()
+            ids.add(archive_id)
+            rows.append(_build_archive_row(validated, archive_id, now))
+            results.append({"index": index, "ok": True, "id": archive_id})
+
+        # 2. 묶음 단위 삽입
+        chunks = _chunked(rows, BULK_CHUNK_SIZE)
+        outcomes: Dict[str, Optional[str]] = {}
+        for partial in await asyncio.gather(*[_insert_rows(chunk) for chunk in chunks]):
+            outcomes.update(partial)
+
+        for result in results:
+            error = outcomes.get(result.get("id")) if result["ok"] else None
+            if error:
+                result["ok"] = False
+                result["error"] = error
+                # 저장되지 않은 ID는 반환하지 않음
+                del result["id"]
+
+        return _format_bulk_report("아카이브 일괄 생성 결과", results, len(chunks), params.response_format)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
+@mcp.tool(
+    name="archive_bulk_update",
+    annotations={
+        "title": "Bulk Update Archives",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_bulk_update(params: BulkUpdateArchivesInput) -> str:
+    """
+    여러 아카이브를 한 번에 수정합니다. (최대 1000개)
+
+    모든 항목을 먼저 검증한 뒤 bulk_update_archive_items RPC로 묶어서 저장합니다.
+    항목마다 수정할 필드가 달라도 되며, 지정하지 않은 필드는 유지됩니다.
+    """
+    try:
+        _check_supabase()
+
+        results: List[Dict[str, Any]] = []
+        items: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+
+        # 1. 전체 검증
+        for index, item in enumerate(params.items):
+            try:
+                validated = UpdateArchiveInput.model_validate(item)
+            except ValidationError as e:
+                results.append({"index": index, "ok": False, "error": _format_validation_error(e)})
+                continue
+            fields = _build_update_fields(validated)
+            if not fields:
+                error = "변경할 내용이 없습니다."
+            elif validated.archive_id in seen:
+                error = f"중복된 archive_id: {validated.archive_id}"
+            else:
+                error = None
+            if error:
+                results.append({"index": index, "ok": False, "id": validated.archive_id, "error": error})
+                continue
+            seen.add(validated.archive_id)
+            items.append({"id": validated.archive_id, **fields})
+            results.append({"index": index, "ok": True, "id": validated.archive_id})
+
+        # 2. 묶음 단위 수정
+        chunks = _chunked(items, BULK_CHUNK_SIZE)
+        outcomes: Dict[str, Optional[str]] = {}
+        for partial in await asyncio.gather(*[_bulk_update_rows(chunk) for chunk in chunks]):
+            outcomes.update(partial)
+
+        for result in results:
+            error = outcomes.get(result["id"]) if result["ok"] else None
+            if error:
+                result["ok"] = False
+                result["error"] = error
+
+        return _format_bulk_report("아카이브 일괄 수정 결과", results, len(chunks), params.response_format)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
+@mcp.tool(
+    name="archive_export_archives",
+    annotations={
+        "title": "Export Archives to NDJSON",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_export_archives(params: ExportArchivesInput, ctx: Context) -> str:
+    """
+    전체 아카이브를 NDJSON 파일로 내보냅니다. (백업/분석용)
+
+    한 줄에 한 행(JSON)씩 기록하며, 행 수와 관계없이 일정한 메모리로 동작합니다.
+    `.gz`/`.zst` 확장자는 자동으로 압축됩니다. 진행 상황은 MCP progress로 보고됩니다.
+    """
+    try:
+        async def report(rows: int, total: Optional[int], elapsed: float) -> None:
+            await ctx.report_progress(rows, total)
+
+        result = await _export_archives(
+            params.output_path,
+            compression=params.compression,
+            status=params.status.value if params.status else None,
+            category=params.category.value if params.category else None,
+            columns=_select_columns(params.fields) if params.fields else "*",
+            overwrite=params.overwrite,
+            on_progress=report
+        )
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            return _format_export_result(result)
+        return json.dumps(result, ensure_ascii=False, indent=2)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
+@mcp.tool(
+    name="archive_import_archives",
+    annotations={
+        "title": "Import Archives from NDJSON",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_import_archives(params: ImportArchivesInput, ctx: Context) -> str:
+    """
+    NDJSON 파일의 아카이브를 일괄로 가져옵니다. (archive_export_archives 파일 재적재 가능)
+
+    각 줄은 archive_items 테이블 제약(카테고리 CHECK 값 등)으로 검증되며, 통과한 행은 id 기준으로 upsert됩니다.
+    id가 없는 줄은 내용 해시로 ID를 정하므로 restart로 다시 가져와도 행이 중복되지 않습니다.
+    중단되면 같은 파일로 다시 호출해서 체크포인트 이후부터 이어서 가져올 수 있습니다.
+    검증/저장에 실패한 줄은 거부 파일에 사유와 함께 기록됩니다.
+    """
+    try:
+        async def report(line: int, imported: int, rejected: int, elapsed: float) -> None:
+            await ctx.report_progress(imported + rejected)
+
+        result = await _import_archives(
+            params.source_path,
+            batch_size=params.batch_size,
+            concurrency=params.concurrency,
+            checkpoint_path=params.checkpoint_path,
+            rejected_path=params.rejected_path,
+            restart=params.restart,
+            on_progress=report
+        )
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            return _format_import_result(result)
+        return json.dumps(result, ensure_ascii=False, indent=2)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
+@mcp.tool(
+    name="archive_upload_images",
+    annotations={
+        "title": "Upload Images to Supabase Storage",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+@_metered
+async def archive_upload_images(params: UploadImagesInput) -> str:
+    """
+    로컬 이미지 여러 개를 thumbnails 버킷에 동시에 업로드합니다.
+
+    MCP 서버와 같은 컴퓨터의 파일 경로만 사용할 수 있습니다.
+    같은 내용의 파일은 다시 올리지 않고 기존 URL을 반환하며(내용 해시),
+    비슷한 기존 이미지가 있으면 함께 알려줍니다. URL은 입력 순서대로 반환됩니다.
+    """
+    try:
+        _check_supabase()
+
+        started = time.monotonic()
+        results = await _store_images(params.image_paths, params.max_concurrency, params.max_retries)
+        elapsed = time.monotonic() - started
+        failed = [r for r in results if not r["ok"]]
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            lines = [f"# {'✅' if not failed else '⚠️'} 이미지 업로드 결과", ""]
+            lines.append(
+                f"**성공**: {len(results) - len(failed)}개 / **실패**: {len(failed)}개 / **소요 시간**: {elapsed:.2f}초"
+            )
+            lines.append("")
+            for r in results:
+                if r["ok"]:
+                    note = " (이미 있는 파일)" if r["deduplicated"] else ""
+                    lines.append(f"{r['index'] + 1}. {r['url']}{note}")
+                    for item in r["similar"][:3]:
+                        lines.append(f"   - ⚠️ 유사한 이미지가 이미 있습니다: {item['url']} (거리 {item['distance']})")
+                    if r.get("index_error"):
+                        lines.append(f"   - ⚠️ 유사 이미지 색인 실패 (업로드는 완료): {r['index_error']}")
+                else:
+                    lines.append(f"{r['index'] + 1}. ❌ `{r['image_path']}`: {r['error']}")
+            return "\n".join(lines)
+        else:
+            return json.dumps({
+                "urls": [r.get("url") for r in results],
+                "results": results,
+                "elapsed_seconds": round(elapsed, 3)
+            }, ensure_ascii=False, indent=2)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
+@mcp.tool(
+    name="archive_find_similar_images",
+    annotations={
+        "title": "Find Similar Uploaded Images",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+@_metered
+async def archive_find_similar_images(params: FindSimilarImagesInput) -> str:
+    """
+    이미지를 올리기 전에 비슷한 이미지가 이미 버킷에 있는지 확인합니다.
+
+    크기 변경/재압축된 스크린샷도 찾을 수 있습니다 (dHash 해밍 거리).
+    색인은 로컬 파일이며 `index-images` CLI로 버킷 전체를 색인할 수 있습니다.
+    """
+    try:
+        _check_supabase()
+
+        if not os.path.exists(params.image_path):
+            return f"Error: 이미지 파일을 찾을 수 없습니다: {params.image_path}"
+
+        image_hash = await _run_image_task(_safe_dhash, params.image_path)
+        if image_hash is None:
+            return f"Error: 이미지를 열 수 없습니다: {params.image_path}"
+
+        started = time.perf_counter()
+        similar = _find_similar_images(image_hash, params.max_distance, params.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            if not similar:
+                return f"유사한 이미지가 없습니다. (색인 {len(_image_hash_index):,}개, {elapsed_ms:.1f}ms)"
+            lines = ["# 🖼️ 유사한 이미지가 이미 있습니다", ""]
+            for item in similar:
+                lines.append(f"- {item['url']} (거리 {item['distance']})")
+            lines.append("")
+            lines.append(f"색인 {len(_image_hash_index):,}개 검색, {elapsed_ms:.1f}ms")
+            return "\n".join(lines)
+        else:
+            return json.dumps({
+                "hash": f"{image_hash:016x}",
+                "similar": similar,
+                "indexed": len(_image_hash_index),
+                "elapsed_ms": round(elapsed_ms, 3)
+            }, ensure_ascii=False, indent=2)
+
+    except Exception as e:
+        return _handle_error(e)
+
+
 # ============================================================================
 # AI 도구 제거 - Claude가 직접 작성하므로 불필요
 # archive_generate_draft, archive_generate_summary, archive_suggest_tags
@@ -738,46 +4700,35 @@ async def archive_update_archive(params: UpdateArchiveInput) -> str:
         "openWorldHint": True
     }
 )
+@_metered
 async def archive_find_related(params: FindRelatedInput) -> str:
     """유사 아카이브를 찾습니다."""
     try:
         _check_supabase()
 
-        # 기준 아카이브 조회
-        base_response = supabase.table("archive_items").select("*").eq("id", params.archive_id).execute()
-        if not base_response.data:
-            return f"Error: Archive '{params.archive_id}' not found"
-
-        base_archive = base_response.data[0]
-        base_tags = set(base_archive.get('tags', []))
-        base_tech = set(base_archive.get('technologies', []))
-
-        # 모든 published 아카이브 조회
-        all_response = supabase.table("archive_items").select("*").eq("status", "published").neq("id", params.archive_id).execute()
-        all_archives = all_response.data
-
-        # 유사도 계산
-        scored = []
-        for archive in all_archives:
-            score = 0
-
-            if archive['category'] == base_archive['category']:
-                score += 30
+        columns = _select_columns(params.fields, params.include_content, RELATED_SCORING_FIELDS)
+        column_list = columns.split(",")
 
-            archive_tags = set(archive.get('tags', []))
-            archive_tech = set(archive.get('technologies', []))
-
-            tag_matches = len(base_tags & archive_tags)
-            score += tag_matches * 10
-
-            tech_matches = len(base_tech & archive_tech)
-            score += tech_matches * 5
+        replica = await _use_local_replica()
+        if replica is not None:
+            base_archive, related = await replica.related(params.archive_id, params.limit, column_list)
+        elif RELATED_STRATEGY == "rpc":
+            base_archive, related = await _find_related_rpc(params.archive_id, params.limit, columns)
+        else:
+            base_archive, related = await _find_related_indexed(params.archive_id, params.limit, columns)
 
-            if score > 0:
-                scored.append({"archive": archive, "score": score})
+        if base_archive is None:
+            return f"Error: Archive '{params.archive_id}' not found"
 
-        scored.sort(key=lambda x: x['score'], reverse=True)
-        related = scored[:params.limit]
+        base_archive = {column: base_archive.get(column) for column in column_list}
+        related = [
+            {"archive": {column: item["archive"].get(column) for column in column_list}, "score": item["score"]}
+            for item in related
+        ]
+        # 기준 + 유사 항목 본문을 응답 크기 제한 안에서 나눠서 표시
+        clipped = _clip_contents([base_archive] + [item["archive"] for item in related])
+        base_archive = clipped[0]
+        related = [{"archive": archive, "score": item["score"]} for archive, item in zip(clipped[1:], related)]
 
         if not related:
             return f"'{base_archive['title']}'와 유사한 아카이브를 찾을 수 없습니다."
@@ -814,40 +4765,181 @@ async def archive_find_related(params: FindRelatedInput) -> str:
         "openWorldHint": True
     }
 )
+@_metered
 async def archive_list_archives(params: ListArchivesInput) -> str:
     """아카이브 목록을 조회합니다."""
     try:
         _check_supabase()
 
-        query = supabase.table("archive_items").select("*")
+        columns = _select_columns(
+            params.fields,
+            params.include_content,
+            (LIST_MARKDOWN_FIELDS if params.response_format == ResponseFormat.MARKDOWN else []) + ["created_at"]
+        )
+        replica = await _use_local_replica()
+        if replica is not None:
+            rows = await replica.list(
+                columns.split(","),
+                params.category.value if params.category else None,
+                params.status.value if params.status else None,
+                params.limit, params.offset, params.cursor
+            )
+        elif params.cursor:
+            # 다음 페이지는 (created_at, id) 행 비교 RPC로 조회 (008, 깊이와 관계없이 일정 비용)
+            position = _decode_cursor(params.cursor)
+            if "c" not in position or "i" not in position:
+                raise RuntimeError(f"Invalid cursor: {params.cursor}")
+            query = _archive_rpc("list_archive_items_page", {
+                "cursor_created_at": position["c"],
+                "cursor_id": position["i"],
+                "status_filter": params.status.value if params.status else None,
+                "category_filter": params.category.value if params.category else None,
+                "page_size": params.limit + 1
+            }).select(columns).order("created_at", desc=True).order("id", desc=True)
+        else:
+            query = _archive_table().select(columns)
+
+            if params.category:
+                query = query.eq("category", params.category.value)
+            if params.status:
+                query = query.eq("status", params.status.value)
+
+            query = query.order("created_at", desc=True).order("id", desc=True)
+            query = _apply_page(query, params.limit, params.offset, params.cursor, keyset=True)
+
+        if replica is None:
+            response = await _execute(query)
+            rows = response.data
+
+        archives, next_cursor = _split_page(rows, params.limit, params.offset, params.cursor, keyset=True)
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            render = _format_list_markdown
+        else:
+            def render(rows, cursor, truncated):
+                result = {"archives": rows, "next_cursor": cursor}
+                if truncated:
+                    result["truncated"] = True
+                return json.dumps(result, ensure_ascii=False, indent=2, default=str)
+
+        archives, next_cursor, truncated = _fit_page(
+            _clip_contents(archives), next_cursor, render, params.offset, params.cursor, keyset=True
+        )
+        return render(archives, next_cursor, truncated)
 
-        if params.category:
-            query = query.eq("category", params.category.value)
-        if params.status:
-            query = query.eq("status", params.status.value)
+    except Exception as e:
+        return _handle_error(e)
 
-        query = query.range(params.offset, params.offset + params.limit - 1)
-        query = query.order("created_at", desc=True)
 
-        response = query.execute()
-        archives = response.data
+@mcp.tool(
+    name="archive_cache_stats",
+    annotations={
+        "title": "Archive Cache Stats",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False
+    }
+)
+@_metered
+async def archive_cache_stats(params: CacheStatsInput) -> str:
+    """archive_get_archive 캐시와 본문 변환 캐시의 적중/미스/제거 통계를 조회합니다."""
+    try:
+        stats = _archive_cache.stats()
+        stats["rendering"] = _rendered_content.stats()
 
         if params.response_format == ResponseFormat.MARKDOWN:
-            lines = ["# 📚 아카이브 목록", ""]
-            lines.append(f"총 {len(archives)}개")
+            lines = ["# 🗄️ 캐시 통계", ""]
+            lines.append(f"**상태**: {'활성' if stats['enabled'] else '비활성'}")
+            lines.append(f"**크기**: {stats['size']} / {stats['max_entries']}")
+            lines.append(f"**TTL**: {stats['ttl_seconds']}초")
+            lines.append(f"**적중**: {stats['hits']} (재검증 {stats['revalidations']})")
+            lines.append(f"**미스**: {stats['misses']}")
+            lines.append(f"**제거 (LRU)**: {stats['evictions']}")
+            lines.append(f"**무효화**: {stats['invalidations']}")
+            lines.append(f"**적중률**: {stats['hit_ratio'] * 100:.1f}%")
+            rendering = stats["rendering"]
             lines.append("")
+            lines.append("## 본문 변환 (HTML → Markdown/텍스트)")
+            lines.append(f"**크기**: {rendering['size']} / {rendering['max_entries']}")
+            lines.append(f"**적중**: {rendering['hits']} / **변환**: {rendering['conversions']}")
+            lines.append(
+                f"**문자 수**: {rendering['html_chars']:,} → {rendering['rendered_chars']:,} "
+                f"({rendering['reduction_ratio'] * 100:.1f}% 감소)"
+            )
+            return "\n".join(lines)
+        else:
+            return json.dumps(stats, ensure_ascii=False, indent=2)
+
+    except Exception as e:
+        return _handle_error(e)
 
-            for i, archive in enumerate(archives, 1):
-                lines.append(f"## {i}. {archive['title']}")
-                lines.append(f"**ID**: `{archive['id']}`")
-                lines.append(f"**카테고리**: {archive['category']}")
-                if archive.get('tags'):
-                    lines.append(f"**태그**: {', '.join([f'`{t}`' for t in archive['tags']])}")
-                lines.append("")
 
+@mcp.tool(
+    name="archive_server_stats",
+    annotations={
+        "title": "Archive Server Stats",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False
+    }
+)
+@_metered
+async def archive_server_stats(params: ServerStatsInput) -> str:
+    """
+    도구별 지연 시간, 응답 문자 수, 가져온 행/바이트, DB/Storage 왕복 수와
+    Supabase 요청 통계를 조회합니다. 느린 도구 호출의 원인을 찾을 때 사용합니다.
+    """
+    try:
+        stats = _server_metrics.snapshot(params.tool)
+        if params.reset:
+            _server_metrics.reset()
+            _write_prometheus_file(force=True)
+
+        if params.response_format == ResponseFormat.MARKDOWN:
+            lines = ["# 📈 서버 지표", ""]
+            lines.append(f"**집계 시작**: {stats['since']} ({stats['uptime_seconds']:,.0f}초)")
+            if params.reset:
+                lines.append("**초기화**: 조회 후 누적 지표를 초기화했습니다")
+            lines.append("")
+            lines.append("## 도구 (호출당 평균)")
+            if stats["tools"]:
+                lines.append("| 도구 | 호출 | 오류 | p50 | p95 | 최대 | 응답 문자 | 행 (최대) | 받은 KB | DB 왕복 | Storage 왕복 |")
+                lines.append("|------|------|------|-----|-----|------|-----------|-----------|---------|---------|--------------|")
+                ordered = sorted(
+                    stats["tools"].items(),
+                    key=lambda item: item[1]["latency"]["mean_ms"] * item[1]["calls"],
+                    reverse=True
+                )
+                for name, tool in ordered:
+                    latency = tool["latency"]
+                    lines.append(
+                        f"| {name} | {tool['calls']} | {tool['errors']} | {latency['p50_ms']:.1f}ms | "
+                        f"{latency['p95_ms']:.1f}ms | {latency['max_ms']:.1f}ms | {tool['avg_response_chars']:,} | "
+                        f"{tool['avg_rows']:,} ({tool['max_rows']:,}) | {tool['avg_bytes'] / 1024:,.1f} | "
+                        f"{tool['avg_db_round_trips']} | {tool['avg_storage_round_trips']} |"
+                    )
+            else:
+                lines.append("기록된 도구 호출이 없습니다.")
+
+            if stats["supabase_requests"]:
+                lines.append("")
+                lines.append("## Supabase 요청 (백그라운드 동기화 포함)")
+                lines.append("| 종류 | 요청 | 오류 | p50 | p95 | 최대 | 받은 MB |")
+                lines.append("|------|------|------|-----|-----|------|---------|")
+                for kind, request in sorted(stats["supabase_requests"].items()):
+                    latency = request["latency"]
+                    lines.append(
+                        f"| {kind} | {request['count']:,} | {request['errors']} | {latency['p50_ms']:.1f}ms | "
+                        f"{latency['p95_ms']:.1f}ms | {latency['max_ms']:.1f}ms | {request['bytes'] / 1048576:,.2f} |"
+                    )
+            if METRICS_PROMETHEUS_FILE:
+                lines.append("")
+                lines.append(f"**Prometheus 파일**: {METRICS_PROMETHEUS_FILE} ({METRICS_PROMETHEUS_INTERVAL:g}초마다 갱신)")
             return "\n".join(lines)
         else:
-            return json.dumps({"archives": archives}, ensure_ascii=False, indent=2, default=str)
+            return json.dumps(stats, ensure_ascii=False, indent=2)
 
     except Exception as e:
         return _handle_error(e)
@@ -936,5 +5028,94 @@ async def archive_list_archives(params: ListArchivesInput) -> str:
 # MAIN
 # ============================================================================
 
+async def _export_cli(args: argparse.Namespace) -> None:
+    async def report(rows: int, total: Optional[int], elapsed: float) -> None:
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"\r{rows:,}/{total if total is not None else '?'} rows ({rate:,.0f} rows/s)",
+              end="", file=sys.stderr, flush=True)
+
+    result = await _export_archives(
+        args.output,
+        compression=ExportCompression(args.compression) if args.compression else None,
+        status=args.status,
+        category=args.category,
+        overwrite=args.force,
+        on_progress=report
+    )
+    print(file=sys.stderr)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+async def _import_cli(args: argparse.Namespace) -> None:
+    async def report(line: int, imported: int, rejected: int, elapsed: float) -> None:
+        rate = imported / elapsed if elapsed > 0 else 0
+        print(f"\rline {line:,}: {imported:,} imported, {rejected:,} rejected ({rate:,.0f} rows/s)",
+              end="", file=sys.stderr, flush=True)
+
+    result = await _import_archives(
+        args.source,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        rejected_path=args.rejected,
+        restart=args.restart,
+        on_progress=report
+    )
+    print(file=sys.stderr)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+async def _upload_image_cli(args: argparse.Namespace) -> None:
+    manifest = await _upload_image_derivatives(args.image, include_original=not args.no_original)
+    print(json.dumps(manifest, ensure_ascii=False, indent=2))
+
+
+async def _index_images_cli(args: argparse.Namespace) -> None:
+    async def report(done: int, total: int) -> None:
+        print(f"\r{done:,}/{total:,} images", end="", file=sys.stderr, flush=True)
+
+    result = await _refresh_image_hash_index(on_progress=report)
+    print(file=sys.stderr)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Light Archive MCP Server")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="MCP 서버 실행 (기본)")
+
+    export = commands.add_parser("export", help="archive_items를 NDJSON 파일로 내보내기")
+    export.add_argument("output", help="출력 파일 경로 (.gz / .zst는 자동 압축)")
+    export.add_argument("--compression", choices=[c.value for c in ExportCompression])
+    export.add_argument("--status", choices=[s.value for s in ArchiveStatus])
+    export.add_argument("--category", choices=[c.value for c in ArchiveCategory])
+    export.add_argument("--force", action="store_true", help="기존 파일 덮어쓰기")
+
+    importer = commands.add_parser("import", help="NDJSON 파일을 archive_items로 가져오기 (중단 시 재개)")
+    importer.add_argument("source", help="입력 파일 경로 (.ndjson / .gz / .zst / JSON 배열 .json)")
+    importer.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    importer.add_argument("--concurrency", type=int, default=IMPORT_CONCURRENCY)
+    importer.add_argument("--checkpoint", help="체크포인트 파일 (기본: {source}.checkpoint.json)")
+    importer.add_argument("--rejected", help="거부된 행 파일 (기본: {source}.rejected.ndjson)")
+    importer.add_argument("--restart", action="store_true", help="체크포인트 무시하고 처음부터")
+
+    image = commands.add_parser("upload-image", help="이미지를 반응형 파생 이미지(WebP/AVIF)로 업로드")
+    image.add_argument("image", help="이미지 파일 경로")
+    image.add_argument("--no-original", action="store_true", help="원본은 업로드하지 않음")
+
+    commands.add_parser("index-images", help="thumbnails 버킷 이미지의 유사 이미지(dHash) 색인 갱신")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    mcp.run()
+    args = _parse_args(sys.argv[1:])
+    if args.command == "export":
+        asyncio.run(_export_cli(args))
+    elif args.command == "import":
+        asyncio.run(_import_cli(args))
+    elif args.command == "upload-image":
+        asyncio.run(_upload_image_cli(args))
+    elif args.command == "index-images":
+        asyncio.run(_index_images_cli(args))
+    else:
+        mcp.run()
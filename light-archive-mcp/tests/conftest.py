@@ -0,0 +1,54 @@
+"""
+Light Archive MCP - pytest 공통 설정
+
+실제 Supabase 대신 bench_tools.py의 PostgREST 대역(httpx MockTransport)에 연결하므로
+네트워크 없이 실행됩니다.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# bench_tools가 서버 import 전에 대역 주소를 지정하고 로컬 복제본을 끔
+from bench_tools import PostgrestStandIn
+import light_archive_mcp_fixed as server
+from generate_corpus import CorpusGenerator
+
+
+@pytest.fixture
+def corpus():
+    """짧은 본문의 합성 아카이브 300개 (seed 고정)"""
+    return list(CorpusGenerator(seed=7, body_words=20).rows(300))
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """
+    서버를 PostgREST 대역에 연결하는 함수 (행 목록 → 대역)
+
+    서버 캐시/색인과 세마포어도 테스트마다 새로 만듭니다 (테스트마다 이벤트 루프가 다름).
+    """
+    def connect(rows=()) -> PostgrestStandIn:
+        target = PostgrestStandIn([dict(row) for row in rows])
+        monkeypatch.setattr(server, "_http_client", httpx.Client(
+            transport=httpx.MockTransport(target), event_hooks=server._http_event_hooks()
+        ))
+        monkeypatch.setattr(server, "supabase", server._LazySupabaseClient())
+        monkeypatch.setattr(server, "_db_semaphore", asyncio.Semaphore(server.DB_MAX_CONCURRENCY))
+        monkeypatch.setattr(server, "_archive_cache", server.ArchiveCache(
+            server.CACHE_MAX_ENTRIES, server.CACHE_TTL_SECONDS
+        ))
+        monkeypatch.setattr(server, "_rendered_content", server.RenderedContentCache(
+            server.RENDER_CACHE_MAX_ENTRIES
+        ))
+        monkeypatch.setattr(server, "_related_index", server.RelatedIndex(
+            server.RELATED_INDEX_REFRESH_SECONDS, server.RELATED_INDEX_REBUILD_SECONDS
+        ))
+        return target
+
+    return connect
@@ -0,0 +1,40 @@
+"""
+일괄 수정: 묶음 요청이 실패하면 항목별로 다시 시도
+"""
+
+import json
+import asyncio
+
+import light_archive_mcp_fixed as server
+
+
+DB_CATEGORIES = {c.value for c in server.ArchiveDbCategory}
+
+
+def test_check_violation_fails_only_the_bad_item(standin, corpus, monkeypatch):
+    target = standin(corpus)
+    handle = target._handle
+
+    def check_constraint(request):
+        # archive_items_category_check처럼 허용되지 않은 카테고리가 있으면 요청 전체 거부
+        if request.url.path.endswith("/bulk_update_archive_items"):
+            items = json.loads(request.content)["items"]
+            if any(item.get("category", "기술") not in DB_CATEGORIES for item in items):
+                return 400, {"code": "23514", "message": "violates check constraint"}, {}
+        return handle(request)
+
+    monkeypatch.setattr(target, "_handle", check_constraint)
+    ids = [row["id"] for row in corpus[:5]]
+    items = [{"archive_id": archive_id, "title": f"수정 {i}"} for i, archive_id in enumerate(ids)]
+    items[2]["category"] = "리서치"
+
+    output = asyncio.run(server.archive_bulk_update(server.BulkUpdateArchivesInput(
+        items=items, response_format="json"
+    )))
+
+    report = json.loads(output)
+    assert (report["succeeded"], report["failed"]) == (4, 1)
+    assert [r["id"] for r in report["results"] if not r["ok"]] == [ids[2]]
+    assert [target.rows[archive_id]["title"] for archive_id in ids] == [
+        "수정 0", "수정 1", corpus[2]["title"], "수정 3", "수정 4"
+    ]
@@ -0,0 +1,97 @@
+"""
+유사 이미지 dHash 색인 저장/불러오기
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+import light_archive_mcp_fixed as server
+
+
+def _leftovers(directory):
+    return sorted(p.name for p in directory.iterdir() if p.suffix == ".tmp")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "index" / "hashes.npz"
+    index = server.ImageHashIndex(str(path))
+    index.add("archive-images/a.png", 0x0F0F0F0F0F0F0F0F)
+    index.add("archive-images/b.jpeg", 0xFFFFFFFFFFFFFFFF)
+    index.add("archive-images/c.webp", 0x0F0F0F0F0F0F0F0E)
+    index.add("archive-images/a.png", 0x0F0F0F0F0F0F0F0F)
+    index.save()
+
+    loaded = server.ImageHashIndex(str(path))
+
+    assert len(loaded) == 3
+    assert "archive-images/b.jpeg" in loaded
+    assert "archive-images/variants/b.webp" not in loaded
+    assert loaded.search(0x0F0F0F0F0F0F0F0F, max_distance=4) == [
+        ("archive-images/a.png", 0), ("archive-images/c.webp", 1)
+    ]
+    assert _leftovers(path.parent) == []
+
+
+def test_save_without_changes_writes_nothing(tmp_path):
+    path = tmp_path / "hashes.npz"
+    index = server.ImageHashIndex(str(path))
+    assert len(index) == 0
+
+    index.save()
+
+    assert not path.exists()
+
+
+def test_index_grows_past_initial_capacity(tmp_path):
+    path = tmp_path / "hashes.npz"
+    index = server.ImageHashIndex(str(path))
+    for i in range(2500):
+        index.add(f"archive-images/{i}.png", i)
+    index.save()
+
+    loaded = server.ImageHashIndex(str(path))
+
+    assert len(loaded) == 2500
+    assert loaded.search(2499, max_distance=0) == [("archive-images/2499.png", 0)]
+
+
+def test_concurrent_add_and_save_keeps_every_entry(tmp_path):
+    path = tmp_path / "hashes.npz"
+    index = server.ImageHashIndex(str(path))
+    start = threading.Barrier(8)
+
+    def upload(worker):
+        start.wait()
+        for i in range(20):
+            index.add(f"archive-images/{worker}-{i}.png", worker * 1000 + i)
+            index.save()
+
+    threads = [threading.Thread(target=upload, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.ImageHashIndex(str(path))) == 160
+    assert _leftovers(tmp_path) == []
+
+
+def test_failed_save_cleans_up_and_retries(tmp_path, monkeypatch):
+    path = tmp_path / "hashes.npz"
+    index = server.ImageHashIndex(str(path))
+    index.add("archive-images/a.png", 1)
+
+    def disk_full(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(np, "savez_compressed", disk_full)
+    with pytest.raises(OSError):
+        index.save()
+    assert _leftovers(tmp_path) == [] and not path.exists()
+
+    monkeypatch.undo()
+    index.save()
+
+    assert "archive-images/a.png" in server.ImageHashIndex(str(path))
@@ -0,0 +1,39 @@
+"""
+반응형 파생 이미지 생성
+"""
+
+import asyncio
+
+from PIL import Image
+
+import light_archive_mcp_fixed as server
+
+
+def test_empty_width_list_keeps_original_width(tmp_path):
+    path = tmp_path / "photo.png"
+    Image.new("RGB", (500, 300), "blue").save(path)
+
+    width, height, variants = server._render_image_variants(str(path), [], ["webp"], server.IMAGE_QUALITY)
+
+    assert (width, height) == (500, 300)
+    assert [(v["width"], v["height"]) for v in variants] == [(500, 300)]
+
+
+def test_variants_render_in_spawned_workers(tmp_path, monkeypatch):
+    path = tmp_path / "photo.png"
+    Image.new("RGB", (900, 600), "red").save(path)
+    monkeypatch.setattr(server, "_image_process_pool", None)
+
+    async def render():
+        pool = server._image_pool()
+        try:
+            return pool, await asyncio.get_running_loop().run_in_executor(
+                pool, server._render_image_variants, str(path), [320, 640], ["webp"], server.IMAGE_QUALITY
+            )
+        finally:
+            pool.shutdown()
+
+    pool, (_, _, variants) = asyncio.run(render())
+
+    assert pool._mp_context.get_start_method() == "spawn"
+    assert [v["width"] for v in variants] == [320, 640]
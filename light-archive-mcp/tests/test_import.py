@@ -0,0 +1,167 @@
+"""
+NDJSON 가져오기: 체크포인트 재개, 잘못된 줄 거부
+"""
+
+import json
+import asyncio
+import threading
+
+import pytest
+
+import light_archive_mcp_fixed as server
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def _rejected(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _import_lines(corpus):
+    """id 없는 행 (내용 해시로 ID 생성) 중간중간 검증에 실패하는 행"""
+    lines = []
+    for i, row in enumerate(corpus[:120]):
+        row = {k: v for k, v in row.items() if k != "id"}
+        if i % 25 == 24:
+            row["category"] = "잡담"
+        lines.append(json.dumps(row, ensure_ascii=False))
+    return lines
+
+
+# ============================================================================
+# CHECKPOINT
+# ============================================================================
+
+def test_resume_after_interrupt_does_not_duplicate(standin, corpus, tmp_path):
+    target = standin()
+    lines = _import_lines(corpus)
+    source = _write_lines(tmp_path / "archive.ndjson", lines)
+    invalid = sum(1 for line in lines if json.loads(line)["category"] == "잡담")
+
+    async def stop_after_two_batches(line, imported, rejected, elapsed):
+        if line >= 20:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        asyncio.run(server._import_archives(
+            str(source), batch_size=10, concurrency=3, on_progress=stop_after_two_batches
+        ))
+    checkpoint = json.loads((tmp_path / "archive.ndjson.checkpoint.json").read_text(encoding="utf-8"))
+    assert checkpoint["line"] == 20 and not checkpoint["completed"]
+
+    result = asyncio.run(server._import_archives(str(source), batch_size=10, concurrency=3))
+
+    assert result["resumed_from_line"] == 20
+    assert result["total_imported"] == len(lines) - invalid
+    assert result["total_rejected"] == invalid
+    # 중단 시점에 보내졌지만 체크포인트에 없던 배치도 같은 ID로 다시 upsert됨
+    assert len(target.rows) == len(lines) - invalid
+    assert [r["line"] for r in _rejected(tmp_path / "archive.ndjson.rejected.ndjson")] == [25, 50, 75, 100]
+
+
+def test_completed_import_is_not_repeated(standin, corpus, tmp_path):
+    target = standin()
+    source = _write_lines(tmp_path / "archive.ndjson", _import_lines(corpus))
+    first = asyncio.run(server._import_archives(str(source), batch_size=16))
+    target.reset_counters()
+
+    again = asyncio.run(server._import_archives(str(source), batch_size=16))
+
+    assert again["already_completed"] is True
+    assert again["total_imported"] == first["total_imported"]
+    assert target.requests == 0
+
+
+def test_restart_reuses_content_hash_ids(standin, corpus, tmp_path):
+    target = standin()
+    source = _write_lines(tmp_path / "archive.ndjson", _import_lines(corpus))
+    asyncio.run(server._import_archives(str(source), batch_size=16))
+    ids = set(target.rows)
+
+    result = asyncio.run(server._import_archives(str(source), batch_size=16, restart=True))
+
+    assert result["resumed_from_line"] == 0
+    assert set(target.rows) == ids
+
+
+def test_checkpoint_for_modified_file_is_refused(standin, corpus, tmp_path):
+    standin()
+    source = _write_lines(tmp_path / "archive.ndjson", _import_lines(corpus))
+    asyncio.run(server._import_archives(str(source), batch_size=16))
+    _write_lines(source, _import_lines(corpus)[:50])
+
+    with pytest.raises(RuntimeError, match="different or modified"):
+        asyncio.run(server._import_archives(str(source)))
+
+
+def test_cancel_during_read_keeps_original_exception(standin, corpus, tmp_path, monkeypatch):
+    standin()
+    source = _write_lines(tmp_path / "archive.ndjson", _import_lines(corpus))
+    reading, release = threading.Event(), threading.Event()
+    iter_records = server._iter_import_records
+
+    def slow_records(path):
+        # 작업 스레드가 records 제너레이터 안에 있는 동안 취소되도록
+        for record in iter_records(path):
+            reading.set()
+            release.wait(5)
+            yield record
+
+    monkeypatch.setattr(server, "_iter_import_records", slow_records)
+
+    async def cancel_while_reading():
+        task = asyncio.create_task(server._import_archives(str(source), batch_size=10))
+        await asyncio.get_running_loop().run_in_executor(None, reading.wait, 5)
+        task.cancel()
+        try:
+            await task
+        finally:
+            release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_while_reading())
+
+
+# ============================================================================
+# PARSE ERRORS
+# ============================================================================
+
+def test_malformed_lines_go_to_rejected_file(standin, tmp_path):
+    target = standin()
+    source = _write_lines(tmp_path / "archive.ndjson", [
+        json.dumps({"title": "첫 번째", "category": "기술"}, ensure_ascii=False),
+        '{"title": "닫히지 않은 객체"',
+        "[1, 2, 3]",
+        json.dumps({"title": "카테고리 오류", "category": "잡담"}, ensure_ascii=False),
+        "",
+        json.dumps({"category": "AI"}),
+        json.dumps({"title": "마지막", "category": "News", "tags": None}, ensure_ascii=False),
+    ])
+
+    result = asyncio.run(server._import_archives(str(source), batch_size=3))
+
+    assert (result["imported"], result["rejected"]) == (2, 4)
+    rejected = _rejected(tmp_path / "archive.ndjson.rejected.ndjson")
+    assert [r["line"] for r in rejected] == [2, 3, 4, 6]
+    assert rejected[0]["record"] == '{"title": "닫히지 않은 객체"\n'
+    assert "not a JSON object" in rejected[1]["error"]
+    assert "category" in rejected[2]["error"]
+    assert "title" in rejected[3]["error"]
+    assert sorted(row["title"] for row in target.rows.values()) == ["마지막", "첫 번째"]
+    assert all(row["tags"] == [] for row in target.rows.values())
+
+
+def test_json_array_must_be_a_list(standin, tmp_path):
+    standin()
+    source = tmp_path / "archive.json"
+    source.write_text('{"title": "not an array"}', encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="must contain an array"):
+        asyncio.run(server._import_archives(str(source)))
@@ -0,0 +1,129 @@
+"""
+keyset 커서 인코딩과 커서로 끝까지 넘기기
+"""
+
+import json
+import asyncio
+import base64
+
+import pytest
+
+import light_archive_mcp_fixed as server
+
+
+def _with_tied_timestamps(rows):
+    """created_at이 겹치는 행이 많도록 (id로만 순서가 갈리는 경우 확인)"""
+    timestamps = sorted({row["created_at"] for row in rows})[:12]
+    return [{**row, "created_at": timestamps[i % len(timestamps)]} for i, row in enumerate(rows)]
+
+
+def _expected_order(rows):
+    return [row["id"] for row in sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)]
+
+
+async def _walk(tool, make_input):
+    """next_cursor가 없을 때까지 JSON 응답을 넘기며 id 목록 수집"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        output = await tool(make_input(cursor))
+        assert not output.startswith("Error"), output
+        page = json.loads(output)
+        ids.extend(archive["id"] for archive in page["archives"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def test_cursor_round_trip():
+    position = {"c": "2024-05-01T09:30:00+00:00", "i": "1714555800000-a1b2c3", "note": "한글"}
+    cursor = server._encode_cursor(position)
+
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+    assert server._decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b"{broken").decode("ascii"),
+    base64.urlsafe_b64encode(b"[1, 2]").decode("ascii"),
+])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(RuntimeError, match="Invalid cursor"):
+        server._decode_cursor(cursor)
+
+
+def test_next_page_cursor_points_at_last_row():
+    rows = [{"id": "b", "created_at": "2024-01-02"}, {"id": "a", "created_at": "2024-01-01"}]
+
+    keyset = server._decode_cursor(server._next_page_cursor(rows, 0, None, keyset=True))
+    offset = server._decode_cursor(server._next_page_cursor(rows, 0, server._encode_cursor({"o": 4}), keyset=False))
+
+    assert keyset == {"c": "2024-01-01", "i": "a"}
+    assert offset == {"o": 6}
+
+
+def test_list_rejects_cursor_without_keys(standin, corpus):
+    standin(corpus)
+    cursor = server._encode_cursor({"o": 10})
+
+    output = asyncio.run(server.archive_list_archives(server.ListArchivesInput(cursor=cursor)))
+
+    assert output.startswith("Error: Invalid cursor")
+
+
+# ============================================================================
+# PAGING
+# ============================================================================
+
+@pytest.mark.parametrize("status", [None, "published"])
+def test_list_cursor_walk_visits_every_row_once(standin, corpus, status):
+    rows = _with_tied_timestamps(corpus)
+    standin(rows)
+
+    ids, pages = asyncio.run(_walk(server.archive_list_archives, lambda cursor: server.ListArchivesInput(
+        status=status, limit=7, cursor=cursor, response_format="json"
+    )))
+
+    expected = _expected_order([row for row in rows if status is None or row["status"] == status])
+    assert ids == expected
+    assert pages == -(-len(expected) // 7)
+
+
+def test_list_cursor_uses_row_comparison_rpc(standin, corpus, monkeypatch):
+    target = standin(corpus)
+    first = json.loads(asyncio.run(server.archive_list_archives(server.ListArchivesInput(
+        limit=5, response_format="json"
+    ))))
+    called = []
+    rpc = target._rpc
+    monkeypatch.setattr(target, "_rpc", lambda name, args: called.append(name) or rpc(name, args))
+    target.reset_counters()
+
+    asyncio.run(server.archive_list_archives(server.ListArchivesInput(
+        limit=5, cursor=first["next_cursor"], response_format="json"
+    )))
+
+    assert called == ["list_archive_items_page"]
+    assert target.requests == 1
+
+
+def test_search_cursor_walk_visits_every_match_once(standin, corpus):
+    rows = _with_tied_timestamps(corpus)
+    for i, row in enumerate(rows):
+        if i % 3 == 0:
+            row["title"] += " zzqneedle"
+    standin(rows)
+
+    ids, _ = asyncio.run(_walk(server.archive_search_archives, lambda cursor: server.SearchArchivesInput(
+        query="zzqneedle", mode="ilike", limit=6, cursor=cursor, response_format="json"
+    )))
+
+    assert ids == _expected_order([
+        row for row in rows if "zzqneedle" in row["title"] and row["status"] == "published"
+    ])
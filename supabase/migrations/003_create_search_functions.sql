@@ -0,0 +1,30 @@
+-- =====================================================
+-- Archive 전체 텍스트 검색 함수
+-- =====================================================
+-- 설명: idx_archive_items_search(GIN) 인덱스를 사용하는 랭킹 검색
+-- 사용: supabase.rpc('search_archive_items', { search_query, category_filter })
+-- 주의: WHERE 절의 to_tsvector 표현식은 001의 인덱스 표현식과
+--       완전히 같아야 인덱스가 사용됩니다.
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION search_archive_items(
+  search_query TEXT,
+  category_filter TEXT DEFAULT NULL
+)
+RETURNS SETOF archive_items AS $$
+  SELECT a.*
+  FROM archive_items a,
+       websearch_to_tsquery('english', search_query) AS q
+  WHERE to_tsvector('english', coalesce(a.title, '') || ' ' || coalesce(a.description, '') || ' ' || coalesce(a.content, '')) @@ q
+    AND a.status = 'published'
+    AND (category_filter IS NULL OR a.category = category_filter)
+  ORDER BY
+    ts_rank(
+      to_tsvector('english', coalesce(a.title, '') || ' ' || coalesce(a.description, '') || ' ' || coalesce(a.content, '')),
+      q
+    ) DESC,
+    a.created_at DESC,
+    a.id DESC;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION search_archive_items(TEXT, TEXT) IS '게시된 아카이브를 websearch 문법으로 검색하고 ts_rank 순으로 반환';
@@ -0,0 +1,41 @@
+-- =====================================================
+-- Archive 한국어 부분 문자열 검색 (pg_trgm)
+-- =====================================================
+-- 설명: 'english' tsvector 인덱스는 한국어 본문에 효과가 없으므로,
+--       제목/설명/태그 제거 본문에 trigram GIN 인덱스를 생성합니다.
+-- 사용: supabase.rpc('search_archive_items_trgm', { search_query, category_filter })
+-- 참고: trigram은 3글자 단위이므로 3글자 이상 검색어에서 인덱스가
+--       가장 효과적입니다. 2글자 검색어는 인덱스 전체를 훑은 뒤 재검사합니다.
+-- =====================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 1. 검색용 문서 (HTML 태그 제거)
+-- 인덱스 표현식과 검색 함수가 같은 함수를 사용해야 인덱스가 사용됩니다.
+CREATE OR REPLACE FUNCTION archive_search_document(title TEXT, description TEXT, content TEXT)
+RETURNS TEXT AS $$
+  SELECT coalesce(title, '') || ' ' || coalesce(description, '') || ' ' ||
+         regexp_replace(coalesce(content, ''), '<[^>]*>', ' ', 'g');
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- 2. trigram 인덱스
+CREATE INDEX IF NOT EXISTS idx_archive_items_search_trgm ON archive_items
+  USING GIN (archive_search_document(title, description, content) gin_trgm_ops);
+
+-- 3. 부분 문자열 검색 함수 (최신순)
+CREATE OR REPLACE FUNCTION search_archive_items_trgm(
+  search_query TEXT,
+  category_filter TEXT DEFAULT NULL
+)
+RETURNS SETOF archive_items AS $$
+  SELECT a.*
+  FROM archive_items a
+  WHERE archive_search_document(a.title, a.description, a.content)
+        ILIKE '%' || replace(replace(replace(search_query, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+    AND a.status = 'published'
+    AND (category_filter IS NULL OR a.category = category_filter)
+  ORDER BY a.created_at DESC, a.id DESC;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION archive_search_document(TEXT, TEXT, TEXT) IS '제목, 설명, HTML 태그를 제거한 본문을 합친 검색용 문서';
+COMMENT ON FUNCTION search_archive_items_trgm(TEXT, TEXT) IS '게시된 아카이브를 trigram 인덱스로 부분 문자열 검색 (한국어 지원)';
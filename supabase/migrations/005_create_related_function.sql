@@ -0,0 +1,56 @@
+-- =====================================================
+-- Archive 유사 아카이브 점수 계산 함수
+-- =====================================================
+-- 설명: MCP archive_find_related의 가중치(카테고리 30 / 태그 10 / 기술 5)를
+--       DB에서 계산하고 상위 result_limit개의 ID와 점수만 반환합니다.
+-- 사용: supabase.rpc('find_related_archive_items', { base_id, result_limit })
+-- 인덱스: 태그/기술 후보는 idx_archive_items_tags, idx_archive_items_technologies
+--         (GIN, &&)로, 카테고리 후보는 idx_archive_items_category로 찾습니다.
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION find_related_archive_items(
+  base_id TEXT,
+  result_limit INTEGER DEFAULT 4
+)
+RETURNS TABLE (id TEXT, score INTEGER) AS $$
+  WITH base AS (
+    SELECT b.category, coalesce(b.tags, '{}') AS tags, coalesce(b.technologies, '{}') AS technologies
+    FROM archive_items b
+    WHERE b.id = base_id
+  ),
+  overlapping AS (
+    -- 태그/기술이 하나라도 겹치는 후보 (GIN 인덱스 사용)
+    SELECT a.id, a.category, a.tags, a.technologies
+    FROM archive_items a, base
+    WHERE a.status = 'published'
+      AND a.id <> base_id
+      AND (a.tags && base.tags OR a.technologies && base.technologies)
+  ),
+  category_only AS (
+    -- 카테고리만 같은 후보는 30점이므로 상위 result_limit개까지만 필요
+    SELECT a.id, a.category, a.tags, a.technologies
+    FROM archive_items a, base
+    WHERE a.status = 'published'
+      AND a.id <> base_id
+      AND a.category = base.category
+      AND NOT (a.tags && base.tags OR a.technologies && base.technologies)
+    ORDER BY a.id DESC
+    LIMIT result_limit
+  ),
+  candidates AS (
+    SELECT * FROM overlapping
+    UNION ALL
+    SELECT * FROM category_only
+  )
+  SELECT
+    c.id,
+    (CASE WHEN c.category = base.category THEN 30 ELSE 0 END
+      + 10 * cardinality(ARRAY(SELECT unnest(coalesce(c.tags, '{}')) INTERSECT SELECT unnest(base.tags)))
+      + 5 * cardinality(ARRAY(SELECT unnest(coalesce(c.technologies, '{}')) INTERSECT SELECT unnest(base.technologies)))
+    )::INTEGER AS score
+  FROM candidates c, base
+  ORDER BY score DESC, c.id DESC
+  LIMIT result_limit;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION find_related_archive_items(TEXT, INTEGER) IS '기준 아카이브와 카테고리/태그/기술이 겹치는 게시 아카이브 상위 N개의 ID와 점수';
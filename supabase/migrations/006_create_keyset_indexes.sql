@@ -0,0 +1,18 @@
+-- =====================================================
+-- Archive 커서(keyset) 페이지네이션 인덱스
+-- =====================================================
+-- 설명: MCP 목록/검색 도구는 (created_at, id) 커서로 다음 페이지를 조회합니다.
+--       - 목록: list_archive_items_page RPC (008)가 WHERE (created_at, id) < (커서)
+--         행 비교로 조회
+--       - 검색: PostgREST 필터 created_at <= 커서 AND (created_at < 커서 OR
+--         (created_at = 커서 AND id < 커서 id)). 앞의 created_at 조건이 범위 조건이 됨
+--       ORDER BY created_at DESC, id DESC 조회가 인덱스 범위 스캔으로 끝나도록
+--       복합 인덱스를 생성합니다.
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_archive_items_created_at_id
+  ON archive_items(created_at DESC, id DESC);
+
+-- 상태 필터(published 목록, 검색)와 함께 쓰는 경우
+CREATE INDEX IF NOT EXISTS idx_archive_items_status_created_at_id
+  ON archive_items(status, created_at DESC, id DESC);
@@ -0,0 +1,40 @@
+-- =====================================================
+-- Archive 일괄 수정 함수
+-- =====================================================
+-- 설명: MCP archive_bulk_update가 여러 아카이브를 한 번의 요청으로 수정합니다.
+--       항목마다 수정할 필드가 달라도 되며, 값이 없는(null) 필드는 유지됩니다.
+-- 사용: supabase.rpc('bulk_update_archive_items', { items: [{ id, title, ... }] })
+-- 반환: 수정된 행 (없는 ID는 반환되지 않음)
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION bulk_update_archive_items(items JSONB)
+RETURNS SETOF archive_items AS $$
+  UPDATE archive_items a
+  SET
+    title = coalesce(x.title, a.title),
+    content = coalesce(x.content, a.content),
+    description = coalesce(x.description, a.description),
+    excerpt = coalesce(x.excerpt, a.excerpt),
+    category = coalesce(x.category, a.category),
+    sub_category = coalesce(x.sub_category, a.sub_category),
+    tags = coalesce(x.tags, a.tags),
+    technologies = coalesce(x.technologies, a.technologies),
+    difficulty = coalesce(x.difficulty, a.difficulty),
+    updated_at = NOW()
+  FROM jsonb_to_recordset(items) AS x(
+    id TEXT,
+    title TEXT,
+    content TEXT,
+    description TEXT,
+    excerpt TEXT,
+    category TEXT,
+    sub_category TEXT,
+    tags TEXT[],
+    technologies TEXT[],
+    difficulty TEXT
+  )
+  WHERE a.id = x.id
+  RETURNING a.*;
+$$ LANGUAGE sql VOLATILE;
+
+COMMENT ON FUNCTION bulk_update_archive_items(JSONB) IS '여러 아카이브를 한 번에 수정 (null 필드는 기존 값 유지)';
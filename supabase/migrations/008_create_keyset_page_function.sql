@@ -0,0 +1,30 @@
+-- =====================================================
+-- Archive 커서(keyset) 목록 페이지 함수
+-- =====================================================
+-- 설명: MCP archive_list_archives가 cursor로 다음 페이지를 조회할 때 사용합니다.
+--       PostgREST 필터로는 행 비교를 쓸 수 없어서, 함수 안에서
+--       WHERE (created_at, id) < (커서) ORDER BY created_at DESC, id DESC
+--       로 조회합니다. 행 비교는 006의 (created_at DESC, id DESC) /
+--       (status, created_at DESC, id DESC) 인덱스 범위 조건이 되므로
+--       페이지 깊이와 관계없이 page_size개만 읽습니다.
+-- 사용: supabase.rpc('list_archive_items_page', { cursor_created_at, cursor_id, status_filter, category_filter, page_size })
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION list_archive_items_page(
+  cursor_created_at TIMESTAMPTZ,
+  cursor_id TEXT,
+  status_filter TEXT DEFAULT NULL,
+  category_filter TEXT DEFAULT NULL,
+  page_size INT DEFAULT 21
+)
+RETURNS SETOF archive_items AS $$
+  SELECT *
+  FROM archive_items
+  WHERE (created_at, id) < (cursor_created_at, cursor_id)
+    AND (status_filter IS NULL OR status = status_filter)
+    AND (category_filter IS NULL OR category = category_filter)
+  ORDER BY created_at DESC, id DESC
+  LIMIT page_size;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION list_archive_items_page(TIMESTAMPTZ, TEXT, TEXT, TEXT, INT) IS '(created_at, id) 커서 다음 페이지 (행 비교 인덱스 범위 스캔)';